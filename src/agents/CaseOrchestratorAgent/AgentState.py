@@ -3,6 +3,16 @@ from typing import TypedDict, List, Dict, Any, Literal, Optional, Annotated
 from uuid import UUID
 
 
+def merge_errors(left: Optional[List[Dict[str, Any]]], right: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    # parallel branches may both report errors in the same step; nodes return either only their new
+    # errors or the whole (already appended) list, so keep the order and skip what is already there
+    merged = list(left or [])
+    for e in right or []:
+        if e not in merged:
+            merged.append(e)
+    return merged
+
+
 class CaseState(TypedDict,total=False):
     case_id: str
     case_uuid: UUID
@@ -17,9 +27,10 @@ class Message(TypedDict, total=False):
     message_id: str
     direction: str
     subject: str
-    body: str
+    body: str  # inbound payload only until the message row exists, then StatePayloads.message_body()
     from_email: str
     to_email: str
+    external_message_id: str  # RFC Message-ID header (IMAP _parse_email "message_id"), ingestion dedup key
     received_at:str
 
 class ExtractionsState(TypedDict, total=False):
@@ -57,6 +68,13 @@ class HumanReviewState(TypedDict, total=False):
     edited_customer_reply:str
     review_notes:str
 
+class PlanResultState(TypedDict, total=False):
+    # IDs only: draft text / action specs are in the drafts and actions tables (StatePayloads)
+    ok: bool
+    draft_id: Optional[str]
+    action_ids: List[str]
+    case_status: Optional[str]
+
 class AuthSessionsState(TypedDict, total=False):
     id: str
     case_id: str
@@ -72,17 +90,19 @@ class AgentState(TypedDict):
     Case: CaseState
     Message: Message
     extractions: ExtractionsState
-    actions: Annotated[List[ActionsState], operator.add]
-    drafts: Annotated[List[DraftsState], operator.add]
     auth_sessions: AuthSessionsState
     human_review: HumanReviewState
     auth_intents: List[Dict[str, Any]]
     non_auth_intents: List[Dict[str, Any]]
-    non_auth_plan_result:Dict[str, Any]
-    auth_plan_result: Dict[str, Any]
+    non_auth_plan_result: PlanResultState
+    auth_plan_result: PlanResultState
     non_auth_done: bool
     auth_done: bool
     join_ready: bool
     joined_once: bool
-    errors: List[Dict[str, Any]]
-    llm_response_extractions: Dict[str, Any]
+    errors: Annotated[List[Dict[str, Any]], merge_errors]
+    llm_response_extractions: Optional[Dict[str, Any]]  # cleared once saved (extractions row)
+    llm_usage_run_id: str
+    graph_thread_id: str
+    duplicate_of: Optional[Dict[str, Any]]  # set by dedupe_inbound_node: the run stops before any LLM call
+    node_timings: Annotated[List[Dict[str, Any]], operator.add]  # only with GRAPH_NODE_TIMINGS_IN_STATE
@@ -1,9 +1,10 @@
 import asyncio
-from langgraph.graph import StateGraph, END
+import functools
+from langgraph.graph import StateGraph, START, END
 from src.agents.CaseOrchestratorAgent.AgentState import AgentState
 from src.agents.CaseOrchestratorAgent.nodes import (
-    create_case_node,
-    create_msg_node,
+    dedupe_inbound_node,
+    resolve_case_and_message_node,
     extract_intents_entities_node,
     save_extraction_node,
     auth_policy_evaluator_node,
@@ -19,58 +20,73 @@ from src.agents.CaseOrchestratorAgent.nodes import (
 from src.agents.CaseOrchestratorAgent.routers.route_after_actions_join import route_after_actions_join
 from src.agents.CaseOrchestratorAgent.routers.route_auth_branch import route_auth_branch, route_non_auth_branch
 from src.agents.CaseOrchestratorAgent.routers.route_after_auth import route_after_auth
+from src.agents.CaseOrchestratorAgent.routers.route_after_dedupe import route_after_dedupe
+from src.agents.CaseOrchestratorAgent.routers.route_after_save_extraction import route_after_save_extraction
+from src.agents.CaseOrchestratorAgent.utils.llm.usage_scope import with_llm_usage_scope
+from src.agents.CaseOrchestratorAgent.utils.node_metrics import timing_breakdown, with_node_metrics
+from src.agents.CaseOrchestratorAgent.utils.build_container import get_container
+from src.agents.CaseOrchestratorAgent.utils.graph_runtime import pending_review, resume_case_graph, run_case_graph
 
-from src.helpers.config import get_settings
 
-from dotenv import load_dotenv
-load_dotenv()
+def _add_node(g: StateGraph, name: str, fn, attach_case: bool = False, record_timings: bool = False, **kwargs):
+    # every node runs inside an LLM usage scope (run / case / node attribution in the usage ledger)
+    # and is timed per node (Prometheus latency / errors / in-flight, optional timings in the state)
+    node = with_llm_usage_scope(name, fn, attach_case=attach_case)
+    g.add_node(name, with_node_metrics(name, node, record_timings=record_timings), **kwargs)
 
-import os
 
-s = get_settings()
-
-# set LANGSMITH settings
-if s.LANGCHAIN_API_KEY:
-    os.environ["LANGSMITH_TRACING"] = "true" if s.LANGCHAIN_TRACING_V2 else "false"
-    os.environ["LANGSMITH_API_KEY"] = s.LANGCHAIN_API_KEY
-    os.environ["LANGSMITH_PROJECT"] = s.LANGCHAIN_PROJECT or "default"
-    if s.LANGCHAIN_ENDPOINT:
-        os.environ["LANGSMITH_ENDPOINT"] = s.LANGCHAIN_ENDPOINT
-
-
-def build_graph():
+def build_graph(checkpointer=None, record_timings: bool = False):
     g = StateGraph(AgentState)
+    add_node = functools.partial(_add_node, g, record_timings=record_timings)
 
-    g.add_node("extract_intents_entities_node", extract_intents_entities_node)
-    g.add_node("create_case_node", create_case_node)
-    g.add_node("message_writer_node", create_msg_node)
-    g.add_node("save_extraction_node", save_extraction_node)
+    add_node("dedupe_inbound_node", dedupe_inbound_node)
+    add_node("extract_intents_entities_node", extract_intents_entities_node)
+    add_node("resolve_case_and_message_node", resolve_case_and_message_node)
+    # join point: the extraction calls were made before the case existed
+    add_node("save_extraction_node", save_extraction_node, attach_case=True)
 
-    g.add_node("auth_policy_evaluator_node", auth_policy_evaluator_node)
+    add_node("auth_policy_evaluator_node", auth_policy_evaluator_node)
 
-    g.add_node("plan_non_auth_actions_node", plan_non_auth_actions_node)
+    add_node("plan_non_auth_actions_node", plan_non_auth_actions_node)
 
-    g.add_node("auth_session_manager_node", auth_session_manager_node)
-    g.add_node("plan_auth_actions_node", plan_auth_actions_node)
+    add_node("auth_session_manager_node", auth_session_manager_node)
+    add_node("plan_auth_actions_node", plan_auth_actions_node)
 
-    g.add_node("join_plans_node", join_plans_node, defer=True)
+    add_node("join_plans_node", join_plans_node, defer=True)
 
-    g.add_node("human_review_node", human_review_node)
+    add_node("human_review_node", human_review_node)
 
-    g.add_node("create_or_update_auth_request_draft_node", create_or_update_auth_request_draft_node)
+    add_node("create_or_update_auth_request_draft_node", create_or_update_auth_request_draft_node)
 
-    g.add_node("approve_and_send_auth_request_node", approve_and_send_auth_request_node)
+    add_node("approve_and_send_auth_request_node", approve_and_send_auth_request_node)
 
-    g.add_node("review_finalize_node", review_finalize_node)
+    add_node("review_finalize_node", review_finalize_node)
 
-    # ===== Entry =====
-    g.set_entry_point("extract_intents_entities_node")
+    # ===== Entry: drop re-delivered emails (Message-ID) before any LLM call =====
+    g.add_edge(START, "dedupe_inbound_node")
 
-    # ===== Linear pre-processing =====
-    g.add_edge("extract_intents_entities_node", "create_case_node")
-    g.add_edge("create_case_node", "message_writer_node")
-    g.add_edge("message_writer_node", "save_extraction_node")
-    g.add_edge("save_extraction_node", "auth_policy_evaluator_node")
+    # then LLM extraction || case resolution + message write (DB only)
+    g.add_conditional_edges(
+        "dedupe_inbound_node",
+        route_after_dedupe,
+        {
+            "extract_intents_entities_node": "extract_intents_entities_node",
+            "resolve_case_and_message_node": "resolve_case_and_message_node",
+            END: END,
+        },
+    )
+
+    # ===== Join =====
+    # waits for both branches; the DB round-trips are off the critical path (hidden behind the LLM call)
+    g.add_edge(["extract_intents_entities_node", "resolve_case_and_message_node"], "save_extraction_node")
+    g.add_conditional_edges(
+        "save_extraction_node",
+        route_after_save_extraction,
+        {
+            "auth_policy_evaluator_node": "auth_policy_evaluator_node",
+            END: END,
+        },
+    )
 
     # ===== Fan-out =====
     # In parallel, decide auth branch
@@ -131,11 +147,12 @@ def build_graph():
     g.add_edge("review_finalize_node", END)
 
 
-    return g.compile()
+    # checkpointer: human_review_node interrupts and the run is resumed later (see graph_runtime)
+    return g.compile(checkpointer=checkpointer)
 
 
 async def main():
-    graph = build_graph()
+    container = await get_container()
 
     email = {
         "from_email": "younis.eng.software@gmail.com",
@@ -208,18 +225,32 @@ async def main():
         """,
     }
 
-    initial_state: AgentState = {
-        "Message": email_no_auth
-        ,
-        "errors": [],
-    }
-
-    # Run once, return final state
-    final_state = await graph.ainvoke(initial_state)
+    # Run once: stops at human_review_node (interrupt) if the case needs a review
+    final_state = await run_case_graph(container, email_no_auth)
+
+    review = pending_review(final_state)
+    if review is not None:
+        # local runs: answer the review in the terminal (the service uses POST /cases/{case_id}/review)
+        print("\n=== WAITING FOR REVIEW ===")
+        print(review)
+        decision = {
+            "decision": input("Decision [approved/rejected/needs_changes] (default=approved): ").strip(),
+            "reviewer_email": input("Reviewer email: ").strip(),
+            "reviewer_name": input("Reviewer name: ").strip(),
+            "edited_customer_reply": input("Edited customer reply (leave empty = keep generated draft): ").strip(),
+            "review_notes": input("Review notes (optional): ").strip(),
+        }
+        final_state = await resume_case_graph(container, final_state["graph_thread_id"], decision)
 
     print("\n=== FINAL STATE ===")
     print(final_state)
 
+    # with GRAPH_NODE_TIMINGS_IN_STATE=1: where the time went, slowest node first
+    if final_state.get("node_timings"):
+        print("\n=== NODE TIMINGS (ms) ===")
+        for node, ms in timing_breakdown(final_state).items():
+            print(f"{node:<45} {ms:>10.1f}")
+
     # Helpful: show errors only
     if final_state.get("errors"):
         print("\n=== ERRORS ===")
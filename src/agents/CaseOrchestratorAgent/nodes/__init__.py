@@ -1,5 +1,7 @@
+from src.agents.CaseOrchestratorAgent.nodes.dedupe_inbound_node import dedupe_inbound_node
 from src.agents.CaseOrchestratorAgent.nodes.create_case_node import create_case_node
 from src.agents.CaseOrchestratorAgent.nodes.message_writer_node import create_msg_node
+from src.agents.CaseOrchestratorAgent.nodes.resolve_case_node import resolve_case_and_message_node
 from src.agents.CaseOrchestratorAgent.nodes.extract_intents_entities_node import extract_intents_entities_node
 from src.agents.CaseOrchestratorAgent.nodes.save_extraction_node import save_extraction_node
 from src.agents.CaseOrchestratorAgent.nodes.auth_policy_evaluator_node import auth_policy_evaluator_node
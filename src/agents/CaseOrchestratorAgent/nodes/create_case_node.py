@@ -1,6 +1,7 @@
 from src.agents.CaseOrchestratorAgent.AgentState import AgentState, CaseState
 from src.agents.CaseOrchestratorAgent.utils.build_container import get_container
 from src.agents.CaseOrchestratorAgent.tools.case_resolver import case_resolver
+from src.agents.CaseOrchestratorAgent.utils.extraction.regex_entities import find_case_uuid
 from src.models.db_schemes import Cases
 
 def _case_orm_to_state(case: Cases) -> CaseState:
@@ -22,7 +23,8 @@ async def create_case_node(state: AgentState)-> AgentState:
     from_email = msg.get("from_email")
     subject = msg.get("subject")
     body = msg.get("body")
-    case_uid = state.get("case_id")
+    # [CASE: uuid] token by regex (subject, then the whole body incl. quoted thread): no need to wait for the LLM
+    case_uid = state.get("case_id") or find_case_uuid(subject, body)
 
     if not (from_email and not (body is None)):
         # fail fast: message missing required fields
@@ -0,0 +1,28 @@
+from src.agents.CaseOrchestratorAgent.AgentState import AgentState
+from src.agents.CaseOrchestratorAgent.utils.build_container import get_container
+
+
+async def dedupe_inbound_node(state: AgentState) -> AgentState:
+    """
+    Graph entry: drop a re-delivered / re-polled email (same Message-ID header) before any tokens
+    are spent or a new case / draft is created. The run then ends with duplicate_of set.
+    Only processed mails (extraction saved) are duplicates; an unprocessed one is retried.
+    """
+    container = await get_container()
+    deduper = container.inbound_deduper
+
+    msg = state.get("Message") or {}
+    if deduper is None or msg.get("direction", "inbound") != "inbound":
+        return {}
+
+    claimed = await deduper.claim(msg.get("external_message_id"))
+    if claimed is None:
+        return {}
+
+    if not claimed["duplicate"]:
+        # stored by an earlier run that failed before the extraction was saved: retry on the same case
+        print(f"Retrying unprocessed inbound email: {claimed}")
+        return {"case_id": claimed["case_id"]}
+
+    print(f"Duplicate inbound email skipped: {claimed}")
+    return {"duplicate_of": claimed}
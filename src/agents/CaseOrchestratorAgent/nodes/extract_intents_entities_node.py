@@ -3,16 +3,6 @@ from src.agents.CaseOrchestratorAgent.tools.extract_intents_entities import extr
 from src.agents.CaseOrchestratorAgent.utils.build_container import get_container
 
 
-def _normalize_case_uuid(x):
-    if x is None:
-        return None
-    s = str(x).strip()
-    if not s or s.lower() in {"none", "null", "n/a"}:
-        return None
-
-    return s
-
-
 async def extract_intents_entities_node(state: AgentState):
 
 
@@ -26,9 +16,7 @@ async def extract_intents_entities_node(state: AgentState):
     body = msg_in.get("body")
 
     if not from_email or body is None:
-        state.setdefault("errors", []).append(
-            {"stage": "extract_intents_entities_node", "error": "Missing from_email or body"})
-        return state
+        return {"errors": [{"stage": "extract_intents_entities_node", "error": "Missing from_email or body"}]}
 
     llm_intents_entities_result = await extract_intents_entities(
         container=container,
@@ -38,15 +26,8 @@ async def extract_intents_entities_node(state: AgentState):
     )
 
     if not llm_intents_entities_result:
-        state.setdefault("errors", []).append(
-            {"stage": "extract_intents_entities_node", "error": "LLM returned empty result"})
-        return state
-
-
-    update = {
-        "llm_response_extractions": llm_intents_entities_result,
-        "case_id": _normalize_case_uuid(llm_intents_entities_result["case_id"]),
-    }
+        return {"errors": [{"stage": "extract_intents_entities_node", "error": "LLM returned empty result"}]}
 
 
-    return update
+    # case_id is resolved in parallel by resolve_case_and_message_node (regex), not taken from the LLM
+    return {"llm_response_extractions": llm_intents_entities_result}
@@ -2,16 +2,18 @@ from src.agents.CaseOrchestratorAgent.AgentState import AgentState, Message
 from src.agents.CaseOrchestratorAgent.tools.message_writer import message_writer
 from src.agents.CaseOrchestratorAgent.utils.build_container import get_container
 from src.models.db_schemes import Messages
+from src.utils.inbound_dedup import normalize_message_id
 
 
 def _message_orm_to_state(msg: Messages) -> Message:
+    # no body: the row is persisted, load it with StatePayloads.message_body() if a node needs it
     data: Message = {
         "message_id": str(msg.message_id),
         "case_uuid": str(msg.case_id),      # or rename your TypedDict to case_id
         "direction": msg.direction,
         "subject": msg.subject or "",
-        "body": msg.body,
         "from_email": msg.from_email,
+        "external_message_id": msg.external_message_id,
         "to_email": msg.to_email,
         "received_at": msg.received_at.isoformat() if msg.received_at else "",
     }
@@ -46,11 +48,19 @@ async def create_msg_node(state: AgentState) -> AgentState:
         subject=subject,
         body=body,
         from_email=from_email,
-        to_email=to_email
+        to_email=to_email,
+        external_message_id=msg_in.get("external_message_id"),
     )
 
     if not new_msg_orm:
-        state.setdefault("errors", []).append({"stage": "create_msg_node", "error": "message_writer returned None"})
-        return state
+        # message_writer only returns None when the Message-ID was stored and processed by another
+        # worker meanwhile (unique constraint): a duplicate, not an error
+        return {"duplicate_of": {
+            "duplicate": True,
+            "external_message_id": normalize_message_id(msg_in.get("external_message_id")),
+            "message_id": None,
+            "case_id": None,
+            "source": "constraint",
+        }}
 
     return {"Message": _message_orm_to_state(new_msg_orm)}
@@ -3,6 +3,7 @@ from typing import List, Dict, Any
 from src.agents.CaseOrchestratorAgent.AgentState import AgentState
 from src.agents.CaseOrchestratorAgent.tools.plan_actions import plan_actions_and_create_final_draft
 from src.agents.CaseOrchestratorAgent.utils.build_container import get_container
+from src.agents.CaseOrchestratorAgent.utils.state_payloads import compact_plan_result
 
 from src.agents.CaseOrchestratorAgent.AgentState import DraftsState, ActionsState
 from src.models.db_schemes import Drafts as DraftORM, Actions as ActionORM
@@ -67,7 +68,7 @@ async def plan_non_auth_actions_node(state: AgentState) -> AgentState:
     print("%" * 20)
 
 
-    return {"non_auth_plan_actions": result, "non_auth_done": True,}
+    return {"non_auth_plan_result": compact_plan_result(result), "non_auth_done": True,}
 
 
 
@@ -111,7 +112,7 @@ async def plan_auth_actions_node(state: AgentState) -> AgentState:
     print(f" Imported : plan auth actions node is done ")
     print("%"*20)
 
-    return {"auth_plan_result": result, "auth_done": True,}
+    return {"auth_plan_result": compact_plan_result(result), "auth_done": True,}
 
 
 
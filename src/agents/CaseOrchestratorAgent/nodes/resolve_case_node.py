@@ -0,0 +1,50 @@
+from src.agents.CaseOrchestratorAgent.AgentState import AgentState
+from src.agents.CaseOrchestratorAgent.nodes.create_case_node import create_case_node
+from src.agents.CaseOrchestratorAgent.nodes.message_writer_node import create_msg_node
+from src.agents.CaseOrchestratorAgent.utils.build_container import get_container
+
+
+async def _release_claim(state: AgentState) -> None:
+    container = await get_container()
+    if container.inbound_deduper is not None:
+        container.inbound_deduper.release((state.get("Message") or {}).get("external_message_id"))
+
+
+async def resolve_case_and_message_node(state: AgentState) -> AgentState:
+    """
+    Case resolution + inbound message persistence, run in parallel with the LLM extraction
+    (joined at save_extraction_node). Both steps are DB-only: the [CASE: uuid] token is found
+    by regex in create_case_node, so nothing here waits on the LLM.
+
+    One node on purpose: graph steps are synchronous, so two nodes would make the
+    message write wait for the extraction anyway.
+    Returns only Case / case_id / Message / duplicate_of / errors, never the whole state (parallel writes).
+    """
+    errors = []
+    try:
+        case_update = await create_case_node({**state, "errors": errors})
+        if errors or not case_update.get("Case"):
+            errors = errors or [{"stage": "create_case_node", "error": "No case resolved"}]
+        else:
+            msg_update = await create_msg_node({**state, **case_update, "errors": errors})
+    except Exception:
+        await _release_claim(state)
+        raise
+
+    if errors:
+        # message not stored: a re-delivery of this mail must not be dropped as a duplicate
+        await _release_claim(state)
+        if not case_update.get("Case"):
+            return {"errors": errors}
+        return {"Case": case_update["Case"], "case_id": case_update["case_id"], "errors": errors}
+
+    if msg_update.get("duplicate_of"):
+        # another worker stored the same Message-ID first: it owns the mail, this run stops at the join
+        await _release_claim(state)
+        return {"duplicate_of": msg_update["duplicate_of"]}
+
+    return {
+        "Case": case_update["Case"],
+        "case_id": case_update["case_id"],
+        "Message": msg_update["Message"],
+    }
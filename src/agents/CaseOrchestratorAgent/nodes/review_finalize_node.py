@@ -1,15 +1,24 @@
 from src.agents.CaseOrchestratorAgent.AgentState import AgentState
 from src.agents.CaseOrchestratorAgent.tools.review_finalize import finalize_case_after_review
 from src.agents.CaseOrchestratorAgent.utils.build_container import get_container
+from src.agents.CaseOrchestratorAgent.utils.state_payloads import StatePayloads
 
 
-import asyncio
 from typing import Any, Dict
 
+from langgraph.types import interrupt
 
-async def _ainput(prompt: str) -> str:
-    # async-safe input (so your async graph doesn't block the event loop badly)
-    return await asyncio.to_thread(input, prompt)
+from src.models.CasesModel import CasesModel
+
+REVIEW_FIELDS = (
+    "decision",
+    "reviewer_email",
+    "reviewer_name",
+    "support_from_email",
+    "subject",
+    "edited_customer_reply",
+    "review_notes",
+)
 
 
 async def human_review_node(state: AgentState) -> AgentState:
@@ -25,42 +34,50 @@ async def human_review_node(state: AgentState) -> AgentState:
         "review_notes",
     ]
     if all(k in human_review for k in required_keys):
-        return state
+        return {}
 
     # Defaults (safe fallbacks)
     msg = state.get("Message") or {}
     default_subject = msg.get("subject") or "Re: Your request"
     default_support_from = msg.get("to_email") or "younis.eng.software@gmail.com"
-
-    # Ask human
-    decision = (await _ainput("Decision [approved/rejected/needs_changes] (default=approved): ")).strip() or "approved"
-    reviewer_email = (await _ainput("Reviewer email: ")).strip() or "alsaadi.younus@gmail.com"
-    reviewer_name = (await _ainput("Reviewer name: ")).strip() or "Younus AL-Saadi"
-    support_from_email = (await _ainput(f"Support from email (default={default_support_from}): ")).strip() or default_support_from
-    subject = (await _ainput(f"Subject (default={default_subject}): ")).strip() or default_subject
-
-    edited_customer_reply = (await _ainput(
-        "Edited customer reply (leave empty = keep generated draft): "
-    )).strip()
-
-    review_notes = (await _ainput("Review notes (optional): ")).strip()
-
-    # Store in state (this is what you asked for)
-    state["human_review"] = {
-        "decision": decision,
-        "reviewer_email": reviewer_email,
-        "reviewer_name": reviewer_name,
-        "support_from_email": support_from_email,
-        "subject": subject,
-        "edited_customer_reply": edited_customer_reply,
-        "review_notes": review_notes,
+    defaults = {
+        "decision": "approved",
+        "reviewer_email": "alsaadi.younus@gmail.com",
+        "reviewer_name": "Younus AL-Saadi",
+        "support_from_email": default_support_from,
+        "subject": default_subject,
+        "edited_customer_reply": "",
+        "review_notes": "",
     }
 
+    case_uuid = (state.get("Case") or {}).get("case_uuid")
+    thread_id = state.get("graph_thread_id")
+    container = await get_container()
+
+    # Remember which graph run to resume for this case (runs again on resume: idempotent)
+    if case_uuid and thread_id:
+        cases_model = await CasesModel.create_instance(db_client=container.db_client)
+        await cases_model.merge_case_status_meta(case_uuid, {"review_thread_id": thread_id})
+
+    # the draft is referenced by id in the state, its text is read from the drafts table
+    draft = await StatePayloads(container, state).latest_draft("public_reply")
+
+    # Pause: the state is checkpointed and the run ends here (no thread / memory held while waiting).
+    # POST /api/v1/cases/{case_id}/review resumes it; interrupt() then returns the reviewer's decision.
+    review = interrupt({
+        "case_id": str(case_uuid) if case_uuid else None,
+        "customer_reply_draft": draft.customer_reply_draft if draft else None,
+        "defaults": defaults,
+    })
+
+    provided = {k: v for k, v in (review or {}).items() if k in REVIEW_FIELDS and v not in (None, "")}
+    human_review = {**defaults, **provided}
+
     print("="*20)
-    print("state of human_review is :", state["human_review"])
+    print("state of human_review is :", human_review)
     print("="*20)
 
-    return state
+    return {"human_review": human_review}
 
 
 async def review_finalize_node(state:AgentState)->AgentState:
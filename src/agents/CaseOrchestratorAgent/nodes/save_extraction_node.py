@@ -25,12 +25,30 @@ def _extraction_orm_to_state(msg: "Extractions") -> "ExtractionsState":
 async def save_extraction_node(state: AgentState):
     container = await get_container()
 
-    msg=state.get("Message")
+    msg=state.get("Message") or {}
     message_id=msg.get("message_id")
     case_id=state.get("case_id")
 
+    deduper = container.inbound_deduper
+    external_message_id = msg.get("external_message_id")
+
+    if state.get("duplicate_of"):
+        # the resolve branch found the mail stored by another worker: nothing to save here
+        return {"llm_response_extractions": None}
+
+    if not message_id or not case_id:
+        # resolve branch failed (no case resolved / message not stored); its error is in the state
+        if deduper is not None:
+            deduper.release(external_message_id)
+        state.setdefault("errors", []).append(
+            {"stage": "save_extraction_node", "error": "No stored message / case, extraction not saved"})
+        return state
+
     llm_result = state.get("llm_response_extractions") or {}
     if not isinstance(llm_result, dict) or not llm_result:
+        # extraction failed: the mail is not processed, a re-delivery must not be skipped
+        if deduper is not None:
+            deduper.release(external_message_id)
         state.setdefault("errors", []).append({"stage": "save_extraction_node", "error": "No llm_result in state"})
         return state
 
@@ -41,14 +59,21 @@ async def save_extraction_node(state: AgentState):
         case_id=case_id,
         llm_result = llm_result,
     )
+    if not extraction:
+        if deduper is not None:
+            deduper.release(external_message_id)
+        state.setdefault("errors", []).append(
+            {"stage": "save_extraction_node", "error": "save_extraction returned None"})
+        return state
+
     print("=" * 20)
     print(f"intents is {extraction.intents}")
     print(f"entities is {extraction.entities}")
     print("="*20)
 
-    if not extraction:
-        state.setdefault("errors", []).append(
-            {"stage": "save_extraction_node", "error": "save_extraction returned None"})
-        return state
+    # processed: from now on a re-delivery of this Message-ID is a duplicate
+    if deduper is not None:
+        deduper.mark_processed(external_message_id, message_id, case_id)
 
-    return {"extractions":_extraction_orm_to_state(extraction)}
+    # the raw LLM answer is persisted now: keep it out of every following checkpoint
+    return {"extractions": _extraction_orm_to_state(extraction), "llm_response_extractions": None}
@@ -0,0 +1,12 @@
+from typing import List, Union
+
+from langgraph.graph import END
+
+from src.agents.CaseOrchestratorAgent.AgentState import AgentState
+
+
+def route_after_dedupe(state: AgentState) -> Union[str, List[str]]:
+    # duplicate delivery: stop before any LLM call; else fan out (extraction || case + message)
+    if state.get("duplicate_of"):
+        return END
+    return ["extract_intents_entities_node", "resolve_case_and_message_node"]
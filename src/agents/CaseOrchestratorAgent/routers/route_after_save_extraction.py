@@ -0,0 +1,10 @@
+from langgraph.graph import END
+
+from src.agents.CaseOrchestratorAgent.AgentState import AgentState
+
+
+def route_after_save_extraction(state: AgentState) -> str:
+    # duplicate found while storing the message (another worker won the race): stop, it owns the mail
+    if state.get("duplicate_of"):
+        return END
+    return "auth_policy_evaluator_node"
@@ -1,18 +1,191 @@
 import asyncio
 import logging
+from dataclasses import dataclass
 from uuid import UUID
 
-from src.agents.CaseOrchestratorAgent.utils.llm.validate_llm_response import parse_json_strict, validate_extraction_schema
+from src.agents.CaseOrchestratorAgent.utils.extraction.chunked_extraction import merge_extractions, split_into_chunks
+from src.agents.CaseOrchestratorAgent.utils.extraction.email_preprocess import preprocess_email_body
+from src.agents.CaseOrchestratorAgent.utils.extraction.fast_path import (
+    build_rule_based_result,
+    has_meter_reading_context,
+    intent_hints,
+    is_plain_meter_reading,
+    merge_rule_entities,
+)
+from src.agents.CaseOrchestratorAgent.utils.extraction.regex_entities import extract_entities_regex, find_case_uuid
+from src.llms.model_router import LARGE, SMALL, RoutingFeatures
+from src.llms.tokenizer import TokenCounter
+from src.agents.CaseOrchestratorAgent.utils.llm.output_schemas import (
+    ENTITIES_ONLY_JSON_SCHEMA,
+    EXTRACTION_JSON_SCHEMA,
+    INTENT_ONLY_JSON_SCHEMA,
+)
+from src.agents.CaseOrchestratorAgent.utils.llm.validate_llm_response import (
+    parse_json_strict,
+    validate_entities_only_schema,
+    validate_extraction_schema,
+    validate_intent_only_schema,
+)
 from src.models.ExtractionsModel import ExtractionsModel
 from src.models.db_schemes import Extractions
 from src.logs.log import build_logger
 from src.utils.client_deps_container import DependencyContainer
+from src.utils.metrics import EMAIL_PREPROCESS_TOKENS_SAVED, EXTRACTION_PATH
 
 log = build_logger(level=logging.DEBUG)
 
+# mode -> (static prompt templates, validator, structured-output schema)
+EXTRACTION_MODES = {
+    "full": (("system_prompt", "footer_prompt"), validate_extraction_schema, EXTRACTION_JSON_SCHEMA),
+    "intent_only": (("intent_only_system_prompt",), validate_intent_only_schema, INTENT_ONLY_JSON_SCHEMA),
+    "entities_only": (("entities_only_system_prompt",), validate_entities_only_schema, ENTITIES_ONLY_JSON_SCHEMA),
+}
+
 
 import json
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, List, Optional
+
+
+def _result_from_semantic_hit(hit: Dict[str, Any], subject: Optional[str], body: str) -> Dict[str, Any]:
+    """
+    Build a full extraction result from a near-duplicate hit:
+    intents come from the cache, entities from the cheap regex pass on THIS email.
+    """
+    entities = extract_entities_regex(body)
+    entities["topic_keywords"] = hit.get("topic_keywords") or []
+
+    cached_conf = hit.get("confidence")
+    confidence = min(float(cached_conf), hit["similarity"]) if cached_conf is not None else hit["similarity"]
+
+    return {
+        "case_id": find_case_uuid(subject, body),
+        "message_id": None,
+        "language": hit.get("language") or "other",
+        "intents": hit["intents"],
+        "entities": entities,
+        "overall_confidence": confidence,
+        "needs_followup": False,
+        "missing_fields_for_next_step": [],
+        "notes_for_agent": f"semantic cache hit (similarity={hit['similarity']:.3f})",
+    }
+
+
+def preprocess_body(container: DependencyContainer, body: str, token_counter: TokenCounter) -> str:
+    """
+    Strip quoted history / signatures / disclaimers and cap the body size before prompting.
+    The semantic cache is keyed on this text: its backfill must prepare bodies the same way.
+    """
+    settings = container.settings
+    if not getattr(settings, "EMAIL_PREPROCESS_ENABLED", True):
+        return body
+
+    cleaned = preprocess_email_body(
+        body,
+        token_counter=token_counter,
+        max_tokens=getattr(settings, "EMAIL_MAX_BODY_TOKENS", None),
+    )
+    EMAIL_PREPROCESS_TOKENS_SAVED.observe(cleaned.tokens_saved)
+    log.debug(
+        f"Email pre-processing: {cleaned.original_tokens} -> {cleaned.tokens} tokens "
+        f"(saved {cleaned.tokens_saved}, removed lines {cleaned.removed_lines}, truncated={cleaned.truncated})"
+    )
+
+    text = cleaned.text
+    if cleaned.case_refs:
+        # case id only present in the quoted thread: keep it as a case token
+        text = "\n".join([text] + [f"[CASE: {ref}]" for ref in cleaned.case_refs])
+    return text
+
+
+def _routing_features(container: DependencyContainer, from_email: str, subject: Optional[str], body: str) -> RoutingFeatures:
+    hints = intent_hints(subject, body)
+    sensitive = set(getattr(container.settings, "SENSITIVE_INTENTS", None) or [])
+    return RoutingFeatures(
+        body_tokens=TokenCounter.for_client(container.generation_client).count(body),
+        intent_count=len(hints),
+        requires_auth=bool(sensitive.intersection(hints)),
+        sender=(from_email or "").lower() or None,
+    )
+
+
+@dataclass
+class _Generation:
+    answer: str                # raw answer, as cached
+    parsed: Dict[str, Any]     # validated JSON
+    total_tokens: int
+    cost: Any                  # provider cost string / number (see model_router.parse_cost)
+    model_id: Optional[str]    # model that answered; None = the client's default model
+
+
+async def _generate_validated(
+    container: DependencyContainer,
+    prompt: str,
+    chat_history: list,
+    validate,
+    json_schema: Dict[str, Any],
+    model_id: Optional[str] = None,
+) -> _Generation:
+    """
+    One generation call under the JSON schema (structured output), parsed and validated.
+    Raises RuntimeError when no provider answered, ValueError when the answer is invalid.
+    """
+    kwargs = {"model_id": model_id} if model_id else {}
+    result = await container.generation_client.agenerate_text(
+        prompt=prompt,
+        chat_history=chat_history,
+        json_schema=json_schema,
+        **kwargs,
+    )
+    if not result:
+        # the resilient client returns None once every provider (and retry) failed
+        raise RuntimeError(f"No answer from the generation providers (model_id={model_id})")
+
+    answer, total_tokens, cost = result
+    llm_answer = parse_json_strict(answer)
+    validate(llm_answer)
+    return _Generation(answer, llm_answer, total_tokens, cost, model_id)
+
+
+async def _generate_routed(
+    container: DependencyContainer,
+    from_email: str,
+    prompt: str,
+    chat_history: list,
+    validate,
+    json_schema: Dict[str, Any],
+    tier: str,
+) -> _Generation:
+    """
+    Routed generation: a small-tier call that fails (no answer, or invalid JSON) is retried once
+    on the large model. The result's model_id is the model that actually answered.
+    """
+    router = container.model_router
+    sender = (from_email or "").lower() or None
+
+    start = time.perf_counter()
+    try:
+        generation = await _generate_validated(
+            container, prompt, chat_history, validate, json_schema, model_id=router.model_id(tier)
+        )
+    except (ValueError, RuntimeError) as e:
+        router.record(tier, ok=False, latency_s=time.perf_counter() - start, sender=sender)
+        if tier != SMALL:
+            raise
+        log.warning(f"Small model call failed ({e}), escalating to {router.model_id(LARGE)}")
+        tier = LARGE
+        start = time.perf_counter()
+        try:
+            generation = await _generate_validated(
+                container, prompt, chat_history, validate, json_schema, model_id=router.model_id(tier)
+            )
+        except (ValueError, RuntimeError):
+            router.record(tier, ok=False, latency_s=time.perf_counter() - start, sender=sender)
+            raise
+
+    router.record(tier, ok=True, latency_s=time.perf_counter() - start,
+                  total_tokens=generation.total_tokens, cost=generation.cost)
+    return generation
 
 
 async def extract_intents_entities(
@@ -25,11 +198,180 @@ async def extract_intents_entities(
     Build prompts from templates and extract structured intents/entities.
     Returns a dict parsed from JSON (no free text).
     """
+    settings = container.settings
+    token_counter = TokenCounter.for_client(container.generation_client)
+
+    # 0) Keep only the new content of the email
+    body = preprocess_body(container, body, token_counter)
+
+    # rule-based entities for the very regular formats (contract/meter numbers, postal code, kWh, dates)
+    rule_entities = extract_entities_regex(body)
+
+    # fast path: plain meter-reading submissions skip the LLM or use the small intent-only prompt
+    fast_path = (getattr(settings, "EXTRACTION_FAST_PATH", "off") or "off").lower()
+    if fast_path in ("skip_llm", "intent_only") and is_plain_meter_reading(subject, body, rule_entities):
+        return await _extract_fast_path(container, from_email, subject, body, rule_entities, fast_path)
+
+    threshold = getattr(settings, "EXTRACTION_CHUNK_THRESHOLD_TOKENS", 0)
+    is_long = bool(threshold) and token_counter.count(body) > threshold
+
+    # local intent classifier: when it is confident, the LLM only extracts entities
+    classifier = getattr(container, "intent_classifier", None)
+    if classifier is not None and not is_long:
+        intents, confident = classifier.predict(
+            subject, body, min_confidence=getattr(settings, "INTENT_CLASSIFIER_MIN_CONFIDENCE", 0.85)
+        )
+        log.debug(f"Local intent classifier: {intents} confident={confident}")
+        if confident:
+            return await _extract_with_local_intents(container, from_email, subject, body, rule_entities, intents)
+
+    # very long emails: map-reduce over token-bounded chunks, latency ~ one chunk instead of the whole body
+    llm_answer = None
+    if is_long:
+        chunks = split_into_chunks(body, token_counter, settings.EXTRACTION_CHUNK_TOKENS)
+        if len(chunks) > 1:
+            EXTRACTION_PATH.labels(path="chunked").inc()
+            llm_answer = await _extract_chunked(container, from_email, subject, chunks)
 
-    # 1) Load templates
-    system_prompt = container.template_parser.get_template_from_locales(
-        "extract_intents", "system_prompt"
+    if llm_answer is None:
+        EXTRACTION_PATH.labels(path="llm").inc()
+        llm_answer = await _extract_single(container, from_email, subject, body)
+
+    llm_answer["entities"] = merge_rule_entities(
+        llm_answer.get("entities"), rule_entities, meter_context=has_meter_reading_context(subject, body)
     )
+    return llm_answer
+
+
+async def _extract_fast_path(
+    container: DependencyContainer,
+    from_email: str,
+    subject: Optional[str],
+    body: str,
+    rule_entities: Dict[str, Any],
+    mode: str,
+) -> Dict[str, Any]:
+    required_fields = getattr(container.settings, "REQUIRED_FIELDS_FOR_VERIFICATION", None) or []
+
+    if mode == "skip_llm":
+        EXTRACTION_PATH.labels(path="rules").inc()
+        llm_answer = build_rule_based_result(subject, body, rule_entities, required_fields)
+        log.debug("Plain meter reading: rule-based extraction, LLM skipped")
+    else:
+        EXTRACTION_PATH.labels(path="intent_only").inc()
+        intent_answer = await _extract_single(container, from_email, subject, body, mode="intent_only")
+        llm_answer = build_rule_based_result(
+            subject,
+            body,
+            rule_entities,
+            required_fields,
+            intents=intent_answer["intents"],
+            language=intent_answer.get("language"),
+            overall_confidence=intent_answer.get("overall_confidence"),
+            notes_for_agent=intent_answer.get("notes_for_agent") or "",
+        )
+        log.debug("Plain meter reading: intent-only prompt + rule-based entities")
+
+    validate_extraction_schema(llm_answer)
+    log.debug(json.dumps(llm_answer, indent=2))
+    return llm_answer
+
+
+async def _extract_with_local_intents(
+    container: DependencyContainer,
+    from_email: str,
+    subject: Optional[str],
+    body: str,
+    rule_entities: Dict[str, Any],
+    intents: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    EXTRACTION_PATH.labels(path="classifier").inc()
+
+    sensitive = set(getattr(container.settings, "SENSITIVE_INTENTS", None) or [])
+    intents = [
+        {
+            "name": i["name"],
+            "confidence": i["confidence"],
+            "requires_auth": i["name"] in sensitive,
+            "reason": "Local intent classifier.",
+        }
+        for i in intents
+    ]
+
+    entity_answer = await _extract_single(container, from_email, subject, body, mode="entities_only")
+
+    llm_answer = build_rule_based_result(
+        subject,
+        body,
+        merge_rule_entities(
+            entity_answer.get("entities"), rule_entities, meter_context=has_meter_reading_context(subject, body)
+        ),
+        getattr(container.settings, "REQUIRED_FIELDS_FOR_VERIFICATION", None) or [],
+        intents=intents,
+        language=entity_answer.get("language"),
+        overall_confidence=min(i["confidence"] for i in intents),
+        notes_for_agent=entity_answer.get("notes_for_agent") or "",
+    )
+    if entity_answer.get("case_id") and not llm_answer["case_id"]:
+        llm_answer["case_id"] = entity_answer["case_id"]
+
+    validate_extraction_schema(llm_answer)
+    log.debug("Intents from local classifier, entities from LLM")
+    log.debug(json.dumps(llm_answer, indent=2))
+    return llm_answer
+
+
+async def _extract_chunked(
+    container: DependencyContainer,
+    from_email: str,
+    subject: Optional[str],
+    chunks: List[str],
+) -> Dict[str, Any]:
+    log.debug(f"Chunked extraction: {len(chunks)} chunks")
+
+    results = await asyncio.gather(
+        *[
+            _extract_single(container, from_email, subject, chunk, use_semantic_cache=False)
+            for chunk in chunks
+        ],
+        return_exceptions=True,
+    )
+
+    ok = [r for r in results if isinstance(r, dict)]
+    failed = [r for r in results if isinstance(r, BaseException)]
+    for err in failed:
+        log.warning(f"Chunk extraction failed: {err!r}")
+    if not ok:
+        raise failed[0]
+
+    llm_answer = merge_extractions(ok)
+    validate_extraction_schema(llm_answer)
+
+    log.debug("\n--- LLMs JSON (merged from chunks) ---")
+    log.debug(json.dumps(llm_answer, indent=2))
+
+    return llm_answer
+
+
+async def _extract_single(
+    container: DependencyContainer,
+    from_email: str,
+    subject: Optional[str],
+    body: str,
+    use_semantic_cache: bool = True,
+    mode: str = "full",
+) -> Dict[str, Any]:
+    """
+    One extraction LLM call (behind the exact-match and near-duplicate caches).
+    mode: "full" (intents + entities), "intent_only" or "entities_only" (smaller prompts, partial JSON).
+    """
+
+    # 1) Load static templates (rules + schema + few-shot, or the smaller partial prompt)
+    template_keys, validate, json_schema = EXTRACTION_MODES[mode]
+    static_prompts = [
+        container.template_parser.get_template_from_locales("extract_intents", key)
+        for key in template_keys
+    ]
 
     # 2) Build document prompt (email content)
     document_prompt = container.template_parser.get_template_from_locales(
@@ -42,16 +384,11 @@ async def extract_intents_entities(
         },
     )
 
-    # 3) Build footer (schema + few-shot + task variables)
-    footer_prompt = container.template_parser.get_template_from_locales(
-        "extract_intents",
-        "footer_prompt"
-    )
-
-    # 4) Chat history: system message only
+    # 3) Chat history: everything static goes into the system message, so it is a byte-identical
+    #    prefix on every call and the provider's prompt prefix cache can reuse it
     chat_history = [
         container.generation_client.construct_prompt(
-            prompt=system_prompt,
+            prompt="\n\n".join(static_prompts),
             role=container.generation_client.enums.SYSTEM.value,
         )
     ]
@@ -59,23 +396,91 @@ async def extract_intents_entities(
     log.debug(f"chat_history is {chat_history}")
     log.debug("="*20)
 
-    # 5) Full prompt: doc + footer
-    full_prompt = "\n\n".join([document_prompt, footer_prompt])
+    # 4) Full prompt: only the dynamic email, sent last
+    full_prompt = document_prompt
 
     log.debug(f"Full prompt: is {full_prompt}")
     log.debug("=" * 20)
 
-    # 6) Generate
-    answer, total_tokens, cost = await asyncio.to_thread(
-        container.generation_client.generate_text,
-        full_prompt,
-        chat_history,
-    )
+    # 5) Model tier from cheap features (body length, topic hints, auth, prior small-model failures)
+    generation_client = container.generation_client
+    router = getattr(container, "model_router", None)
+    tier = None
+    model_id = generation_client.generation_model_id
+    if router is not None:
+        tier = router.choose(_routing_features(container, from_email, subject, body))
+        model_id = router.model_id(tier)
 
-    # parse json
-    llm_answer = parse_json_strict(answer)
-    # 8) enforce the required keys
-    validate_extraction_schema(llm_answer)
+    # Exact-match cache lookup (same model + temperature + rendered messages)
+    llm_cache = getattr(container, "llm_cache", None)
+    cache_messages = chat_history + [
+        generation_client.construct_prompt(prompt=full_prompt, role=generation_client.enums.USER.value)
+    ]
+    cache_key = None
+    answer = None
+
+    if llm_cache is not None:
+        cache_key = llm_cache.make_key(
+            model_id=model_id,
+            temperature=generation_client.default_generation_temperature,
+            messages=cache_messages,
+        )
+        answer = await llm_cache.aget(cache_key)
+        if answer is not None:
+            log.debug(f"LLM cache hit for extraction key={cache_key[:12]}")
+            try:
+                llm_answer = parse_json_strict(answer)
+                validate(llm_answer)
+            except ValueError as e:
+                # stored before the output schema changed: regenerate (and overwrite)
+                log.warning(f"Cached extraction does not match the output schema ({e}), regenerating")
+                answer = None
+
+    # 6) Near-duplicate lookup: reuse intents of a very similar earlier email, re-extract entities by regex
+    # chunks are partial emails: never look them up / store them as whole-email answers
+    use_semantic_cache = use_semantic_cache and mode == "full"
+    semantic_cache = getattr(container, "semantic_cache", None) if use_semantic_cache else None
+    body_embedding = None
+    if answer is None and semantic_cache is not None:
+        hit, body_embedding = await semantic_cache.lookup(body)
+        if hit is not None:
+            llm_answer = _result_from_semantic_hit(hit, subject, body)
+            validate_extraction_schema(llm_answer)
+            log.debug(f"Semantic cache hit (similarity={hit['similarity']:.3f}), LLM skipped")
+            return llm_answer
+
+    # 7) Generate, parse json and enforce the required keys (cache hits were validated at lookup)
+    from_cache = answer is not None
+    total_tokens = 0
+    if not from_cache and tier is not None:
+        generation = await _generate_routed(
+            container, from_email, full_prompt, chat_history, validate, json_schema, tier
+        )
+        answer, llm_answer, total_tokens = generation.answer, generation.parsed, generation.total_tokens
+        answered_by = generation.model_id
+        if answered_by != model_id and llm_cache is not None:
+            # escalated: store under the model that actually answered
+            cache_key = llm_cache.make_key(
+                model_id=answered_by,
+                temperature=generation_client.default_generation_temperature,
+                messages=cache_messages,
+            )
+        model_id = answered_by
+    elif not from_cache:
+        generation = await _generate_validated(container, full_prompt, chat_history, validate, json_schema)
+        answer, llm_answer, total_tokens = generation.answer, generation.parsed, generation.total_tokens
+
+    # only cache answers that passed validation
+    if llm_cache is not None and cache_key and not from_cache:
+        await llm_cache.aset(
+            cache_key,
+            answer,
+            model_id=model_id,
+            total_tokens=total_tokens,
+        )
+
+    if semantic_cache is not None and not from_cache:
+        await semantic_cache.store(body, llm_answer, embedding=body_embedding)
 
     log.debug("\n--- LLMs JSON ---")
     log.debug(json.dumps(llm_answer, indent=2))
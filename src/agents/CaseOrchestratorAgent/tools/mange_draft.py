@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import asyncio
 from datetime import datetime, timezone
 from uuid import UUID
 from src.agents.CaseOrchestratorAgent.utils.auth.auth_draft_utils import compute_missing_fields, build_internal_summary, \
     DRAFT_TYPE_AUTH, build_auth_request_draft
 from src.agents.CaseOrchestratorAgent.utils.llm.llm_parser import parse_llm_email_json
+from src.agents.CaseOrchestratorAgent.utils.llm.output_schemas import EMAIL_REPLY_JSON_SCHEMA
 from src.email_servers.IMAPSMTP.send_email_via_mcp import send_email_via_mcp
 from src.models.CasesModel import CasesModel
 from src.models.DraftsModel import DraftsModel
@@ -78,10 +78,10 @@ async def create_or_update_auth_request_draft(
 
     full_prompt = "\n\n".join([parms_prompt, footer_prompt])
 
-    answer, total_tokens, cost = await asyncio.to_thread(
-        container.generation_client.generate_text,
-        full_prompt,
-        chat_history,
+    answer, total_tokens, cost = await container.generation_client.agenerate_text(
+        prompt=full_prompt,
+        chat_history=chat_history,
+        json_schema=EMAIL_REPLY_JSON_SCHEMA,
     )
     print(f"email from LLm is {answer}")
     print("===============")
@@ -1,11 +1,15 @@
 import logging
 from typing import Optional
 
+from sqlalchemy.exc import IntegrityError
+
 from src.agents.CaseOrchestratorAgent.utils.message_utils import Direction
 from src.models.MessagesModel import MessagesModel
 from src.models.db_schemes import Messages
 from src.logs.log import build_logger
 from src.utils.client_deps_container import DependencyContainer
+from src.utils.inbound_dedup import normalize_message_id
+from src.utils.metrics import INBOUND_DUPLICATES
 
 log = build_logger(level=logging.DEBUG)
 
@@ -18,12 +22,16 @@ async def message_writer(
     body: str,
     from_email: str,
     to_email: str,
-) -> Messages:
+    external_message_id: Optional[str] = None,
+) -> Optional[Messages]:
     """
     Stores one email message (inbound/outbound) in the Messages table.
     - Stores RAW subject (not normalized).
     - body must be str.
     - direction must be inbound/outbound.
+    - external_message_id: Message-ID header, unique; returns None if it was already stored and
+      processed (another worker ingested the same mail concurrently). A stored but unprocessed row
+      (earlier run failed before its extraction was saved) is returned, so the retry continues on it.
     """
     if direction not in ("inbound", "outbound"):
         raise ValueError(f"Invalid direction: {direction}")
@@ -43,10 +51,22 @@ async def message_writer(
         body=body_raw,
         from_email=from_email,
         to_email=to_email,
+        external_message_id=normalize_message_id(external_message_id),
     )
 
     try:
         new_message = await message_model.create_message(message=msg)
+    except IntegrityError:
+        if msg.external_message_id is None:
+            log.exception("Message creation failed")
+            raise
+        found = await message_model.get_ingest_state_by_external_id(msg.external_message_id)
+        if found is not None and not found[1]:
+            log.warning(f"Message-ID stored but not processed, retrying on it: {msg.external_message_id}")
+            return found[0]
+        INBOUND_DUPLICATES.labels(source="constraint").inc()
+        log.warning(f"Message-ID already stored, skipping duplicate: {msg.external_message_id}")
+        return None
     except Exception:
         log.exception("Message creation failed")
         raise
@@ -0,0 +1,201 @@
+"""
+Run many inbound messages through the shared case graph (backlog catch-up, bulk re-processing).
+
+- bounded concurrency: `concurrency` workers pull from a small queue fed lazily from the input,
+  so tens of thousands of queued emails never sit in memory at once
+- per-item timeout and error isolation: a failing / hanging email yields a failed result, the batch goes on
+- results are streamed back in completion order as each case finishes
+
+CLI (from repo root), JSONL in -> JSONL out:
+    python -m src.agents.CaseOrchestratorAgent.utils.batch_runner --input backlog.jsonl --output results.jsonl --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Optional, Union
+from uuid import uuid4
+
+from src.agents.CaseOrchestratorAgent.utils.graph_runtime import pending_review, run_case_graph
+from src.agents.CaseOrchestratorAgent.utils.node_metrics import timing_breakdown
+from src.utils.metrics import GRAPH_BATCH_IN_FLIGHT, GRAPH_BATCH_ITEMS
+
+Messages = Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]
+
+_DONE = object()
+
+
+@dataclass
+class BatchItemResult:
+    index: int
+    status: str  # done | pending_review | duplicate | failed | timeout
+    latency_s: float
+    graph_thread_id: str
+    case_id: Optional[str] = None
+    errors: Optional[list] = None
+    error: Optional[str] = None
+    node_ms: Optional[Dict[str, float]] = None  # with GRAPH_NODE_TIMINGS_IN_STATE
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("done", "pending_review", "duplicate")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+async def _iterate(messages: Messages) -> AsyncIterator[Dict[str, Any]]:
+    if hasattr(messages, "__aiter__"):
+        async for m in messages:
+            yield m
+    else:
+        for m in messages:
+            yield m
+
+
+async def _run_item(container, index: int, message: Dict[str, Any], item_timeout_s: Optional[float]) -> BatchItemResult:
+    thread_id = str(uuid4())
+    start = time.perf_counter()
+    GRAPH_BATCH_IN_FLIGHT.inc()
+    try:
+        final_state = await asyncio.wait_for(
+            run_case_graph(container, {"direction": "inbound", **message}, thread_id=thread_id),
+            timeout=item_timeout_s,
+        )
+        if final_state.get("duplicate_of"):
+            status = "duplicate"  # re-delivery after an outage: skipped before any LLM call
+        elif pending_review(final_state) is not None:
+            status = "pending_review"
+        else:
+            status = "done"
+        result = BatchItemResult(
+            index=index,
+            status=status,
+            latency_s=time.perf_counter() - start,
+            graph_thread_id=thread_id,
+            case_id=final_state.get("case_id") or (final_state.get("duplicate_of") or {}).get("case_id"),
+            errors=final_state.get("errors") or None,
+            node_ms=timing_breakdown(final_state) or None,
+        )
+    except asyncio.TimeoutError:
+        result = BatchItemResult(index=index, status="timeout", latency_s=time.perf_counter() - start,
+                                 graph_thread_id=thread_id, error=f"timed out after {item_timeout_s}s")
+    except Exception as e:
+        result = BatchItemResult(index=index, status="failed", latency_s=time.perf_counter() - start,
+                                 graph_thread_id=thread_id, error=repr(e))
+    finally:
+        GRAPH_BATCH_IN_FLIGHT.dec()
+
+    GRAPH_BATCH_ITEMS.labels(status=result.status).inc()
+    return result
+
+
+async def run_case_batch(
+    container,
+    messages: Messages,
+    concurrency: int = 16,
+    item_timeout_s: Optional[float] = 300.0,
+) -> AsyncIterator[BatchItemResult]:
+    """
+    Async generator over BatchItemResult, yielded as each message finishes (not in input order;
+    `index` is the position in the input). Stopping the iteration cancels the remaining work.
+    """
+    concurrency = max(1, int(concurrency))
+    inbox: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    outbox: asyncio.Queue = asyncio.Queue()
+
+    async def finish_workers():
+        for _ in range(concurrency):
+            await inbox.put(_DONE)
+
+    async def produce():
+        index = 0
+        try:
+            async for message in _iterate(messages):
+                await inbox.put((index, message))
+                index += 1
+        except Exception:
+            # bad input line / failing stream: let the workers drain and stop, the error is
+            # re-raised to the caller by `await producer` (not on cancellation: nobody reads the queue then)
+            await finish_workers()
+            raise
+        await finish_workers()
+
+    async def work():
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                await outbox.put(_DONE)
+                return
+            index, message = item
+            await outbox.put(await _run_item(container, index, message, item_timeout_s))
+
+    producer = asyncio.create_task(produce())
+    workers = [asyncio.create_task(work()) for _ in range(concurrency)]
+    try:
+        finished_workers = 0
+        while finished_workers < concurrency:
+            result = await outbox.get()
+            if result is _DONE:
+                finished_workers += 1
+                continue
+            yield result
+        await producer  # surfaces errors raised by the input iterable
+    finally:
+        for task in [producer, *workers]:
+            task.cancel()
+        await asyncio.gather(producer, *workers, return_exceptions=True)
+
+
+def _read_jsonl(path: str) -> Iterable[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+async def main_async(args):
+    from src.agents.CaseOrchestratorAgent.utils.build_container import get_container
+
+    container = await get_container()
+    await container.warmup()
+    concurrency = args.concurrency or container.settings.GRAPH_BATCH_CONCURRENCY
+    item_timeout_s = args.timeout or container.settings.GRAPH_BATCH_ITEM_TIMEOUT_SECONDS
+
+    counts: Dict[str, int] = {}
+    start = time.perf_counter()
+    with open(args.output, "a", encoding="utf-8") as out:
+        async for result in run_case_batch(
+            container, _read_jsonl(args.input), concurrency=concurrency, item_timeout_s=item_timeout_s
+        ):
+            out.write(json.dumps(result.to_dict(), default=str) + "\n")
+            counts[result.status] = counts.get(result.status, 0) + 1
+
+            total = sum(counts.values())
+            if total % args.progress_every == 0:
+                elapsed = time.perf_counter() - start
+                print(f"processed={total} {counts} ({total / elapsed:.2f} emails/s)")
+
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    print(f"done: processed={total} {counts} in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.2f} emails/s)")
+    await container.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--input", required=True,
+        help="JSONL, one message per line (from_email, to_email, subject, body, external_message_id)",
+    )
+    parser.add_argument("--output", required=True, help="JSONL results (appended)")
+    parser.add_argument("--concurrency", type=int, default=None, help="default: GRAPH_BATCH_CONCURRENCY")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per email, default: GRAPH_BATCH_ITEM_TIMEOUT_SECONDS")
+    parser.add_argument("--progress-every", type=int, default=100)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,4 +5,10 @@ async def get_container() -> DependencyContainer:
     global _container
     if _container is None:
         _container = await DependencyContainer.create()
-    return _container
\ No newline at end of file
+    return _container
+
+
+def set_container(container: DependencyContainer) -> None:
+    """Make `container` the one the graph nodes use (the FastAPI app registers its own at startup)."""
+    global _container
+    _container = container
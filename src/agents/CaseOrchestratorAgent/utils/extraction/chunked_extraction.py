@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from src.agents.CaseOrchestratorAgent.utils.extraction.regex_entities import ENTITY_KEYS, empty_entities
+from src.llms.tokenizer import TokenCounter
+
+PARAGRAPH_SPLIT_RE = re.compile(r"\n\s*\n")
+
+MAX_TOPIC_KEYWORDS = 10
+MAX_NOTES_CHARS = 300
+
+
+def _hard_split(text: str, token_counter: TokenCounter, max_tokens: int) -> List[str]:
+    """Split one oversized piece by lines, then by tokens."""
+    parts: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for line in text.split("\n"):
+        line_tokens = token_counter.count(line)
+        if line_tokens > max_tokens:
+            if current:
+                parts.append("\n".join(current))
+                current, current_tokens = [], 0
+            # split on token ids, not by slicing the text with the length of a decoded prefix
+            parts.extend(p.strip() for p in token_counter.split(line, max_tokens) if p.strip())
+            continue
+
+        if current and current_tokens + line_tokens > max_tokens:
+            parts.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(line)
+        current_tokens += line_tokens
+
+    if current:
+        parts.append("\n".join(current))
+    return parts
+
+
+def split_into_chunks(text: str, token_counter: TokenCounter, max_tokens: int) -> List[str]:
+    """
+    Token-bounded chunks that respect paragraph boundaries where possible.
+    Paragraphs are packed greedily; a paragraph bigger than max_tokens is split by lines.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for paragraph in PARAGRAPH_SPLIT_RE.split(text or ""):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+
+        para_tokens = token_counter.count(paragraph)
+        pieces = [paragraph] if para_tokens <= max_tokens else _hard_split(paragraph, token_counter, max_tokens)
+
+        for piece in pieces:
+            piece_tokens = token_counter.count(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _first_non_null(values: List[Any]) -> Optional[Any]:
+    for v in values:
+        if v is None:
+            continue
+        if isinstance(v, str) and (not v.strip() or v.strip().lower() in {"none", "null"}):
+            continue
+        return v
+    return None
+
+
+def merge_extractions(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reduce step for chunked extraction (results in chunk order):
+    - intents: merged by name, max confidence wins (its reason is kept), requires_auth is OR-ed
+    - entities: first non-null value in chunk order; topic_keywords: ordered union
+    - language: majority vote (ignoring "other")
+    - overall_confidence: max; needs_followup: any
+    - missing_fields_for_next_step: union minus fields that some chunk found
+    """
+    if not results:
+        raise ValueError("merge_extractions needs at least one chunk result")
+    if len(results) == 1:
+        return results[0]
+
+    # intents
+    intents_by_name: Dict[str, Dict[str, Any]] = {}
+    for r in results:
+        for intent in r.get("intents") or []:
+            name = intent.get("name")
+            if not name:
+                continue
+            conf = float(intent.get("confidence") or 0.0)
+            existing = intents_by_name.get(name)
+            if existing is None:
+                intents_by_name[name] = dict(intent, confidence=conf)
+                continue
+            requires_auth = bool(existing.get("requires_auth")) or bool(intent.get("requires_auth"))
+            if conf > existing["confidence"]:
+                intents_by_name[name] = dict(intent, confidence=conf)
+            intents_by_name[name]["requires_auth"] = requires_auth
+
+    intents = sorted(intents_by_name.values(), key=lambda i: i["confidence"], reverse=True)
+    # "Other" only survives if nothing more specific was found
+    if len(intents) > 1:
+        intents = [i for i in intents if i.get("name") != "Other"] or intents
+
+    # entities
+    entities = empty_entities()
+    for key in ENTITY_KEYS:
+        if key == "topic_keywords":
+            continue
+        entities[key] = _first_non_null([(r.get("entities") or {}).get(key) for r in results])
+
+    seen = set()
+    keywords: List[str] = []
+    for r in results:
+        for kw in (r.get("entities") or {}).get("topic_keywords") or []:
+            norm = str(kw).strip().lower()
+            if norm and norm not in seen:
+                seen.add(norm)
+                keywords.append(kw)
+    entities["topic_keywords"] = keywords[:MAX_TOPIC_KEYWORDS]
+
+    # language
+    languages = [r.get("language") for r in results if r.get("language") and r.get("language") != "other"]
+    language = Counter(languages).most_common(1)[0][0] if languages else (results[0].get("language") or "other")
+
+    # follow-up fields
+    missing: List[str] = []
+    for r in results:
+        for f in r.get("missing_fields_for_next_step") or []:
+            if f not in missing and entities.get(f) is None:
+                missing.append(f)
+
+    notes = list(dict.fromkeys(r.get("notes_for_agent") for r in results if r.get("notes_for_agent")))
+
+    return {
+        "case_id": _first_non_null([r.get("case_id") for r in results]),
+        "message_id": _first_non_null([r.get("message_id") for r in results]),
+        "language": language,
+        "intents": intents,
+        "entities": entities,
+        "overall_confidence": max(float(r.get("overall_confidence") or 0.0) for r in results),
+        "needs_followup": any(bool(r.get("needs_followup")) for r in results),
+        "missing_fields_for_next_step": missing,
+        "notes_for_agent": "; ".join(notes)[:MAX_NOTES_CHARS],
+    }
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.agents.CaseOrchestratorAgent.utils.extraction.regex_entities import UUID_RE, has_regex_entity
+from src.llms.tokenizer import TokenCounter
+
+# line categories
+KEEP = "keep"
+QUOTED = "quoted"
+SIGNATURE = "signature"
+DISCLAIMER = "disclaimer"
+# header block of a forwarded mail (From/Date/Subject/To); kept, the forwarded content is the request
+FORWARD_HEADER = "forward_header"
+
+# "On Tue, 30 Dec 2025 at 18:11, <x@y.de> wrote:" / "Am 30.12.2025 um 18:11 schrieb X <x@y.de>:"
+# (Gmail wraps long headers, so the start and the "wrote:" may be on two lines)
+QUOTE_HEADER_START_RE = re.compile(r"^(on|am)\s+\S.*", re.IGNORECASE)
+QUOTE_HEADER_END_RE = re.compile(r"\b(wrote|schrieb|a écrit|escribió)\b[^:]{0,120}:\s*$", re.IGNORECASE)
+FORWARD_MARKER_RE = re.compile(
+    r"^(-{2,}\s*(forwarded message|weitergeleitete nachricht)\s*-{2,}"
+    r"|begin forwarded message\s*:|anfang der weitergeleiteten nachricht\s*:)$",
+    re.IGNORECASE,
+)
+OUTLOOK_HEADER_RE = re.compile(
+    r"^(-{2,}\s*(original message|ursprüngliche nachricht|original nachricht)\s*-{2,}"
+    r"|_{10,}"
+    r"|(from|von)\s*:.+@.+)$",
+    re.IGNORECASE,
+)
+SIG_DELIMITER_RE = re.compile(r"^(--|-- |__)$")
+MOBILE_FOOTER_RE = re.compile(
+    r"^(sent from my \w+|von meinem \w+ gesendet|gesendet von meinem \w+|get outlook for \w+)",
+    re.IGNORECASE,
+)
+SIGN_OFF_RE = re.compile(
+    r"^(best|kind|warm)?\s*regards,?$|^(many\s+)?thanks,?$|^thank you,?$|^cheers,?$|^sincerely,?$"
+    r"|^(mit\s+)?(freundlichen|besten|herzlichen|viele|liebe|beste)\s+grüße?n?,?$|^mfg,?$|^lg,?$",
+    re.IGNORECASE,
+)
+DISCLAIMER_RE = re.compile(
+    r"(this (e-?mail|message)( and any attachments)? (is|are|may be) (confidential|intended)"
+    r"|confidentiality notice|disclaimer:"
+    r"|diese (e-?mail|nachricht) (enthält|ist) (vertrauliche|ausschließlich)"
+    r"|if you (are not|have received this) .*(intended recipient|in error)"
+    r"|please consider the environment before printing)",
+    re.IGNORECASE,
+)
+
+# sign-off + name lines kept (the name is an entity), the rest of the signature block is dropped
+SIGN_OFF_KEEP_LINES = 2
+# a sign-off only starts the signature when at most this many non-empty lines follow it before
+# the end of the new content ("Thanks," in the middle of a mail is just text)
+SIGN_OFF_MAX_TAIL_LINES = 4
+
+
+def _is_quote_header(line: str, next_line: Optional[str]) -> bool:
+    if OUTLOOK_HEADER_RE.match(line):
+        return True
+    if QUOTE_HEADER_START_RE.match(line):
+        # a real reply header carries the date; "Am Freitag schrieb ich Ihnen:" in the text does not
+        if QUOTE_HEADER_END_RE.search(line):
+            return any(c.isdigit() for c in line)
+        return (
+            next_line is not None
+            and bool(QUOTE_HEADER_END_RE.search(next_line))
+            and any(c.isdigit() for c in line + next_line)
+        )
+    return False
+
+
+def _closing_sign_offs(lines: List[str]) -> List[bool]:
+    """
+    Backward pass: for each line, True if it is a sign-off that closes its block, i.e. no later
+    sign-off and at most SIGN_OFF_MAX_TAIL_LINES non-empty lines follow before the block ends
+    (end of mail, reply header, '>' quote, disclaimer, signature delimiter, forward marker).
+    """
+    closing = [False] * len(lines)
+    tail, sign_off_seen = 0, False
+    for i in range(len(lines) - 1, -1, -1):
+        stripped = lines[i].strip()
+        nxt_stripped = lines[i + 1].strip() if i + 1 < len(lines) else None
+        if (
+            _is_quote_header(stripped, nxt_stripped)
+            or stripped.startswith(">")
+            or DISCLAIMER_RE.search(stripped)
+            or SIG_DELIMITER_RE.match(stripped)
+            or MOBILE_FOOTER_RE.match(stripped)
+            or FORWARD_MARKER_RE.match(stripped)
+        ):
+            tail, sign_off_seen = 0, False
+            continue
+        if SIGN_OFF_RE.match(stripped):
+            closing[i] = not sign_off_seen and tail <= SIGN_OFF_MAX_TAIL_LINES
+            sign_off_seen = True
+        if stripped:
+            tail += 1
+    return closing
+
+
+def classify_lines(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Pass over the body with one line of look-ahead; yields (category, line).
+    Everything after the first reply header is quoted history. A forwarded mail is kept
+    (header block included): it usually is what the customer wants handled.
+    Signature lines the rule-based entity pass would read (contract number, postal code,
+    dates, ...) are kept.
+    """
+    lines = list(lines)
+    closing_sign_offs = _closing_sign_offs(lines)
+
+    state = KEEP
+    keep_after_sign_off = 0
+    forward_header_lines = 0
+
+    for index, current in enumerate(lines):
+        nxt = lines[index + 1] if index + 1 < len(lines) else None
+        stripped = current.strip()
+        nxt_stripped = nxt.strip() if nxt is not None else None
+
+        if state == QUOTED:
+            yield QUOTED, current
+        elif FORWARD_MARKER_RE.match(stripped):
+            state, keep_after_sign_off, forward_header_lines = FORWARD_HEADER, 0, 0
+            yield KEEP, current
+        elif state == FORWARD_HEADER:
+            # "From: x@y" here is the forwarded mail's header, not a reply header
+            if stripped:
+                forward_header_lines += 1
+            elif forward_header_lines:
+                state = KEEP
+            yield KEEP, current
+        elif _is_quote_header(stripped, nxt_stripped):
+            state = QUOTED
+            yield QUOTED, current
+        elif stripped.startswith(">"):
+            yield QUOTED, current
+        elif DISCLAIMER_RE.search(stripped):
+            state = DISCLAIMER
+            yield DISCLAIMER, current
+        elif state == DISCLAIMER:
+            yield DISCLAIMER, current
+        elif state == SIGNATURE:
+            yield (KEEP if has_regex_entity(stripped) else SIGNATURE), current
+        elif SIG_DELIMITER_RE.match(stripped) or MOBILE_FOOTER_RE.match(stripped):
+            state = SIGNATURE
+            yield SIGNATURE, current
+        elif keep_after_sign_off:
+            if stripped:
+                keep_after_sign_off -= 1
+                if not keep_after_sign_off:
+                    state = SIGNATURE
+            yield KEEP, current
+        elif closing_sign_offs[index]:
+            keep_after_sign_off = SIGN_OFF_KEEP_LINES
+            yield KEEP, current
+        else:
+            yield KEEP, current
+
+
+@dataclass
+class PreprocessedEmail:
+    text: str
+    original_tokens: int
+    tokens: int
+    removed_lines: Dict[str, int] = field(default_factory=dict)
+    case_refs: List[str] = field(default_factory=list)  # case ids that only appeared in removed parts
+    truncated: bool = False
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.original_tokens - self.tokens)
+
+
+def preprocess_email_body(
+    body: str,
+    token_counter: Optional[TokenCounter] = None,
+    max_tokens: Optional[int] = None,
+) -> PreprocessedEmail:
+    """
+    Keep only the new content of an inbound email:
+    drops quoted thread history, '>' blocks, signatures and legal footers (forwarded mails are kept;
+    falls back to the original body if nothing is left), then truncates to max_tokens (tokenizer aware when a TokenCounter is given).
+    """
+    token_counter = token_counter or TokenCounter()
+    body = body or ""
+
+    kept: List[str] = []
+    removed_lines: Dict[str, int] = {}
+    removed_case_refs: List[str] = []
+    previous_blank = False
+
+    for category, line in classify_lines(body.splitlines()):
+        if category != KEEP:
+            removed_lines[category] = removed_lines.get(category, 0) + 1
+            removed_case_refs.extend(m.group(0).lower() for m in UUID_RE.finditer(line))
+            continue
+
+        line = line.strip()
+        if not line:
+            # collapse runs of blank lines
+            if previous_blank or not kept:
+                continue
+            previous_blank = True
+        else:
+            previous_blank = False
+        kept.append(line)
+
+    text = "\n".join(kept).strip()
+    if not text:
+        # everything looked like history / signature (e.g. a bare re-sent thread): better the
+        # whole (truncated) body than an empty prompt
+        text = body.strip()
+
+    # a reply often carries the case id only in the quoted history; keep it visible for extraction
+    kept_lower = text.lower()
+    case_refs = list(dict.fromkeys(c for c in removed_case_refs if c not in kept_lower))
+
+    truncated = False
+    if max_tokens and token_counter.count(text) > max_tokens:
+        text = token_counter.truncate(text, max_tokens).rstrip()
+        truncated = True
+
+    return PreprocessedEmail(
+        text=text,
+        original_tokens=token_counter.count(body),
+        tokens=token_counter.count(text),
+        removed_lines=removed_lines,
+        case_refs=case_refs,
+        truncated=truncated,
+    )
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional
+
+from src.agents.CaseOrchestratorAgent.utils.extraction.regex_entities import ENTITY_KEYS, find_case_uuid
+
+# Rule-based fast path for the most common traffic: plain meter-reading submissions.
+# Anything that looks like a second topic (question, correction, tariff, billing, personal data)
+# goes to the LLM.
+
+METER_READING_HINT_RE = re.compile(r"(meter\s*reading|zählerstand|zaehlerstand|ablesung|\breading\b)", re.IGNORECASE)
+CORRECTION_HINT_RE = re.compile(
+    r"(correct|korrigier|berichtig|falsch|wrong|mistake|fehler|typo|instead of|statt|update my reading)",
+    re.IGNORECASE,
+)
+OTHER_TOPIC_HINT_RE = re.compile(
+    r"(\?|tarif|tariff|price|preis|cancel|kündig|rechnung|invoice|\bbill|abschlag|installment|refund"
+    r"|address|adresse|umzug|moving|\bmove\b|bank|iban|name change|namensänderung|e-?mail change"
+    r"|complain|beschwerde|unzufrieden|dissatisfied)",
+    re.IGNORECASE,
+)
+GERMAN_HINT_RE = re.compile(r"([äöüß]|\b(hallo|guten tag|ich|mein|meine|der|die|das|und|vielen dank|grüße)\b)", re.IGNORECASE)
+ENGLISH_HINT_RE = re.compile(r"\b(hello|hi|dear|my|the|and|is|thank you|thanks|regards)\b", re.IGNORECASE)
+
+# coarse intent hints, only used to estimate how many topics an email carries (model routing)
+INTENT_HINT_RES = {
+    "MeterReadingSubmission": METER_READING_HINT_RE,
+    "MeterReadingCorrection": CORRECTION_HINT_RE,
+    "PersonalDataChange": re.compile(
+        r"(address|adresse|umzug|moving|\bmove\b|bank|iban|name change|namensänderung|e-?mail change)", re.IGNORECASE
+    ),
+    "ContractIssue": re.compile(r"(cancel|kündig|contract|vertrag|rechnung|invoice|\bbill|abschlag|installment|refund)", re.IGNORECASE),
+    "ProductInfoRequest": re.compile(r"(tarif|tariff|price|preis|product|produkt)", re.IGNORECASE),
+    "GeneralFeedback": re.compile(r"(complain|beschwerde|unzufrieden|dissatisfied|feedback|zufrieden)", re.IGNORECASE),
+}
+
+# longer emails almost always carry more than one topic
+PLAIN_READING_MAX_CHARS = 600
+
+RULE_CONFIDENCE = 0.9
+
+
+def is_plain_meter_reading(subject: Optional[str], body: str, entities: Dict[str, Any]) -> bool:
+    """Meter number + reading found by rules, reading vocabulary present, nothing else going on."""
+    body = body or ""
+    if len(body) > PLAIN_READING_MAX_CHARS:
+        return False
+    if not entities.get("meter_number") or entities.get("meter_reading_value") is None:
+        return False
+    if not METER_READING_HINT_RE.search(f"{subject or ''}\n{body}"):
+        return False
+    if CORRECTION_HINT_RE.search(body) or OTHER_TOPIC_HINT_RE.search(body):
+        return False
+    return True
+
+
+def has_meter_reading_context(subject: Optional[str], body: str) -> bool:
+    """Reading vocabulary present: only then are rule-found meter numbers / readings trusted."""
+    return bool(METER_READING_HINT_RE.search(f"{subject or ''}\n{body or ''}"))
+
+
+def intent_hints(subject: Optional[str], body: str) -> List[str]:
+    """Intent names whose keywords appear in the email (cheap, over-approximating)."""
+    text = f"{subject or ''}\n{body or ''}"
+    return [name for name, pattern in INTENT_HINT_RES.items() if pattern.search(text)]
+
+
+def guess_language(text: str) -> str:
+    de = len(GERMAN_HINT_RE.findall(text or ""))
+    en = len(ENGLISH_HINT_RE.findall(text or ""))
+    if not de and not en:
+        return "other"
+    return "de" if de > en else "en"
+
+
+# the rules pick "the first date" / "a LB-... token" without understanding the sentence:
+# an LLM null for these is an answer ("no reading date given"), not a gap to fill
+NEVER_FILLED_FROM_RULES = ("meter_reading_date", "birthdate")
+METER_ENTITY_KEYS = ("meter_number", "meter_reading_value")
+
+
+def merge_rule_entities(
+    llm_entities: Optional[Dict[str, Any]],
+    rule_entities: Dict[str, Any],
+    meter_context: bool = False,
+) -> Dict[str, Any]:
+    """
+    LLM values win; fields the LLM left empty are filled from the rule-based pass, except dates
+    and, without meter-reading context (see has_meter_reading_context), the meter fields.
+    """
+    merged = dict(llm_entities or {})
+    for key in ENTITY_KEYS:
+        if key == "topic_keywords":
+            merged.setdefault(key, rule_entities.get(key) or [])
+            continue
+        if key in NEVER_FILLED_FROM_RULES or (key in METER_ENTITY_KEYS and not meter_context):
+            continue
+        if merged.get(key) in (None, "") and rule_entities.get(key) is not None:
+            merged[key] = rule_entities[key]
+    return merged
+
+
+def build_rule_based_result(
+    subject: Optional[str],
+    body: str,
+    entities: Dict[str, Any],
+    required_fields: List[str],
+    intents: Optional[List[Dict[str, Any]]] = None,
+    language: Optional[str] = None,
+    overall_confidence: Optional[float] = None,
+    notes_for_agent: str = "",
+) -> Dict[str, Any]:
+    """
+    Full extraction result (same schema as the LLM output) from rule-based entities.
+    `intents` / `language` / `overall_confidence` come from the intent-only prompt when it was used.
+    """
+    if intents is None:
+        intents = [{
+            "name": "MeterReadingSubmission",
+            "confidence": RULE_CONFIDENCE,
+            "requires_auth": True,
+            "reason": "Meter number and reading found by rules.",
+        }]
+
+    missing = [f for f in required_fields or [] if entities.get(f) in (None, "")]
+    needs_auth = any(bool(i.get("requires_auth")) for i in intents)
+
+    return {
+        "case_id": find_case_uuid(subject, body),
+        "message_id": None,
+        "language": language or guess_language(body),
+        "intents": intents,
+        "entities": entities,
+        "overall_confidence": RULE_CONFIDENCE if overall_confidence is None else overall_confidence,
+        "needs_followup": bool(missing) and needs_auth,
+        "missing_fields_for_next_step": missing if needs_auth else [],
+        "notes_for_agent": notes_for_agent,
+    }
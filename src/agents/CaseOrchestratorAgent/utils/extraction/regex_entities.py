@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import re
+from datetime import date
+from typing import Any, Dict, Optional
+
+# Same keys as the "entities" block of the extraction JSON schema (extract_intents.footer_prompt)
+ENTITY_KEYS = (
+    "contract_number",
+    "meter_number",
+    "meter_reading_value",
+    "meter_reading_date",
+    "customer_full_name",
+    "postal_code",
+    "address",
+    "birthdate",
+    "installment_amount",
+    "tariff_name",
+    "topic_keywords",
+)
+
+CONTRACT_NUMBER_RE = re.compile(
+    r"\b(C-\d{3,})\b"
+    r"|contract\s*(?:number|no\.?|nr\.?)\s*[:=#]?\s*([A-Z]{1,3}-?\d{3,})"
+    r"|vertragsnummer\s*[:=#]?\s*([A-Z]{1,3}-?\d{3,})",
+    re.IGNORECASE,
+)
+METER_NUMBER_RE = re.compile(
+    r"\b(LB-\d{5,})\b"
+    r"|meter\s*(?:number|no\.?|nr\.?)\s*[:=#]?\s*([A-Z]{1,3}-?\d{5,})"
+    r"|zählernummer\s*[:=#]?\s*([A-Z]{1,3}-?\d{5,})",
+    re.IGNORECASE,
+)
+POSTAL_CODE_RE = re.compile(
+    r"(?:postal\s*(?:code|number)|post\s*code|zip(?:\s*code)?|plz|postleitzahl)\D{0,15}(\d{5})\b",
+    re.IGNORECASE,
+)
+READING_VALUE_RE = re.compile(r"\b(\d{1,3}(?:[.,]\d{3})+|\d+)(?:[.,](\d+))?\s*kwh\b", re.IGNORECASE)
+# "Meter reading 12456", "Zählerstand: 12.456", "my reading is 4711" (no unit); dates are excluded
+READING_PHRASE_RE = re.compile(
+    r"(?:meter\s*reading|reading|zählerstand|zaehlerstand)\s*(?:is|ist|of|von|=|:)?\s*"
+    r"(\d{1,3}(?:[.,]\d{3})+|\d{3,})(?:[.,](\d+))?(?![\d/-]|\.\d)",
+    re.IGNORECASE,
+)
+DATE_DMY_RE = re.compile(r"\b(\d{1,2})\.(\d{1,2})\.(\d{4})\b")
+DATE_ISO_RE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)
+CASE_TOKEN_RE = re.compile(r"\[CASE:\s*(" + UUID_RE.pattern + r")\s*\]", re.IGNORECASE)
+BIRTHDATE_HINT_RE = re.compile(r"(?:birth\s*date|birthdate|date\s*of\s*birth|born|geburtsdatum|geboren)", re.IGNORECASE)
+
+
+def empty_entities() -> Dict[str, Any]:
+    data: Dict[str, Any] = {k: None for k in ENTITY_KEYS}
+    data["topic_keywords"] = []
+    return data
+
+
+def _first_group(m: Optional[re.Match]) -> Optional[str]:
+    if not m:
+        return None
+    for g in m.groups():
+        if g:
+            return g.strip()
+    return None
+
+
+def _to_iso(m: re.Match, dmy: bool) -> Optional[str]:
+    try:
+        if dmy:
+            d, mo, y = int(m.group(1)), int(m.group(2)), int(m.group(3))
+        else:
+            y, mo, d = int(m.group(1)), int(m.group(2)), int(m.group(3))
+        return date(y, mo, d).isoformat()
+    except ValueError:
+        return None
+
+
+def _find_dates(text: str):
+    """Yields (start, iso_date) for every date in the text, in order."""
+    found = []
+    for m in DATE_DMY_RE.finditer(text):
+        iso = _to_iso(m, dmy=True)
+        if iso:
+            found.append((m.start(), iso))
+    for m in DATE_ISO_RE.finditer(text):
+        iso = _to_iso(m, dmy=False)
+        if iso:
+            found.append((m.start(), iso))
+    return sorted(found)
+
+
+def _first_group_outside(pattern: re.Pattern, text: str, taken: Optional[re.Match]) -> Optional[str]:
+    """First match of `pattern` that does not overlap `taken` (the same token never fills two fields)."""
+    for m in pattern.finditer(text):
+        if taken is not None and m.start() < taken.end() and taken.start() < m.end():
+            continue
+        return _first_group(m)
+    return None
+
+
+# every pattern extract_entities_regex reads a value from
+_ENTITY_RES = (
+    CONTRACT_NUMBER_RE, METER_NUMBER_RE, POSTAL_CODE_RE, READING_VALUE_RE, READING_PHRASE_RE,
+    DATE_DMY_RE, DATE_ISO_RE,
+)
+
+
+def has_regex_entity(text: str) -> bool:
+    """True if the rule-based pass would pick a value from this text (such lines are never stripped)."""
+    return any(p.search(text or "") for p in _ENTITY_RES)
+
+
+def _parse_reading(m: re.Match):
+    whole = re.sub(r"[.,]", "", m.group(1))
+    frac = m.group(2)
+    try:
+        return float(f"{whole}.{frac}") if frac else int(whole)
+    except ValueError:
+        return None
+
+
+def find_case_uuid(subject: Optional[str], body: Optional[str]) -> Optional[str]:
+    """[CASE: uuid] token first (subject, then body), else any bare UUID in the body."""
+    for text in (subject or "", body or ""):
+        m = CASE_TOKEN_RE.search(text)
+        if m:
+            return m.group(1).lower()
+    m = UUID_RE.search(body or "")
+    return m.group(0).lower() if m else None
+
+
+def extract_entities_regex(text: str) -> Dict[str, Any]:
+    """
+    Cheap rule-based entity pass (no LLM).
+    Only fills fields with very regular formats; everything else stays None.
+    """
+    text = text or ""
+    entities = empty_entities()
+
+    contract = CONTRACT_NUMBER_RE.search(text)
+    entities["contract_number"] = _first_group(contract)
+    # "contract number: LB-998877" is a contract number, not also a meter number
+    entities["meter_number"] = _first_group_outside(METER_NUMBER_RE, text, contract)
+
+    m = POSTAL_CODE_RE.search(text)
+    entities["postal_code"] = m.group(1) if m else None
+
+    m = READING_VALUE_RE.search(text) or READING_PHRASE_RE.search(text)
+    entities["meter_reading_value"] = _parse_reading(m) if m else None
+
+    # a date right after a birth hint is the birthdate; the first other date is the reading date
+    birth_hint = BIRTHDATE_HINT_RE.search(text)
+    for start, iso in _find_dates(text):
+        if birth_hint and 0 <= start - birth_hint.end() <= 20 and entities["birthdate"] is None:
+            entities["birthdate"] = iso
+        elif entities["meter_reading_date"] is None:
+            entities["meter_reading_date"] = iso
+
+    return entities
@@ -1,7 +1,6 @@
-import asyncio
-
 from src.agents.CaseOrchestratorAgent.utils.llm.draft_to_llm_processing import normalize_and_dedupe_draft
 from src.agents.CaseOrchestratorAgent.utils.llm.llm_parser import parse_llm_email_json
+from src.agents.CaseOrchestratorAgent.utils.llm.output_schemas import EMAIL_REPLY_JSON_SCHEMA
 
 
 async def build_email_to_user(container, case_id, reviewer_note, draft_customer_reply):
@@ -24,24 +23,25 @@ async def build_email_to_user(container, case_id, reviewer_note, draft_customer_
         },
     )
 
-    # 3) Footer
+    # 3) Footer (static)
     footer_prompt = container.template_parser.get_template_from_locales(
         "final_reply_email", "final_footer_prompt"
     )
 
+    # static system + footer first (stable prefix for provider prompt caching), case inputs last
     chat_history = [
         container.generation_client.construct_prompt(
-            prompt=system_prompt,
+            prompt="\n\n".join([system_prompt, footer_prompt]),
             role=container.generation_client.enums.SYSTEM.value,
         )
     ]
 
-    full_prompt = "\n\n".join([parms_prompt, footer_prompt])
+    full_prompt = parms_prompt
 
-    answer, total_tokens, cost = await asyncio.to_thread(
-        container.generation_client.generate_text,
-        full_prompt,
-        chat_history,
+    answer, total_tokens, cost = await container.generation_client.agenerate_text(
+        prompt=full_prompt,
+        chat_history=chat_history,
+        json_schema=EMAIL_REPLY_JSON_SCHEMA,
     )
 
 
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import List, Literal, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from src.llms.structured_output import json_schema_spec
+
+# Single source of truth for the JSON the LLM returns.
+# The same models give the structured-output schema sent to the provider and validate the answer.
+
+IntentName = Literal[
+    "MeterReadingSubmission",
+    "MeterReadingCorrection",
+    "PersonalDataChange",
+    "ContractIssue",
+    "ProductInfoRequest",
+    "GeneralFeedback",
+    "Other",
+]
+
+Language = Literal["de", "en", "ar", "other"]
+
+
+class Intent(BaseModel):
+    name: IntentName
+    confidence: float = Field(ge=0.0, le=1.0)
+    requires_auth: bool = False
+    reason: str = ""
+
+
+class Entities(BaseModel):
+    contract_number: Optional[str] = None
+    meter_number: Optional[str] = None
+    meter_reading_value: Optional[Union[float, str]] = None
+    meter_reading_date: Optional[str] = None
+    customer_full_name: Optional[str] = None
+    postal_code: Optional[str] = None
+    address: Optional[str] = None
+    birthdate: Optional[str] = None
+    installment_amount: Optional[Union[float, str]] = None
+    tariff_name: Optional[str] = None
+    topic_keywords: List[str] = []
+
+
+class ExtractionResult(BaseModel):
+    case_id: Optional[str] = None
+    message_id: Optional[str] = None
+    language: Language
+    intents: List[Intent]
+    entities: Entities
+    overall_confidence: float = Field(ge=0.0, le=1.0)
+    needs_followup: bool
+    missing_fields_for_next_step: List[str]
+    notes_for_agent: str
+
+
+class IntentOnlyResult(BaseModel):
+    """Fast path: entities come from the rule-based pass."""
+    language: Language
+    intents: List[Intent]
+    overall_confidence: Optional[float] = Field(default=None, ge=0.0, le=1.0)
+    notes_for_agent: str = ""
+
+
+class EntitiesOnlyResult(BaseModel):
+    """Intents come from the local classifier."""
+    case_id: Optional[str] = None
+    language: Language = "other"
+    entities: Entities
+    notes_for_agent: str = ""
+
+
+class EmailReply(BaseModel):
+    """Customer-facing email generated from a draft (final reply / auth request)."""
+    model_config = ConfigDict(extra="forbid")
+
+    subject: str
+    body: str
+
+    @field_validator("subject", "body")
+    @classmethod
+    def _not_blank(cls, value: str) -> str:
+        value = value.strip()
+        if not value:
+            raise ValueError("must not be empty")
+        return value
+
+
+EXTRACTION_JSON_SCHEMA = json_schema_spec(ExtractionResult)
+INTENT_ONLY_JSON_SCHEMA = json_schema_spec(IntentOnlyResult)
+ENTITIES_ONLY_JSON_SCHEMA = json_schema_spec(EntitiesOnlyResult)
+EMAIL_REPLY_JSON_SCHEMA = json_schema_spec(EmailReply)
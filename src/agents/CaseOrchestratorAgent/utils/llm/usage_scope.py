@@ -0,0 +1,48 @@
+import functools
+import inspect
+from typing import Any, Optional
+from uuid import uuid4
+
+from src.llms.usage_ledger import get_active_ledger, llm_usage_scope
+
+
+def _case_id_of(values: Any) -> Optional[str]:
+    if not isinstance(values, dict):
+        return None
+    return values.get("case_id") or (values.get("Case") or {}).get("case_id")
+
+
+def with_llm_usage_scope(node_name: str, fn, attach_case: bool = False):
+    """
+    Wrap a graph node so every LLM call inside it is attributed to (run, case, node) in the usage ledger.
+    The run id is created by the first node and carried in the state; calls made before the case
+    existed are back-filled with the case id once a node returns it.
+    attach_case: also back-fill from the case id already in the state (join after parallel branches,
+    where the LLM calls of one branch may be recorded after the other branch returned the case).
+    """
+    @functools.wraps(fn)
+    async def wrapper(state):
+        run_id = state.get("llm_usage_run_id") or str(uuid4())
+        case_id = _case_id_of(state)
+
+        if attach_case and case_id:
+            ledger = get_active_ledger()
+            if ledger is not None:
+                ledger.attach_case(run_id, case_id)
+
+        with llm_usage_scope(node=node_name, run_id=run_id, case_id=case_id):
+            result = fn(state)
+            if inspect.isawaitable(result):  # plain (sync) nodes like join_plans_node
+                result = await result
+
+        if isinstance(result, dict):
+            new_case_id = _case_id_of(result)
+            ledger = get_active_ledger()
+            if new_case_id and new_case_id != case_id and ledger is not None:
+                ledger.attach_case(run_id, new_case_id)
+            if not state.get("llm_usage_run_id"):
+                result = {**result, "llm_usage_run_id": run_id}
+
+        return result
+
+    return wrapper
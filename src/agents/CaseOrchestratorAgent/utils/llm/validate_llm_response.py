@@ -1,51 +1,45 @@
 import json
 from typing import Dict, Any
 
+from src.agents.CaseOrchestratorAgent.utils.llm.output_schemas import (
+    EntitiesOnlyResult,
+    ExtractionResult,
+    IntentOnlyResult,
+)
+
 
 def parse_json_strict(text: str) -> Dict[str, Any]:
     """
     Strict JSON parse.
-    Also handles the common case where the model returns JSON wrapped with whitespace.
+    Answers are generated under a JSON schema (structured output), so there is nothing to salvage:
+    anything that is not a single JSON object is an error (ValueError).
     """
-    text = text.strip()
-
-    # Try direct JSON
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        # Try to salvage
-        start = text.find("{")
-        end = text.rfind("}")
-        if start != -1 and end != -1 and end > start:
-            candidate = text[start : end + 1]
-            return json.loads(candidate)
+    if not isinstance(text, str):
+        raise ValueError(f"LLM answer is not text: {type(text).__name__}")
 
-        raise
+    obj = json.loads(text.strip())
+    if not isinstance(obj, dict):
+        raise ValueError("LLM answer must be a JSON object")
+    return obj
 
 
 def validate_extraction_schema(obj: Dict[str, Any]) -> None:
     """
-    Minimal validation to catch broken outputs early.
+    Validation against the extraction result model (same model the output schema is built from).
+    Raises pydantic.ValidationError (a ValueError).
     """
-    required_top_keys = {
-        "case_id",
-        "message_id",
-        "language",
-        "intents",
-        "entities",
-        "overall_confidence",
-        "needs_followup",
-        "missing_fields_for_next_step",
-        "notes_for_agent",
-    }
+    ExtractionResult.model_validate(obj)
 
-    missing = required_top_keys - set(obj.keys())
-    if missing:
-        raise ValueError(f"Extraction JSON missing keys: {sorted(missing)}")
 
-    if not isinstance(obj["intents"], list):
-        raise ValueError("intents must be a list")
+def validate_intent_only_schema(obj: Dict[str, Any]) -> None:
+    """
+    Validation for the intent-only prompt (fast path, entities come from rules).
+    """
+    IntentOnlyResult.model_validate(obj)
 
-    if not isinstance(obj["entities"], dict):
-        raise ValueError("entities must be a dict")
 
+def validate_entities_only_schema(obj: Dict[str, Any]) -> None:
+    """
+    Validation for the entities-only prompt (intents come from the local classifier).
+    """
+    EntitiesOnlyResult.model_validate(obj)
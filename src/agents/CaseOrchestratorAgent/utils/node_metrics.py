@@ -0,0 +1,73 @@
+import functools
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from langgraph.errors import GraphBubbleUp
+
+from src.utils.metrics import GRAPH_NODE_ERRORS, GRAPH_NODE_IN_FLIGHT, GRAPH_NODE_LATENCY
+
+
+def _new_errors(before: List[Dict[str, Any]], result: Any) -> List[Dict[str, Any]]:
+    # nodes report failures in state["errors"] (only the new ones, or the whole list appended in place)
+    if not isinstance(result, dict):
+        return []
+    return [e for e in (result.get("errors") or []) if e not in before]
+
+
+def with_node_metrics(node_name: str, fn, record_timings: bool = False):
+    """
+    Wrap a graph node with Prometheus metrics: latency histogram, in-flight gauge and error counter
+    (kind = exception | state, the latter for errors the node appended to state["errors"]).
+
+    record_timings: also append {node, started_at, ms, status} to state["node_timings"], so the final
+    state of a slow case shows which stage the time went to.
+    The human-review interrupt (GraphBubbleUp) is not an error and is not timed as one.
+    """
+    @functools.wraps(fn)
+    async def wrapper(state):
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        status = "ok"
+        errors_before = list(state.get("errors") or [])  # copy: some nodes append to the list in place
+        GRAPH_NODE_IN_FLIGHT.labels(node=node_name).inc()
+        try:
+            result = await fn(state)
+        except GraphBubbleUp:
+            status = "interrupted"
+            raise
+        except Exception:
+            status = "exception"
+            GRAPH_NODE_ERRORS.labels(node=node_name, kind="exception").inc()
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            GRAPH_NODE_IN_FLIGHT.labels(node=node_name).dec()
+            if status != "interrupted":
+                GRAPH_NODE_LATENCY.labels(node=node_name).observe(seconds)
+
+        if _new_errors(errors_before, result):
+            status = "error"
+            GRAPH_NODE_ERRORS.labels(node=node_name, kind="state").inc()
+
+        if record_timings and isinstance(result, dict):
+            timing = {
+                "node": node_name,
+                "started_at": started_at.isoformat(),
+                "ms": round(seconds * 1000, 2),
+                "status": status,
+            }
+            # replace (not extend) the key: nodes may return the whole state incl. earlier timings
+            result = {**result, "node_timings": [timing]}
+
+        return result
+
+    return wrapper
+
+
+def timing_breakdown(final_state: Dict[str, Any]) -> Dict[str, float]:
+    """Total ms per node for one run (from state["node_timings"]), slowest first."""
+    totals: Dict[str, float] = {}
+    for t in final_state.get("node_timings") or []:
+        totals[t["node"]] = totals.get(t["node"], 0.0) + t["ms"]
+    return dict(sorted(totals.items(), key=lambda kv: kv[1], reverse=True))
@@ -0,0 +1,87 @@
+"""
+Compact graph state: rows that are already in Postgres travel through the graph as IDs, not copies.
+
+With the checkpointer every step's state is serialized, so large payloads are dropped from the
+state as soon as they are persisted:
+- Message.body          -> dropped once the message row exists (resolve_case_and_message_node)
+- llm_response_extractions -> cleared once the extraction row exists (save_extraction_node)
+- plan results          -> draft id + action ids (the draft text and action specs stay in their tables)
+
+Nodes that do need a payload load it lazily with StatePayloads (one DB read per node, cached).
+"""
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from src.agents.CaseOrchestratorAgent.AgentState import PlanResultState
+from src.models.DraftsModel import DraftsModel
+from src.models.ExtractionsModel import ExtractionsModel
+from src.models.MessagesModel import MessagesModel
+
+_NOT_LOADED = object()
+
+
+def compact_plan_result(result: Optional[Dict[str, Any]]) -> PlanResultState:
+    """plan_actions_and_create_final_draft() result -> IDs only."""
+    result = result or {}
+    return {
+        "ok": bool(result.get("ok")),
+        "draft_id": (result.get("draft") or {}).get("id"),
+        "action_ids": [str(a.get("id") or a.get("action_id")) for a in result.get("actions_created") or []],
+        "case_status": result.get("case_status"),
+    }
+
+
+class StatePayloads:
+    """
+    Lazy access to payloads that are referenced (not copied) in the state.
+    Create one per node call: StatePayloads(container, state); every loader hits the DB at most once.
+    """
+    __slots__ = ("container", "state", "_message", "_extraction", "_drafts")
+
+    def __init__(self, container, state: Dict[str, Any]):
+        self.container = container
+        self.state = state
+        self._message = _NOT_LOADED
+        self._extraction = _NOT_LOADED
+        self._drafts: Dict[str, Any] = {}
+
+    def _case_uuid(self) -> Optional[UUID]:
+        case_uuid = (self.state.get("Case") or {}).get("case_uuid") or self.state.get("case_id")
+        return UUID(str(case_uuid)) if case_uuid else None
+
+    async def message(self):
+        if self._message is _NOT_LOADED:
+            message_id = (self.state.get("Message") or {}).get("message_id")
+            self._message = None
+            if message_id:
+                messages_model = await MessagesModel.create_instance(db_client=self.container.db_client)
+                self._message = await messages_model.get_message_by_id(UUID(str(message_id)))
+        return self._message
+
+    async def message_body(self) -> Optional[str]:
+        # still in the state before the message row was written (entry nodes)
+        body = (self.state.get("Message") or {}).get("body")
+        if body is not None:
+            return body
+        message = await self.message()
+        return message.body if message else None
+
+    async def extraction(self):
+        if self._extraction is _NOT_LOADED:
+            extraction_id = (self.state.get("extractions") or {}).get("extraction_id")
+            self._extraction = None
+            if extraction_id:
+                extractions_model = await ExtractionsModel.create_instance(db_client=self.container.db_client)
+                self._extraction = await extractions_model.get_extraction_by_id(UUID(str(extraction_id)))
+        return self._extraction
+
+    async def latest_draft(self, draft_type: str = "public_reply"):
+        if draft_type not in self._drafts:
+            case_uuid = self._case_uuid()
+            self._drafts[draft_type] = None
+            if case_uuid:
+                drafts_model = await DraftsModel.create_instance(db_client=self.container.db_client)
+                self._drafts[draft_type] = await drafts_model.get_draft_by_case_and_type(
+                    case_id=case_uuid, draft_type=draft_type
+                )
+        return self._drafts[draft_type]
@@ -0,0 +1,103 @@
+"""
+End-to-end load test of the case graph against the fake LLM provider (no tokens, no network to LLM APIs).
+
+Generation and embeddings are forced to the FAKE backend (recorded or templated answers with
+simulated latency / errors, see FakeProvider); Postgres is still the real one, so run it against
+a scratch database.
+
+Usage (from repo root):
+    python -m src.benchmarks.graph_load_bench --emails 200 --concurrency 16 --latency-ms 400 --error-rate 0.02
+    python -m src.benchmarks.graph_load_bench --responses src/assets/llm_recordings.jsonl
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+EMAIL_TEMPLATES = [
+    ("Meter reading", "Hello,\nmy meter reading is {n} kWh, meter number LB-{n}.\nContract number C-{n}, postal code 22201.\nThanks"),
+    ("Dynamic tariff", "Hello,\ncan you explain how the dynamic tariff works? Do prices change hourly?\nBest regards"),
+    ("Umzug", "Hallo,\nich bin umgezogen, bitte ändern Sie meine Adresse. Vertrag Nr. C-{n}\nDanke"),
+    ("Feedback", "Thank you for the quick help last week!"),
+]
+
+
+def _pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def _email(i):
+    subject, body = EMAIL_TEMPLATES[i % len(EMAIL_TEMPLATES)]
+    return {
+        "from_email": f"loadtest+{i}@example.com",
+        "to_email": "support@example.com",
+        "subject": f"{subject} #{i}",
+        "direction": "inbound",
+        "body": body.format(n=100000 + i),
+    }
+
+
+async def main_async(args):
+    # pydantic settings: environment variables win over the .env file
+    os.environ["GENERATION_BACKEND"] = "FAKE"
+    os.environ["EMBEDDING_BACKEND"] = "FAKE"
+    os.environ["GENERATION_FALLBACK_BACKENDS"] = "[]"
+    os.environ["FAKE_LLM_LATENCY_DISTRIBUTION"] = args.distribution
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["FAKE_LLM_ERROR_RATE"] = str(args.error_rate)
+    os.environ["FAKE_LLM_SEED"] = str(args.seed)
+    if args.responses:
+        os.environ["FAKE_LLM_RESPONSES_PATH"] = args.responses
+
+    from src.agents.CaseOrchestratorAgent.utils.build_container import get_container
+    from src.agents.CaseOrchestratorAgent.utils.batch_runner import run_case_batch
+
+    container = await get_container()
+    await container.warmup()
+
+    latencies, failed, waiting = [], 0, 0
+
+    start = time.perf_counter()
+    # runs end at the human-review interrupt (checkpointed), like in production
+    async for result in run_case_batch(
+        container, (_email(i) for i in range(args.emails)), concurrency=args.concurrency, item_timeout_s=args.timeout
+    ):
+        latencies.append(result.latency_s)
+        waiting += result.status == "pending_review"
+        if not result.ok or result.errors:
+            failed += 1
+        if result.error:
+            print(f"email {result.index} {result.status}: {result.error}")
+    elapsed = time.perf_counter() - start
+
+    ms = [x * 1000 for x in latencies]
+    print(
+        f"emails={args.emails} concurrency={args.concurrency} fake_latency={args.distribution}:{args.latency_ms}ms "
+        f"error_rate={args.error_rate}"
+    )
+    print(
+        f"throughput={args.emails / elapsed:.2f} emails/s  with_errors={failed}  waiting_for_review={waiting}  "
+        f"latency p50={_pct(ms, 50):.0f}ms p95={_pct(ms, 95):.0f}ms p99={_pct(ms, 99):.0f}ms "
+        f"mean={statistics.mean(ms):.0f}ms"
+    )
+
+    await container.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--emails", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per email (default: none)")
+    parser.add_argument("--distribution", default="lognormal", choices=["constant", "uniform", "lognormal"])
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--responses", default=None, help="JSONL recorded with LLM_RECORD_RESPONSES_PATH")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Startup cost of the case graph and what reusing one compiled graph saves per email.
+
+Reports: cold import of the graph module (langgraph, nodes, tools, providers), the first
+compile, the mean of further compiles (= the cost every request paid when it called
+build_graph()), and optionally the warmup (needs the database from .env).
+
+Usage (from repo root):
+    python -m src.benchmarks.graph_startup_bench --compiles 20
+    python -m src.benchmarks.graph_startup_bench --compiles 20 --warmup
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from src.agents.CaseOrchestratorAgent.utils.graph_runtime import compile_case_graph
+
+
+async def main_async(args):
+    _, stats = compile_case_graph()
+    print(f"cold import        {stats['import_s'] * 1000:.1f}ms")
+    print(f"first compile      {stats['compile_s'] * 1000:.1f}ms")
+
+    from src.agents.CaseOrchestratorAgent.graph_builder import build_graph
+
+    compiles = []
+    for _ in range(args.compiles):
+        start = time.perf_counter()
+        build_graph()
+        compiles.append(time.perf_counter() - start)
+    print(
+        f"compile per email  mean={statistics.mean(compiles) * 1000:.2f}ms "
+        f"max={max(compiles) * 1000:.2f}ms (n={args.compiles}; saved by the shared graph)"
+    )
+
+    if args.warmup:
+        from src.agents.CaseOrchestratorAgent.utils.build_container import get_container
+
+        start = time.perf_counter()
+        container = await get_container()
+        print(f"container create   {(time.perf_counter() - start) * 1000:.1f}ms")
+
+        steps = await container.warmup()
+        for name, seconds in steps.items():
+            print(f"warmup {name:<11} {seconds * 1000:.1f}ms")
+        await container.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--compiles", type=int, default=20)
+    parser.add_argument("--warmup", action="store_true")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Throughput of HuggingFaceProvider with dynamic batching (HFBatchingEngine).
+
+For each batch size, fires that many concurrent agenerate_text() calls and
+reports generated tokens/sec. Batch size 1 == the old one-generate-per-call path.
+
+Usage (from repo root):
+    python -m src.benchmarks.hf_batching_bench --model HuggingFaceTB/SmolLM2-135M-Instruct
+"""
+import argparse
+import asyncio
+import time
+
+from src.llms.provider.HuggingFaceProvider import HuggingFaceProvider
+
+PROMPTS = [
+    "Can you explain the dynamic tariff?",
+    "I want to submit my meter reading: 2438 kWh on 25.09.2025, meter LB-9876543.",
+    "Please change my address to Hauptstrasse 5, 22201 Hamburg.",
+    "Why is my monthly installment higher than last year?",
+]
+
+
+async def _run_once(provider: HuggingFaceProvider, batch_size: int, max_new_tokens: int):
+    engine = provider._get_batching_engine()
+    engine.max_batch_size = batch_size
+    engine.max_wait_s = 0.05  # enough for all concurrent submits to land in one batch
+
+    prompts = [PROMPTS[i % len(PROMPTS)] for i in range(batch_size)]
+    prompt_tokens = sum(
+        len(provider._gen_tokenizer(engine._render(provider._build_messages(p, None)))["input_ids"])
+        for p in prompts
+    )
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        provider.agenerate_text(prompt=p, max_output_tokens=max_new_tokens, temperature=0.0)
+        for p in prompts
+    ])
+    elapsed = time.perf_counter() - start
+
+    total_tokens = sum(r[1] for r in results if r)
+    new_tokens = max(0, total_tokens - prompt_tokens)
+    return elapsed, new_tokens
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="HuggingFaceTB/SmolLM2-135M-Instruct")
+    parser.add_argument("--batch-sizes", default="1,4,16")
+    parser.add_argument("--max-new-tokens", type=int, default=64)
+    parser.add_argument("--device", default="cpu")
+    args = parser.parse_args()
+
+    provider = HuggingFaceProvider(
+        model_id=args.model,
+        device=args.device,
+        device_map=None,
+        default_generation_do_sample=False,
+    )
+
+    # warmup (first generate() pays for lazy init / kernel selection)
+    await _run_once(provider, 1, 8)
+
+    print(f"model={args.model} device={args.device} max_new_tokens={args.max_new_tokens}")
+    print(f"{'batch':>6} {'requests':>9} {'seconds':>9} {'new_tokens':>11} {'tokens/sec':>11}")
+    for bs in [int(x) for x in args.batch_sizes.split(",")]:
+        elapsed, new_tokens = await _run_once(provider, bs, args.max_new_tokens)
+        print(f"{bs:>6} {bs:>9} {elapsed:>9.2f} {new_tokens:>11} {new_tokens / elapsed:>11.1f}")
+
+    await provider.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
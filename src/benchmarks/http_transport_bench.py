@@ -0,0 +1,130 @@
+"""
+Per-call overhead of the LLM HTTP layer.
+
+1) tracing wrapper: AsyncOpenAI chat.completions.create against an in-process mock transport
+   (no network, canned response), raw client vs. LangSmith wrap_openai. The difference is the
+   wrapper's own cost per call (LANGSMITH_TRACING decides whether runs are also exported).
+2) connection setup: GET --url N times with a new client per request (TCP + TLS handshake
+   every time) vs. the shared pooled transport over HTTP/1.1 and HTTP/2 (handshake once).
+   Needs network; any status code is fine (401 without a key), only latency is measured.
+
+Usage (from repo root):
+    python -m src.benchmarks.http_transport_bench --calls 500
+    python -m src.benchmarks.http_transport_bench --calls 500 --url https://api.openai.com/v1/models --requests 30
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+from openai import AsyncOpenAI
+
+from src.llms.http_transport import LLMHttpTransport, wrap_tracing
+
+_CHAT_RESPONSE = {
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o-mini",
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "{\"subject\": \"Re\", \"body\": \"ok\"}"},
+        "finish_reason": "stop",
+    }],
+    "usage": {"prompt_tokens": 120, "completion_tokens": 12, "total_tokens": 132},
+}
+
+
+def _pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def _report(name, latencies_s, unit="us"):
+    scale = 1e6 if unit == "us" else 1e3
+    values = [x * scale for x in latencies_s]
+    print(
+        f"{name:<28} n={len(values):<5} p50={_pct(values, 50):.1f}{unit} "
+        f"p95={_pct(values, 95):.1f}{unit} mean={statistics.mean(values):.1f}{unit}"
+    )
+    return statistics.mean(values)
+
+
+async def _time_chat(client, calls):
+    kwargs = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "hello"}], "max_tokens": 16}
+    await client.chat.completions.create(**kwargs)  # warm-up
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await client.chat.completions.create(**kwargs)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def bench_tracing(calls: int, sample_rate: float):
+    mock = httpx.MockTransport(lambda request: httpx.Response(200, content=json.dumps(_CHAT_RESPONSE)))
+    http_client = httpx.AsyncClient(transport=mock)
+
+    def make_client():
+        return AsyncOpenAI(api_key="bench", base_url="http://bench.local/v1", http_client=http_client)
+
+    print("== tracing wrapper (mock transport, no network) ==")
+    raw = _report("raw client", await _time_chat(wrap_tracing(make_client, mode="off"), calls))
+    traced = _report("wrap_openai", await _time_chat(wrap_tracing(make_client, mode="on"), calls))
+    _report(f"sampled ({sample_rate:.0%})",
+            await _time_chat(wrap_tracing(make_client, mode="sample", sample_rate=sample_rate), calls))
+    print(f"wrapper overhead per call ~ {traced - raw:.1f}us")
+
+    await http_client.aclose()
+
+
+async def _time_gets(get, requests):
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await get()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def bench_connections(url: str, requests: int):
+    print(f"== connection setup: {url} ==")
+
+    async def fresh_get():
+        async with httpx.AsyncClient() as client:
+            await client.get(url)
+
+    fresh = _report("new client per request", await _time_gets(fresh_get, requests), unit="ms")
+
+    for http2 in (False, True):
+        transport = LLMHttpTransport(http2=http2)
+        if http2 and not transport.http2:
+            await transport.aclose()
+            continue
+        await transport.async_client.get(url)  # first request pays the handshake
+        pooled = _report(
+            f"shared pool ({'HTTP/2' if http2 else 'HTTP/1.1'})",
+            await _time_gets(lambda: transport.async_client.get(url), requests),
+            unit="ms",
+        )
+        print(f"{'':<28} TCP+TLS setup saved per call ~ {fresh - pooled:.1f}ms")
+        await transport.aclose()
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    parser.add_argument("--url", default=None, help="HTTPS endpoint for the connection setup benchmark")
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    await bench_tracing(args.calls, args.sample_rate)
+    if args.url:
+        await bench_connections(args.url, args.requests)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
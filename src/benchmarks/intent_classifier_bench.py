@@ -0,0 +1,100 @@
+"""
+Local intent classifier vs. the LLM extraction path: accuracy and latency.
+
+Ground truth are the LLM labels stored in the extractions table, so "accuracy" is
+agreement with the LLM. Only rows created after the artifact was trained are used
+(--include-train to disable). The LLM path is timed on a small sample (--llm-samples)
+because it costs real API calls.
+
+Usage (from repo root):
+    python -m src.benchmarks.intent_classifier_bench --model src/assets/models/intent_classifier --llm-samples 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime
+
+from src.agents.CaseOrchestratorAgent.tools.extract_intents_entities import extract_intents_entities
+from src.agents.CaseOrchestratorAgent.utils.extraction.email_preprocess import preprocess_email_body
+from src.agents.CaseOrchestratorAgent.utils.build_container import get_container
+from src.llms.classifier import IntentClassifier, latest_artifact
+from src.models.ExtractionsModel import ExtractionsModel
+
+
+def _pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def _report(name, latencies_s, hits, total):
+    ms = [x * 1000 for x in latencies_s]
+    print(
+        f"{name:<12} n={total:<5} exact-set acc={hits / total:.3f}  "
+        f"latency p50={_pct(ms, 50):.2f}ms p95={_pct(ms, 95):.2f}ms mean={statistics.mean(ms):.2f}ms"
+    )
+
+
+async def main_async(args):
+    path = latest_artifact(args.model) if os.path.isdir(args.model) else args.model
+    clf = IntentClassifier.load(path)
+
+    container = await get_container()
+    extraction_model = await ExtractionsModel.create_instance(db_client=container.db_client)
+    created_after = None if args.include_train else datetime.fromisoformat(clf.meta["trained_at"])
+    rows = await extraction_model.list_training_rows(limit=args.limit, created_after=created_after)
+    if not rows:
+        raise SystemExit("No labeled extractions found")
+
+    # local classifier on every row
+    latencies, hits, confident_rows, confident_hits = [], 0, 0, 0
+    for r in rows:
+        start = time.perf_counter()
+        body = preprocess_email_body(r["body"]).text
+        intents, confident = clf.predict(r["subject"], body, min_confidence=args.min_confidence)
+        latencies.append(time.perf_counter() - start)
+
+        ok = {i["name"] for i in intents} == set(r["intents"])
+        hits += ok
+        if confident:
+            confident_rows += 1
+            confident_hits += ok
+
+    _report("classifier", latencies, hits, len(rows))
+    if confident_rows:
+        print(
+            f"{'':<12} confident on {confident_rows / len(rows):.1%} of emails, "
+            f"acc on those={confident_hits / confident_rows:.3f}"
+        )
+
+    # LLM path on a sample (current prompt / model vs the stored labels)
+    sample = rows[: args.llm_samples]
+    if sample:
+        container.intent_classifier = None  # force the LLM path
+        latencies, hits = [], 0
+        for r in sample:
+            start = time.perf_counter()
+            result = await extract_intents_entities(
+                container=container, from_email="bench@test.com", subject=r["subject"], body=r["body"]
+            )
+            latencies.append(time.perf_counter() - start)
+            hits += {i.get("name") for i in result.get("intents") or []} == set(r["intents"])
+
+        _report("llm", latencies, hits, len(sample))
+
+    await container.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="src/assets/models/intent_classifier")
+    parser.add_argument("--limit", type=int, default=2000)
+    parser.add_argument("--llm-samples", type=int, default=20)
+    parser.add_argument("--min-confidence", type=float, default=0.85)
+    parser.add_argument("--include-train", action="store_true", help="also score rows the model was trained on")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
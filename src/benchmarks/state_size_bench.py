@@ -0,0 +1,160 @@
+"""
+Checkpoint cost of the case graph state, per step, before / after the compact state.
+
+Replays the channel writes of a typical run (extraction || case + message, save extraction,
+policy, both plan branches, join, review) on a synthetic email and serializes the state with the
+checkpointer's serializer (JsonPlusSerializer; falls back to json). Reports per step:
+- full:    the whole state (upper bound of what a checkpoint holds)
+- written: only the channels changed in that step (what the Postgres saver stores as new blobs)
+
+"before" keeps the email body in Message, the raw LLM answer and the full plan result in the
+state; "after" drops / replaces them with IDs once the rows are in Postgres (see state_payloads).
+
+Usage (from repo root):
+    python -m src.benchmarks.state_size_bench --body-kb 6 --repeat 200
+"""
+import argparse
+import json
+import time
+from uuid import uuid4
+
+try:
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+    _serde = JsonPlusSerializer()
+    SERIALIZER = "jsonplus"
+
+    def _dumps(value) -> bytes:
+        return _serde.dumps_typed(value)[1]
+except ImportError:
+    SERIALIZER = "json"
+
+    def _dumps(value) -> bytes:
+        return json.dumps(value, default=str).encode("utf-8")
+
+
+def _pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def _synthetic_run(body_kb: int, compact: bool):
+    """List of (step name, channel writes) for one run."""
+    case_uuid, message_id, extraction_id, draft_id = (str(uuid4()) for _ in range(4))
+    body = ("Hello, my meter reading is 2438 kWh, meter number LB-9876543. " * (body_kb * 17 + 1))[: body_kb * 1024]
+    header = {
+        "from_email": "customer@example.com",
+        "to_email": "support@example.com",
+        "subject": "Meter reading + dynamic tariff question",
+        "direction": "inbound",
+    }
+    intents = [
+        {"intent_type": "MeterReadingSubmission", "confidence": 0.93, "evidence": body[:200]},
+        {"intent_type": "ProductInfoRequest", "confidence": 0.88, "evidence": body[200:400]},
+    ]
+    entities = {
+        "contract_number": "C-001", "postal_code": "22201", "meter_number": "LB-9876543",
+        "meter_reading_value": 2438, "topic_keywords": ["dynamic tariff", "hourly prices"],
+    }
+    llm_answer = {
+        "case_id": None, "message_id": None, "language": "en", "intents": intents, "entities": entities,
+        "overall_confidence": 0.9, "needs_followup": False, "missing_fields_for_next_step": [],
+        "notes_for_agent": "Customer submits a reading and asks about the dynamic tariff. " * 4,
+    }
+    action_specs = [
+        {"action_type": "submit_meter_reading", "params": {**entities, "source_text": body[:300]}},
+        {"action_type": "send_tariff_info", "params": {"topics": entities["topic_keywords"]}},
+    ]
+    plan_result = {
+        "ok": True,
+        "case_uuid": case_uuid,
+        "draft": {"id": draft_id, "case_id": case_uuid, "draft_type": "public_reply", "created_at": "", "updated_at": ""},
+        "case_status": "pending_review",
+        "actions_created": [
+            {"id": str(uuid4()), "case_id": case_uuid, "action_type": a["action_type"], "status": "planned", "params": a["params"]}
+            for a in action_specs
+        ],
+        "action_specs": action_specs,
+    }
+    message_row = {**header, "message_id": message_id, "case_uuid": case_uuid, "received_at": "2025-09-25T10:00:00"}
+    if not compact:
+        message_row["body"] = body
+
+    if compact:
+        plan_state = {
+            "ok": True, "draft_id": draft_id,
+            "action_ids": [a["id"] for a in plan_result["actions_created"]], "case_status": "pending_review",
+        }
+    else:
+        plan_state = plan_result
+
+    extraction_row = {
+        "extraction_id": extraction_id, "case_id": case_uuid, "message_id": message_id,
+        "intents": intents, "entities": entities, "confidence": 0.9, "created_at": "2025-09-25T10:00:01",
+    }
+    case_row = {
+        "case_id": case_uuid, "case_uuid": case_uuid, "case_status": "new", "case_channel": "Email",
+        "case_status_meta": {"customer_email": header["from_email"], "subject_norm": header["subject"].lower()},
+        "case_created_at": "", "case_updated_at": "",
+    }
+
+    steps = [
+        ("input", {"Message": {**header, "body": body}, "errors": [], "graph_thread_id": str(uuid4()),
+                   "llm_usage_run_id": str(uuid4())}),
+        ("extract || resolve", {"llm_response_extractions": llm_answer, "Case": case_row,
+                                "case_id": case_uuid, "Message": message_row}),
+        ("save_extraction", {"extractions": extraction_row,
+                             **({"llm_response_extractions": None} if compact else {})}),
+        ("auth_policy", {"auth_intents": intents[:1], "non_auth_intents": intents[1:]}),
+        ("plan branches", {"non_auth_plan_result": plan_state, "auth_plan_result": plan_state,
+                           "non_auth_done": True, "auth_done": True}),
+        ("join", {"joined_once": True, "join_ready": True}),
+        ("human_review", {"human_review": {"decision": "approved", "reviewer_email": "agent@example.com",
+                                           "edited_customer_reply": "", "review_notes": ""}}),
+    ]
+    if not compact:
+        # before: the non-auth branch wrote an undeclared key, only auth_plan_result was kept
+        steps[4] = ("plan branches", {"auth_plan_result": plan_state, "non_auth_done": True, "auth_done": True})
+    return steps
+
+
+def _measure(steps, repeat: int):
+    state, rows = {}, []
+    for name, writes in steps:
+        state = {**state, **writes}
+        state = {k: v for k, v in state.items() if v is not None}
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            full = _dumps(state)
+            times.append(time.perf_counter() - start)
+        written = sum(len(_dumps(v)) for v in writes.values() if v is not None)
+        rows.append((name, len(full), written, _pct(times, 50) * 1e6))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--body-kb", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    before = _measure(_synthetic_run(args.body_kb, compact=False), args.repeat)
+    after = _measure(_synthetic_run(args.body_kb, compact=True), args.repeat)
+
+    print(f"serializer={SERIALIZER} body={args.body_kb}KB repeat={args.repeat}")
+    print(f"{'step':<20} {'full B before':>14} {'after':>8} {'written B before':>17} {'after':>8} {'p50 us before':>14} {'after':>8}")
+    for (name, fb, wb, tb), (_, fa, wa, ta) in zip(before, after):
+        print(f"{name:<20} {fb:>14} {fa:>8} {wb:>17} {wa:>8} {tb:>14.1f} {ta:>8.1f}")
+
+    def total(rows, i):
+        return sum(r[i] for r in rows)
+
+    print(
+        f"per run: full {total(before, 1)} -> {total(after, 1)} B, written {total(before, 2)} -> {total(after, 2)} B, "
+        f"serialize {total(before, 3):.0f} -> {total(after, 3):.0f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
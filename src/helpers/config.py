@@ -1,6 +1,8 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
 from typing import List, Optional
+from dotenv import load_dotenv
+import os
 
 THIS_DIR = Path(__file__).resolve().parent      # .../src/helpers
 ENV_PATH = THIS_DIR.parent / ".env"        # .../project_root/.env
@@ -46,6 +48,91 @@ class Settings(BaseSettings):
     AZURE_OPENAI_EMBED_DIMENSIONS : str = None
 
     HF_GENERATION_MODEL_ID:str = None
+    HF_MAX_BATCH_SIZE: int = 8
+    HF_MAX_BATCH_WAIT_MS: float = 10.0
+    HF_DEVICE: Optional[str] = None
+    HF_QUANTIZATION: Optional[str] = None
+    HF_NUM_THREADS: Optional[int] = None
+    HF_WARMUP: bool = True
+
+    FAKE_LLM_RESPONSES_PATH: Optional[str] = None
+    FAKE_LLM_LATENCY_DISTRIBUTION: str = "lognormal"
+    FAKE_LLM_LATENCY_MS: float = 300.0
+    FAKE_LLM_LATENCY_JITTER: float = 0.5
+    FAKE_LLM_MS_PER_OUTPUT_TOKEN: float = 10.0
+    FAKE_LLM_ERROR_RATE: float = 0.0
+    FAKE_LLM_SEED: int = 0
+    LLM_RECORD_RESPONSES_PATH: Optional[str] = None
+
+    LLM_MAX_IN_FLIGHT: int = 32
+    LLM_RPM_LIMIT: int = 0
+    LLM_TPM_LIMIT: int = 0
+
+    LLM_HTTP2: bool = True
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE: int = 20
+    LLM_HTTP_KEEPALIVE_SECONDS: float = 60.0
+    LLM_HTTP_CONNECT_TIMEOUT: float = 5.0
+    LLM_HTTP_GENERATION_READ_TIMEOUT: float = 60.0
+    LLM_HTTP_EMBEDDING_READ_TIMEOUT: float = 20.0
+    LLM_TRACING_MODE: str = "on"  # on | off | sample (LangSmith wrap_openai)
+    LLM_TRACING_SAMPLE_RATE: float = 1.0
+
+    GENERATION_FALLBACK_BACKENDS: List[str] = []
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BASE_DELAY: float = 0.5
+    LLM_RETRY_MAX_DELAY: float = 8.0
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    LLM_HEDGE_PERCENTILE: Optional[float] = None
+
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 1024
+    LLM_CACHE_TTL_SECONDS: int = 86400
+    LLM_CACHE_PG_ENABLED: bool = False
+    LLM_CACHE_PG_SWEEP_SECONDS: float = 3600.0  # delete expired Postgres rows; 0 = never (expired rows are only skipped)
+
+    EMAIL_PREPROCESS_ENABLED: bool = True
+    EMAIL_MAX_BODY_TOKENS: int = 8000
+
+    EXTRACTION_CHUNK_THRESHOLD_TOKENS: int = 1500
+    EXTRACTION_CHUNK_TOKENS: int = 1000
+    EXTRACTION_FAST_PATH: str = "intent_only"
+
+    INTENT_CLASSIFIER_PATH: Optional[str] = None
+    INTENT_CLASSIFIER_MIN_CONFIDENCE: float = 0.85
+
+    ROUTER_ENABLED: bool = False
+    ROUTER_SMALL_MODEL_ID: Optional[str] = None
+    ROUTER_LARGE_MODEL_ID: Optional[str] = None
+    ROUTER_MAX_SMALL_BODY_TOKENS: int = 600
+    ROUTER_MAX_SMALL_INTENTS: int = 1
+    ROUTER_AUTH_TO_LARGE: bool = False
+    ROUTER_MAX_SMALL_FAILURE_RATE: float = 0.2
+
+    LLM_USAGE_LEDGER_ENABLED: bool = True
+    LLM_USAGE_LEDGER_BATCH_SIZE: int = 200
+    LLM_USAGE_LEDGER_FLUSH_SECONDS: float = 2.0
+
+    EMBEDDING_BATCH_SIZE: Optional[int] = None  # None -> provider default
+    EMBEDDING_BATCH_WAIT_MS: float = 10.0
+    EMBEDDING_MAX_CONCURRENT_BATCHES: int = 4
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 20000
+    EMBEDDING_CACHE_PG_ENABLED: bool = False
+
+    GRAPH_COMPILE_ON_STARTUP: bool = True
+    GRAPH_WARMUP: bool = True
+    GRAPH_CHECKPOINTER_ENABLED: bool = True
+    GRAPH_CHECKPOINT_POOL_SIZE: int = 10
+    GRAPH_NODE_TIMINGS_IN_STATE: bool = False
+    INBOUND_DEDUP_ENABLED: bool = True
+    INBOUND_DEDUP_MAX_ENTRIES: int = 100000
+    INBOUND_DEDUP_CLAIM_TTL_SECONDS: float = 900.0
+    GRAPH_BATCH_CONCURRENCY: int = 16
+    GRAPH_BATCH_ITEM_TIMEOUT_SECONDS: float = 300.0
+
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_MIN_SIMILARITY: float = 0.95
 
     LANGCHAIN_TRACING_V2:str = None
     LANGCHAIN_ENDPOINT:str = None
@@ -85,3 +172,14 @@ class Settings(BaseSettings):
 def get_settings() -> Settings:
     return Settings()
 
+
+def configure_langsmith(settings: Settings) -> None:
+    """Export the LangSmith env vars read by the tracing wrappers (once, at container startup)."""
+    load_dotenv()
+    if not settings.LANGCHAIN_API_KEY:
+        return
+    os.environ["LANGSMITH_TRACING"] = "true" if settings.LANGCHAIN_TRACING_V2 else "false"
+    os.environ["LANGSMITH_API_KEY"] = settings.LANGCHAIN_API_KEY
+    os.environ["LANGSMITH_PROJECT"] = settings.LANGCHAIN_PROJECT or "default"
+    if settings.LANGCHAIN_ENDPOINT:
+        os.environ["LANGSMITH_ENDPOINT"] = settings.LANGCHAIN_ENDPOINT
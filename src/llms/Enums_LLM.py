@@ -6,6 +6,7 @@ class Enums_LLM(Enum):
     COHERE = "COHERE"
     AZUREOPENAI = "AZUREOPENAI"
     HF = "HF"
+    FAKE = "FAKE"
 
 class OpenAIEnums(Enum):
     SYSTEM = "system"
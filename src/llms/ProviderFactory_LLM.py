@@ -1,12 +1,13 @@
 from .Enums_LLM import Enums_LLM
 from .provider import OpenAIProvider, CoHereProvider
 from .provider.AzureOpenAIProvider import AzureOpenAIProvider
-from .provider.HuggingFaceProvider import HuggingFaceProvider
 
 
 class LLMProviderFactory:
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, http_transport=None):
         self.config = config
+        # shared pooled HTTP clients for the API providers (None -> each provider builds its own)
+        self.http_transport = http_transport
 
     def create(self, provider: str):
         if provider==Enums_LLM.OPENAI.value:
@@ -15,7 +16,10 @@ class LLMProviderFactory:
                 api_url=self.config.OPENAI_API_URL,
                 default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE,
+                http_transport=self.http_transport,
+                tracing_mode=self.config.LLM_TRACING_MODE,
+                tracing_sample_rate=self.config.LLM_TRACING_SAMPLE_RATE,
             )
 
         if provider==Enums_LLM.COHERE.value:
@@ -23,7 +27,8 @@ class LLMProviderFactory:
                 api_key=self.config.COHERE_API_KEY,
                 default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE,
+                http_transport=self.http_transport,
             )
 
         if provider==Enums_LLM.AZUREOPENAI.value:
@@ -34,14 +39,44 @@ class LLMProviderFactory:
                 generation_model_id=self.config.AZURE_OPENAI_CHAT_DEPLOYMENT,
                 default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE,
+                http_transport=self.http_transport,
+                tracing_mode=self.config.LLM_TRACING_MODE,
+                tracing_sample_rate=self.config.LLM_TRACING_SAMPLE_RATE,
             )
 
         if provider==Enums_LLM.HF.value:
+            # lazy import: torch/transformers are only loaded when the HF backend is selected
+            from .provider.HuggingFaceProvider import HuggingFaceProvider
+
+            cpu_only = (self.config.HF_DEVICE or "").lower() == "cpu"
             return HuggingFaceProvider(
                 model_id=self.config.HF_GENERATION_MODEL_ID,
-                device_map="auto",
-                default_generation_do_sample=False
+                device=self.config.HF_DEVICE,
+                device_map=None if cpu_only else "auto",
+                default_generation_do_sample=False,
+                quantization=self.config.HF_QUANTIZATION,
+                num_threads=self.config.HF_NUM_THREADS,
+                warmup_on_load=self.config.HF_WARMUP,
+                max_batch_size=self.config.HF_MAX_BATCH_SIZE,
+                max_batch_wait_ms=self.config.HF_MAX_BATCH_WAIT_MS,
+            )
+
+        if provider==Enums_LLM.FAKE.value:
+            # offline load tests: replayed / templated answers with simulated latency and errors
+            from .provider.FakeProvider import FakeProvider
+
+            return FakeProvider(
+                responses_path=self.config.FAKE_LLM_RESPONSES_PATH,
+                latency_distribution=self.config.FAKE_LLM_LATENCY_DISTRIBUTION,
+                latency_ms=self.config.FAKE_LLM_LATENCY_MS,
+                latency_jitter=self.config.FAKE_LLM_LATENCY_JITTER,
+                ms_per_output_token=self.config.FAKE_LLM_MS_PER_OUTPUT_TOKEN,
+                error_rate=self.config.FAKE_LLM_ERROR_RATE,
+                seed=self.config.FAKE_LLM_SEED,
+                default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
+                default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
+                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
             )
 
         return None
@@ -0,0 +1,2 @@
+from .response_cache import LLMResponseCache
+from .semantic_cache import SemanticExtractionCache
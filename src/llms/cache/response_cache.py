@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from src.utils.metrics import LLM_CACHE_LOOKUPS
+
+
+class LLMResponseCache:
+    """
+    Exact-match cache for LLM completions.
+
+    Key = sha256(model_id, temperature, full rendered message list).
+    Tier 1: in-process LRU (max_entries + TTL).
+    Tier 2: optional Postgres table (LLMCacheModel), shared between workers. Expired rows are
+            skipped on read and deleted by a background sweep (start_sweeper).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: int = 3600,
+        db_model: Any = None,  # LLMCacheModel or None
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_model = db_model
+
+        # key -> (expires_at_monotonic, response_text)
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._sweeper: Optional[asyncio.Task] = None
+
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def make_key(model_id: Optional[str], temperature: Optional[float], messages: List[Dict[str, Any]]) -> str:
+        payload = json.dumps(
+            {
+                "model_id": model_id or "",
+                "temperature": float(temperature) if temperature is not None else None,
+                "messages": messages,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # ----------------------------
+    # In-process tier
+    # ----------------------------
+    def _get_local(self, key: str) -> Optional[str]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+
+        expires_at, text = item
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.evictions += 1
+            return None
+
+        self._entries.move_to_end(key)  # LRU: mark as recently used
+        return text
+
+    def _set_local(self, key: str, text: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, text)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    # ----------------------------
+    # Public API
+    # ----------------------------
+    async def aget(self, key: str) -> Optional[str]:
+        text = self._get_local(key)
+        if text is not None:
+            self.hits += 1
+            LLM_CACHE_LOOKUPS.labels(tier="memory", result="hit").inc()
+            return text
+        LLM_CACHE_LOOKUPS.labels(tier="memory", result="miss").inc()
+
+        if self.db_model is not None:
+            try:
+                row = await self.db_model.get_entry(cache_key=key)
+            except Exception:
+                self.logger.exception("LLM cache postgres lookup failed")
+                row = None
+
+            if row is not None:
+                self.hits += 1
+                LLM_CACHE_LOOKUPS.labels(tier="postgres", result="hit").inc()
+                self._set_local(key, row.response_text)  # promote to tier 1
+                return row.response_text
+            LLM_CACHE_LOOKUPS.labels(tier="postgres", result="miss").inc()
+
+        self.misses += 1
+        return None
+
+    async def aset(self, key: str, text: str, model_id: Optional[str] = None, total_tokens: int = 0) -> None:
+        if not text:
+            return
+
+        self._set_local(key, text)
+
+        if self.db_model is not None:
+            try:
+                await self.db_model.upsert_entry(
+                    cache_key=key,
+                    model_id=model_id or "",
+                    response_text=text,
+                    total_tokens=int(total_tokens or 0),
+                    ttl_seconds=self.ttl_seconds,
+                )
+            except Exception:
+                self.logger.exception("LLM cache postgres write failed")
+
+    # ----------------------------
+    # Postgres TTL sweep
+    # ----------------------------
+    def start_sweeper(self, interval_s: float) -> None:
+        """Delete expired Postgres rows every interval_s (no-op without the Postgres tier)."""
+        if self.db_model is None or not interval_s or self._sweeper is not None:
+            return
+        self._sweeper = asyncio.create_task(self._sweep(float(interval_s)), name="llm-cache-sweeper")
+
+    async def _sweep(self, interval_s: float) -> None:
+        while True:
+            await asyncio.sleep(interval_s)
+            try:
+                deleted = await self.db_model.delete_expired()
+                if deleted:
+                    self.logger.info("LLM cache sweep: %d expired rows deleted", deleted)
+            except Exception:
+                self.logger.exception("LLM cache sweep failed")
+
+    async def aclose(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
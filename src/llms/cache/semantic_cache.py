@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.llms.Enums_LLM import DocumentTypeEnum
+from src.utils.metrics import LLM_CACHE_LOOKUPS
+
+_WS_RE = re.compile(r"\s+")
+_DIGITS_RE = re.compile(r"\d+")
+
+
+def normalize_body(body: str) -> str:
+    """
+    Normalize an email body for near-duplicate matching:
+    lowercase, collapse whitespace, mask digits (meter numbers/readings differ per customer).
+    """
+    text = (body or "").lower()
+    text = _DIGITS_RE.sub("0", text)
+    return _WS_RE.sub(" ", text).strip()
+
+
+class SemanticExtractionCache:
+    """
+    Near-duplicate cache for intent extraction.
+
+    Embeds the normalized email body with the embedding service and looks up the
+    nearest previous extraction in pgvector (SemanticCacheModel). Above
+    min_similarity the cached intents can be reused instead of calling the LLM.
+    """
+
+    def __init__(self, embedding_service: Any, db_model: Any, min_similarity: float = 0.95):
+        self.embedding_service = embedding_service
+        self.db_model = db_model
+        self.min_similarity = min_similarity
+
+        self.hits = 0
+        self.misses = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    async def _embed(self, normalized: str) -> Optional[np.ndarray]:
+        try:
+            return await self.embedding_service.embed_one(normalized, document_type=DocumentTypeEnum.QUERY.value)
+        except Exception:
+            self.logger.exception("Semantic cache embedding failed")
+            return None
+
+    async def lookup(self, body: str) -> Tuple[Optional[Dict[str, Any]], Optional[np.ndarray]]:
+        """
+        Returns (hit, embedding).
+        hit = {"intents", "language", "topic_keywords", "confidence", "similarity"} or None.
+        The embedding is returned so store() does not embed the same body twice.
+        """
+        normalized = normalize_body(body)
+        if not normalized:
+            return None, None
+
+        embedding = await self._embed(normalized)
+        if embedding is None:
+            return None, None
+
+        try:
+            nearest = await self.db_model.find_nearest(embedding)
+        except Exception:
+            self.logger.exception("Semantic cache lookup failed")
+            nearest = None
+
+        if nearest is not None:
+            row, similarity = nearest
+            if similarity >= self.min_similarity:
+                self.hits += 1
+                LLM_CACHE_LOOKUPS.labels(tier="semantic", result="hit").inc()
+                return {
+                    "intents": row.intents,
+                    "language": row.language,
+                    "topic_keywords": row.topic_keywords or [],
+                    "confidence": row.confidence,
+                    "similarity": similarity,
+                }, embedding
+
+        self.misses += 1
+        LLM_CACHE_LOOKUPS.labels(tier="semantic", result="miss").inc()
+        return None, embedding
+
+    async def store(self, body: str, llm_result: Dict[str, Any], embedding: Optional[np.ndarray] = None) -> None:
+        normalized = normalize_body(body)
+        intents = llm_result.get("intents") or []
+        if not normalized or not intents:
+            return
+
+        if embedding is None:
+            embedding = await self._embed(normalized)
+            if embedding is None:
+                return
+
+        entities = llm_result.get("entities") or {}
+        try:
+            await self.db_model.add_entry(
+                body_hash=hashlib.sha256(normalized.encode("utf-8")).hexdigest(),
+                embedding=embedding,
+                intents=intents,
+                language=llm_result.get("language"),
+                topic_keywords=entities.get("topic_keywords") or [],
+                confidence=llm_result.get("overall_confidence"),
+            )
+        except Exception:
+            self.logger.exception("Semantic cache write failed")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
@@ -0,0 +1 @@
+from .intent_classifier import IntentClassifier, latest_artifact
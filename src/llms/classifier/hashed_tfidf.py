@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import math
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+DIGIT_RE = re.compile(r"\d")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word unigrams + bigrams; digits masked so 'LB-123' and 'LB-987' share features."""
+    words = [DIGIT_RE.sub("0", w) for w in TOKEN_RE.findall((text or "").lower())]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+@dataclass
+class CSRMatrix:
+    """Minimal CSR sparse matrix (rows = documents), enough for a linear model without scipy."""
+    indptr: np.ndarray   # (n_rows + 1,) int64
+    indices: np.ndarray  # (nnz,) int32 feature ids
+    data: np.ndarray     # (nnz,) float32
+    n_features: int
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.indptr) - 1
+
+    def row_ids(self) -> np.ndarray:
+        """Row index of every stored value."""
+        return np.repeat(np.arange(self.n_rows), np.diff(self.indptr))
+
+    def dot(self, weights: np.ndarray) -> np.ndarray:
+        """X @ W for W of shape (n_features, k) -> (n_rows, k)."""
+        out = np.zeros((self.n_rows, weights.shape[1]), dtype=np.float32)
+        if len(self.data):
+            np.add.at(out, self.row_ids(), self.data[:, None] * weights[self.indices])
+        return out
+
+    def t_dot(self, grad: np.ndarray) -> np.ndarray:
+        """X.T @ G for G of shape (n_rows, k) -> (n_features, k)."""
+        out = np.zeros((self.n_features, grad.shape[1]), dtype=np.float32)
+        if len(self.data):
+            np.add.at(out, self.indices, self.data[:, None] * grad[self.row_ids()])
+        return out
+
+
+class HashedTfidfVectorizer:
+    """
+    Hashing trick (crc32, stable across processes) + sublinear TF + smoothed IDF + L2 norm.
+    No vocabulary to store: the artifact is just the IDF vector.
+    """
+
+    def __init__(self, n_features: int = 2 ** 18):
+        self.n_features = int(n_features)
+        self.idf: Optional[np.ndarray] = None
+
+    def _hash(self, token: str) -> int:
+        return zlib.crc32(token.encode("utf-8")) % self.n_features
+
+    def _term_counts(self, text: str) -> dict:
+        counts: dict = {}
+        for tok in tokenize(text):
+            h = self._hash(tok)
+            counts[h] = counts.get(h, 0) + 1
+        return counts
+
+    def fit(self, texts: Iterable[str]) -> "HashedTfidfVectorizer":
+        df = np.zeros(self.n_features, dtype=np.float64)
+        n_docs = 0
+        for text in texts:
+            n_docs += 1
+            for h in self._term_counts(text):
+                df[h] += 1
+        self.idf = (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+        return self
+
+    def transform(self, texts: Iterable[str]) -> CSRMatrix:
+        if self.idf is None:
+            raise RuntimeError("HashedTfidfVectorizer is not fitted")
+
+        indptr: List[int] = [0]
+        indices: List[int] = []
+        data: List[float] = []
+
+        for text in texts:
+            counts = self._term_counts(text)
+            ids = sorted(counts)
+            values = [(1.0 + math.log(counts[h])) * float(self.idf[h]) for h in ids]
+            norm = math.sqrt(sum(v * v for v in values)) or 1.0
+            indices.extend(ids)
+            data.extend(v / norm for v in values)
+            indptr.append(len(indices))
+
+        return CSRMatrix(
+            indptr=np.asarray(indptr, dtype=np.int64),
+            indices=np.asarray(indices, dtype=np.int32),
+            data=np.asarray(data, dtype=np.float32),
+            n_features=self.n_features,
+        )
+
+    def fit_transform(self, texts: List[str]) -> CSRMatrix:
+        return self.fit(texts).transform(texts)
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .hashed_tfidf import CSRMatrix, HashedTfidfVectorizer
+
+# bump when the .npz layout changes; load() refuses other formats
+ARTIFACT_FORMAT = 1
+
+INTENT_LABELS = (
+    "MeterReadingSubmission",
+    "MeterReadingCorrection",
+    "PersonalDataChange",
+    "ContractIssue",
+    "ProductInfoRequest",
+    "GeneralFeedback",
+    "Other",
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30.0, 30.0)))
+
+
+class OneVsRestLogisticRegression:
+    """
+    Multi-label logistic regression (one sigmoid per intent, emails can carry several intents).
+    Full-batch Adam on the sparse CSR matrix; L2 on the weights.
+    """
+
+    def __init__(self, l2: float = 1e-4, learning_rate: float = 0.1, epochs: int = 200):
+        self.l2 = l2
+        self.learning_rate = learning_rate
+        self.epochs = epochs
+        self.coef_: Optional[np.ndarray] = None       # (n_features, n_labels)
+        self.intercept_: Optional[np.ndarray] = None  # (n_labels,)
+
+    def fit(self, X: CSRMatrix, Y: np.ndarray) -> "OneVsRestLogisticRegression":
+        n, k = Y.shape
+        W = np.zeros((X.n_features, k), dtype=np.float32)
+        b = np.zeros(k, dtype=np.float32)
+
+        mW, vW = np.zeros_like(W), np.zeros_like(W)
+        mb, vb = np.zeros_like(b), np.zeros_like(b)
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+
+        for t in range(1, self.epochs + 1):
+            P = _sigmoid(X.dot(W) + b)
+            G = (P - Y) / n
+
+            gW = X.t_dot(G) + self.l2 * W
+            gb = G.sum(axis=0)
+
+            mW = beta1 * mW + (1 - beta1) * gW
+            vW = beta2 * vW + (1 - beta2) * gW * gW
+            mb = beta1 * mb + (1 - beta1) * gb
+            vb = beta2 * vb + (1 - beta2) * gb * gb
+
+            lr_t = self.learning_rate * np.sqrt(1 - beta2 ** t) / (1 - beta1 ** t)
+            W -= (lr_t * mW / (np.sqrt(vW) + eps)).astype(np.float32)
+            b -= (lr_t * mb / (np.sqrt(vb) + eps)).astype(np.float32)
+
+        self.coef_, self.intercept_ = W, b
+        return self
+
+    def predict_proba(self, X: CSRMatrix) -> np.ndarray:
+        return _sigmoid(X.dot(self.coef_) + self.intercept_)
+
+
+class IntentClassifier:
+    """
+    Local intent classifier: hashed TF-IDF + one-vs-rest logistic regression.
+    Trained offline (train_intent_classifier CLI) from LLM-labeled Extractions rows.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[str] = INTENT_LABELS,
+        n_features: int = 2 ** 18,
+        vectorizer: Optional[HashedTfidfVectorizer] = None,
+        model: Optional[OneVsRestLogisticRegression] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ):
+        self.labels = list(labels)
+        self.vectorizer = vectorizer or HashedTfidfVectorizer(n_features=n_features)
+        self.model = model or OneVsRestLogisticRegression()
+        self.meta: Dict[str, Any] = meta or {}
+
+    @staticmethod
+    def text_for(subject: Optional[str], body: str) -> str:
+        return f"{subject or ''}\n{body or ''}"
+
+    # ----------------------------
+    # Training
+    # ----------------------------
+    def _label_matrix(self, label_sets: List[Sequence[str]]) -> np.ndarray:
+        Y = np.zeros((len(label_sets), len(self.labels)), dtype=np.float32)
+        index = {name: i for i, name in enumerate(self.labels)}
+        for row, names in enumerate(label_sets):
+            for name in names:
+                if name in index:
+                    Y[row, index[name]] = 1.0
+        return Y
+
+    def fit(self, texts: List[str], label_sets: List[Sequence[str]]) -> "IntentClassifier":
+        start = time.perf_counter()
+        X = self.vectorizer.fit_transform(texts)
+        self.model.fit(X, self._label_matrix(label_sets))
+
+        self.meta.update({
+            "format": ARTIFACT_FORMAT,
+            "version": datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S"),
+            "trained_at": datetime.now(timezone.utc).isoformat(),
+            "n_samples": len(texts),
+            "n_features": self.vectorizer.n_features,
+            "train_seconds": round(time.perf_counter() - start, 2),
+        })
+        return self
+
+    def evaluate(self, texts: List[str], label_sets: List[Sequence[str]], threshold: float = 0.5) -> Dict[str, float]:
+        """Exact-set accuracy and micro F1 on held-out data."""
+        P = self.predict_proba(texts)
+        pred = P >= threshold
+        true = self._label_matrix(label_sets) > 0.5
+
+        tp = float(np.logical_and(pred, true).sum())
+        fp = float(np.logical_and(pred, ~true).sum())
+        fn = float(np.logical_and(~pred, true).sum())
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+
+        return {
+            "exact_match_accuracy": float((pred == true).all(axis=1).mean()) if len(texts) else 0.0,
+            "micro_precision": precision,
+            "micro_recall": recall,
+            "micro_f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+            "n_eval": len(texts),
+        }
+
+    # ----------------------------
+    # Inference
+    # ----------------------------
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        return self.model.predict_proba(self.vectorizer.transform(texts))
+
+    def predict(
+        self,
+        subject: Optional[str],
+        body: str,
+        min_confidence: float = 0.85,
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Returns (intents, confident).
+        confident=True only if every label is clearly on (p >= min_confidence) or clearly off
+        (p <= 1 - min_confidence) and at least one label is on.
+        """
+        probs = self.predict_proba([self.text_for(subject, body)])[0]
+
+        intents = [
+            {"name": name, "confidence": round(float(p), 3)}
+            for name, p in zip(self.labels, probs)
+            if p >= 0.5
+        ]
+        intents.sort(key=lambda i: i["confidence"], reverse=True)
+
+        ambiguous = bool(((probs > 1.0 - min_confidence) & (probs < min_confidence)).any())
+        confident = bool(intents) and not ambiguous
+        return intents, confident
+
+    # ----------------------------
+    # Artifact
+    # ----------------------------
+    def save(self, out_dir: str) -> str:
+        """Writes intent_classifier_v<version>.npz (+ .json metadata) and returns the .npz path."""
+        os.makedirs(out_dir, exist_ok=True)
+        version = self.meta.get("version") or datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+        path = os.path.join(out_dir, f"intent_classifier_v{version}.npz")
+
+        np.savez_compressed(
+            path,
+            coef=self.model.coef_,
+            intercept=self.model.intercept_,
+            idf=self.vectorizer.idf,
+            labels=np.asarray(self.labels),
+            meta=np.asarray(json.dumps(self.meta)),
+        )
+        with open(path[:-4] + ".json", "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, indent=2)
+
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "IntentClassifier":
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("format") != ARTIFACT_FORMAT:
+                raise ValueError(f"Unsupported intent classifier artifact format: {meta.get('format')}")
+
+            vectorizer = HashedTfidfVectorizer(n_features=int(meta["n_features"]))
+            vectorizer.idf = data["idf"]
+
+            model = OneVsRestLogisticRegression()
+            model.coef_ = data["coef"]
+            model.intercept_ = data["intercept"]
+
+            labels = [str(x) for x in data["labels"]]
+
+        logger.info("Loaded intent classifier v%s (%s samples)", meta.get("version"), meta.get("n_samples"))
+        return cls(labels=labels, vectorizer=vectorizer, model=model, meta=meta)
+
+
+def latest_artifact(model_dir: str) -> Optional[str]:
+    """Newest intent_classifier_v*.npz in a directory (versions are sortable timestamps)."""
+    if not os.path.isdir(model_dir):
+        return None
+    files = sorted(f for f in os.listdir(model_dir) if f.startswith("intent_classifier_v") and f.endswith(".npz"))
+    return os.path.join(model_dir, files[-1]) if files else None
@@ -0,0 +1,86 @@
+"""
+Train the local intent classifier from LLM-labeled rows of the extractions table.
+
+Usage (from repo root):
+    python -m src.llms.classifier.train_intent_classifier --out-dir src/assets/models/intent_classifier
+
+Writes intent_classifier_v<UTC timestamp>.npz (+ .json metadata with hold-out metrics).
+Point INTENT_CLASSIFIER_PATH at the file, or at the directory to always load the newest version.
+"""
+import argparse
+import asyncio
+import json
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.agents.CaseOrchestratorAgent.utils.extraction.email_preprocess import preprocess_email_body
+from src.helpers.config import get_settings
+from src.llms.classifier.intent_classifier import IntentClassifier, OneVsRestLogisticRegression
+from src.models.ExtractionsModel import ExtractionsModel
+
+
+async def load_rows(limit: int, min_confidence: float):
+    settings = get_settings()
+    engine = create_async_engine(
+        f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:"
+        f"{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:"
+        f"{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
+    )
+    db_client = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        extraction_model = await ExtractionsModel.create_instance(db_client=db_client)
+        return await extraction_model.list_training_rows(limit=limit, min_confidence=min_confidence)
+    finally:
+        await engine.dispose()
+
+
+def _text(row) -> str:
+    # same input the extraction tool classifies: pre-processed body (no quoted thread / signature)
+    return IntentClassifier.text_for(row["subject"], preprocess_email_body(row["body"]).text)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out-dir", default="src/assets/models/intent_classifier")
+    parser.add_argument("--limit", type=int, default=50000)
+    parser.add_argument("--min-confidence", type=float, default=0.7, help="only learn from confident LLM labels")
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--n-features", type=int, default=2 ** 18)
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    rows = asyncio.run(load_rows(args.limit, args.min_confidence))
+    if len(rows) < 20:
+        raise SystemExit(f"Not enough labeled extractions to train on ({len(rows)})")
+
+    rng = np.random.default_rng(args.seed)
+    order = rng.permutation(len(rows))
+    n_eval = int(len(rows) * args.holdout)
+    eval_rows = [rows[i] for i in order[:n_eval]]
+    train_rows = [rows[i] for i in order[n_eval:]]
+
+    clf = IntentClassifier(
+        n_features=args.n_features,
+        model=OneVsRestLogisticRegression(epochs=args.epochs),
+    )
+    clf.fit(
+        [_text(r) for r in train_rows],
+        [r["intents"] for r in train_rows],
+    )
+
+    if eval_rows:
+        clf.meta["holdout_metrics"] = clf.evaluate(
+            [_text(r) for r in eval_rows],
+            [r["intents"] for r in eval_rows],
+        )
+
+    path = clf.save(args.out_dir)
+    print(json.dumps(clf.meta, indent=2))
+    print(f"Saved intent classifier to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+from .embedding_service import EmbeddingService, PROVIDER_MAX_BATCH_SIZE, content_hash
@@ -0,0 +1,107 @@
+"""
+Backfill the semantic (near-duplicate) extraction cache from historical inbound messages.
+
+Pages through messages + extractions (oldest first), prepares each body like the live extraction
+(quoted history / signatures stripped, case refs kept), embeds the normalized bodies through the
+EmbeddingService (deduplicated, provider-sized batches, several batches in flight) and bulk-inserts
+the vectors into semantic_cache_entries. Re-running is safe: known bodies are skipped by hash.
+
+Usage (from repo root):
+    python -m src.llms.embeddings.backfill_semantic_cache --batch-size 96 --concurrency 8
+"""
+import argparse
+import asyncio
+import hashlib
+import time
+
+from src.agents.CaseOrchestratorAgent.tools.extract_intents_entities import preprocess_body
+from src.agents.CaseOrchestratorAgent.utils.build_container import get_container
+from src.llms.Enums_LLM import DocumentTypeEnum
+from src.llms.cache.semantic_cache import normalize_body
+from src.llms.embeddings import EmbeddingService, PROVIDER_MAX_BATCH_SIZE
+from src.llms.tokenizer import TokenCounter
+from src.models.ExtractionsModel import ExtractionsModel
+from src.models.SemanticCacheModel import SemanticCacheModel
+
+
+def _entries(container, token_counter, rows, seen):
+    """(normalized body, semantic cache row without embedding) for rows with intents and a new body."""
+    out = []
+    for r in rows:
+        # live lookups embed the pre-processed body, not the stored raw one
+        normalized = normalize_body(preprocess_body(container, r["body"] or "", token_counter))
+        intents = r["intents"] or []
+        if not normalized or not intents:
+            continue
+        body_hash = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        if body_hash in seen:
+            continue
+        seen.add(body_hash)
+        out.append((normalized, {
+            "body_hash": body_hash,
+            "intents": intents,
+            "language": None,  # not stored on extractions
+            "topic_keywords": (r["entities"] or {}).get("topic_keywords") or [],
+            "confidence": r["confidence"],
+        }))
+    return out
+
+
+async def main_async(args):
+    container = await get_container()
+    settings = container.settings
+
+    service = EmbeddingService(
+        client=container.embedding_client,
+        model_id=settings.EMBEDDING_MODEL_ID,
+        max_batch_size=args.batch_size or PROVIDER_MAX_BATCH_SIZE.get(settings.EMBEDDING_BACKEND, 96),
+        max_wait_ms=0,
+        max_concurrent_batches=args.concurrency,
+        cache_max_entries=args.page_size,
+    )
+    extraction_model = await ExtractionsModel.create_instance(db_client=container.db_client)
+    semantic_model = await SemanticCacheModel.create_instance(db_client=container.db_client)
+
+    token_counter = TokenCounter.for_client(container.generation_client)
+
+    seen, after = set(), None
+    total_rows = total_embedded = 0
+    start = time.perf_counter()
+
+    while True:
+        rows = await extraction_model.list_inbound_page(after=after, page_size=args.page_size)
+        if not rows:
+            break
+        after = (rows[-1]["created_at"], rows[-1]["extraction_id"])
+        total_rows += len(rows)
+
+        entries = _entries(container, token_counter, rows, seen)
+        if entries:
+            vectors = await service.embed(
+                [text for text, _ in entries], document_type=DocumentTypeEnum.QUERY.value
+            )
+            await semantic_model.add_entries([
+                {**entry, "embedding": vec} for (_, entry), vec in zip(entries, vectors)
+            ])
+            total_embedded += len(entries)
+
+        elapsed = time.perf_counter() - start
+        print(
+            f"rows={total_rows} embedded={total_embedded} provider_calls={service.provider_calls} "
+            f"elapsed={elapsed:.1f}s ({total_embedded / max(elapsed, 1e-9):.1f} texts/s)"
+        )
+
+    await service.close()
+    await container.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page-size", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=None, help="texts per provider request")
+    parser.add_argument("--concurrency", type=int, default=8, help="provider requests in flight")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.llms.Enums_LLM import DocumentTypeEnum
+from src.utils.metrics import EMBEDDING_BATCH_SIZE, LLM_CACHE_LOOKUPS
+
+# max inputs per embeddings request
+PROVIDER_MAX_BATCH_SIZE = {
+    "OPENAI": 256,       # API allows 2048 inputs, but keeps requests well below the per-request token cap
+    "AZUREOPENAI": 16,   # older Azure deployments reject larger batches
+    "COHERE": 96,
+}
+
+
+def content_hash(model_id: str, document_type: str, text: str) -> str:
+    """Cache key: same text embedded by the same model for the same purpose."""
+    return hashlib.sha256(f"{model_id}\x00{document_type}\x00{text}".encode("utf-8")).hexdigest()
+
+
+def _vectors(result: Any) -> Optional[List[List[float]]]:
+    # OpenAI/Azure return (embeddings, usage_data); Cohere returns embeddings only
+    if not result:
+        return None
+    if isinstance(result, tuple):
+        result = result[0]
+    return list(result) if result else None
+
+
+@dataclass
+class _PendingText:
+    key: str
+    text: str
+    document_type: str
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class EmbeddingService:
+    """
+    Embedding front-end on top of an embedding provider (embed_text / aembed_text).
+
+    - identical texts are embedded once: memory LRU -> Postgres (pgvector) -> in-flight request
+    - concurrent callers are coalesced by one scheduler task into provider-sized batches
+      (up to max_batch_size texts or whatever arrived within max_wait_ms), with at most
+      max_concurrent_batches requests in flight
+    - vectors are returned as NumPy float32 arrays
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        model_id: str,
+        max_batch_size: int = 96,
+        max_wait_ms: float = 10.0,
+        max_concurrent_batches: int = 4,
+        cache_max_entries: int = 20000,
+        db_model: Any = None,
+    ):
+        self.client = client
+        self.model_id = model_id or ""
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_s = max(0.0, float(max_wait_ms)) / 1000.0
+        self.cache_max_entries = cache_max_entries
+        self.db_model = db_model
+
+        self.logger = logging.getLogger(__name__)
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._batch_slots = asyncio.Semaphore(max(1, int(max_concurrent_batches)))
+        self._batch_tasks: set = set()
+
+        # simple counters for benchmarks / debugging
+        self.provider_calls = 0
+        self.texts_embedded = 0
+
+    # ----------------------------
+    # Public API
+    # ----------------------------
+    async def embed(self, texts: Sequence[str], document_type: str = DocumentTypeEnum.DOCUMENT.value) -> np.ndarray:
+        """Embeds texts -> float32 array of shape (len(texts), dim). Raises RuntimeError if the provider fails."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        keys = [content_hash(self.model_id, document_type, t) for t in texts]
+        found: Dict[str, np.ndarray] = {}
+
+        # 1) memory
+        for key in set(keys):
+            vec = self._memory.get(key)
+            if vec is not None:
+                self._memory.move_to_end(key)
+                found[key] = vec
+        LLM_CACHE_LOOKUPS.labels(tier="embedding_memory", result="hit").inc(len(found))
+
+        # 2) Postgres
+        missing = [k for k in dict.fromkeys(keys) if k not in found]
+        if missing and self.db_model is not None:
+            try:
+                stored = await self.db_model.get_many(missing)
+            except Exception:
+                self.logger.exception("Embedding cache lookup failed")
+                stored = {}
+            for key, vec in stored.items():
+                vec = np.asarray(vec, dtype=np.float32)
+                found[key] = vec
+                self._remember(key, vec)
+            LLM_CACHE_LOOKUPS.labels(tier="embedding_postgres", result="hit").inc(len(stored))
+            missing = [k for k in missing if k not in found]
+
+        # 3) provider (joining texts another caller is already embedding)
+        if missing:
+            LLM_CACHE_LOOKUPS.labels(tier="embedding", result="miss").inc(len(missing))
+            text_of = dict(zip(keys, texts))
+            futures = [self._submit(key, text_of[key], document_type) for key in missing]
+            # shielded: the futures are shared with other callers, a cancelled caller must not cancel them
+            shared = [asyncio.shield(f) for f in futures]
+            for key, vec in zip(missing, await asyncio.gather(*shared)):
+                found[key] = vec
+
+        return np.stack([found[k] for k in keys]).astype(np.float32, copy=False)
+
+    async def embed_one(self, text: str, document_type: str = DocumentTypeEnum.DOCUMENT.value) -> np.ndarray:
+        return (await self.embed([text], document_type=document_type))[0]
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+
+    # ----------------------------
+    # Cache
+    # ----------------------------
+    def _remember(self, key: str, vec: np.ndarray) -> None:
+        self._memory[key] = vec
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.cache_max_entries:
+            self._memory.popitem(last=False)
+
+    # ----------------------------
+    # Scheduler
+    # ----------------------------
+    def _submit(self, key: str, text: str, document_type: str) -> asyncio.Future:
+        fut = self._in_flight.get(key)
+        if fut is not None:
+            return fut
+
+        self._ensure_worker()
+        fut = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = fut
+        self._queue.put_nowait(_PendingText(key=key, text=text, document_type=document_type, future=fut))
+        return fut
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _collect_batch(self) -> List[_PendingText]:
+        first = await self._queue.get()
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_s
+
+        while len(batch) < self.max_batch_size:
+            # drain whatever is already queued without waiting
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+
+            # one provider request per document type (Cohere embeds queries and documents differently)
+            by_type: Dict[str, List[_PendingText]] = {}
+            for item in batch:
+                by_type.setdefault(item.document_type, []).append(item)
+
+            for document_type, items in by_type.items():
+                await self._batch_slots.acquire()
+                task = asyncio.create_task(self._embed_batch(document_type, items))
+                self._batch_tasks.add(task)
+                task.add_done_callback(self._batch_tasks.discard)
+
+    async def _embed_batch(self, document_type: str, items: List[_PendingText]) -> None:
+        try:
+            EMBEDDING_BATCH_SIZE.observe(len(items))
+            self.provider_calls += 1
+
+            try:
+                result = await self.client.aembed_text([i.text for i in items], document_type=document_type)
+                vectors = _vectors(result)
+            except Exception as e:
+                self.logger.exception("Embedding batch failed")
+                vectors, error = None, e
+            else:
+                error = None
+
+            if vectors is None or len(vectors) != len(items):
+                exc = RuntimeError(f"Embedding provider returned no vectors for a batch of {len(items)}")
+                if error is not None:
+                    exc.__cause__ = error
+                for item in items:
+                    if not item.future.done():
+                        item.future.set_exception(exc)
+                return
+
+            matrix = np.asarray(vectors, dtype=np.float32)
+            self.texts_embedded += len(items)
+
+            for item, vec in zip(items, matrix):
+                self._remember(item.key, vec)
+                if not item.future.done():
+                    item.future.set_result(vec)
+
+            if self.db_model is not None:
+                try:
+                    await self.db_model.put_many(self.model_id, {i.key: v for i, v in zip(items, matrix)})
+                except Exception:
+                    self.logger.exception("Embedding cache write failed")
+        finally:
+            for item in items:
+                self._in_flight.pop(item.key, None)
+            self._batch_slots.release()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+import random
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+TRACING_MODES = ("on", "off", "sample")
+
+
+class LLMHttpTransport:
+    """
+    One pair of pooled HTTP clients (sync + async) shared by every LLM provider.
+
+    - keep-alive pool with explicit limits: connections (and their TLS sessions) are reused
+      across providers and calls instead of one pool per provider object
+    - HTTP/2 (needs the `h2` package, falls back to HTTP/1.1 if missing): many concurrent
+      calls multiplexed over a few connections
+    - timeouts split per phase (connect / read / write / pool) and per operation:
+      generation waits longer for the first byte than embeddings
+    Owned and closed by DependencyContainer; providers never close it.
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_s: float = 60.0,
+        connect_timeout_s: float = 5.0,
+        write_timeout_s: float = 10.0,
+        pool_timeout_s: float = 10.0,
+        generation_read_timeout_s: float = 60.0,
+        embedding_read_timeout_s: float = 20.0,
+    ):
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1")
+                http2 = False
+        self.http2 = http2
+
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_s,
+        )
+        self.generation_timeout = httpx.Timeout(
+            connect=connect_timeout_s, read=generation_read_timeout_s, write=write_timeout_s, pool=pool_timeout_s
+        )
+        self.embedding_timeout = httpx.Timeout(
+            connect=connect_timeout_s, read=embedding_read_timeout_s, write=write_timeout_s, pool=pool_timeout_s
+        )
+
+        # client default = generation timeout; embedding calls pass embedding_timeout per request
+        self.client = httpx.Client(http2=http2, limits=self.limits, timeout=self.generation_timeout)
+        self.async_client = httpx.AsyncClient(http2=http2, limits=self.limits, timeout=self.generation_timeout)
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "LLMHttpTransport":
+        return cls(
+            http2=settings.LLM_HTTP2,
+            max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry_s=settings.LLM_HTTP_KEEPALIVE_SECONDS,
+            connect_timeout_s=settings.LLM_HTTP_CONNECT_TIMEOUT,
+            generation_read_timeout_s=settings.LLM_HTTP_GENERATION_READ_TIMEOUT,
+            embedding_read_timeout_s=settings.LLM_HTTP_EMBEDDING_READ_TIMEOUT,
+        )
+
+    async def aclose(self) -> None:
+        self.client.close()
+        await self.async_client.aclose()
+
+
+class _SampledTracingClient:
+    """Routes each call to the traced client with probability `sample_rate`, else to the raw one."""
+
+    def __init__(self, raw: Any, traced: Any, sample_rate: float):
+        self._raw = raw
+        self._traced = traced
+        self._sample_rate = sample_rate
+
+    def __getattr__(self, name):
+        # providers access client.chat / client.embeddings once per call
+        client = self._traced if random.random() < self._sample_rate else self._raw
+        return getattr(client, name)
+
+
+def wrap_tracing(make_client: Callable[[], Any], mode: str = "on", sample_rate: float = 1.0) -> Any:
+    """
+    LangSmith tracing around an OpenAI / Azure SDK client built by `make_client`:
+    "on" -> every call traced, "off" -> raw client (no wrapper overhead),
+    "sample" -> a `sample_rate` share of calls traced.
+    wrap_openai patches the client in place, so sampling needs two SDK clients (same HTTP pool).
+    """
+    if mode not in TRACING_MODES:
+        raise ValueError(f"tracing mode must be one of {TRACING_MODES}")
+    if mode == "off" or (mode == "sample" and sample_rate <= 0):
+        return make_client()
+
+    from langsmith.wrappers import wrap_openai
+
+    if mode == "on" or sample_rate >= 1:
+        return wrap_openai(make_client())
+    return _SampledTracingClient(make_client(), wrap_openai(make_client()), sample_rate)
+
+
+def request_timeout(transport: Optional[LLMHttpTransport], operation: str) -> Dict[str, Any]:
+    """
+    Per-request `timeout=` kwarg for SDK calls ("generation" / "embedding").
+    Empty without a shared transport: the SDK treats timeout=None as "no timeout".
+    """
+    if transport is None:
+        return {}
+    return {"timeout": transport.embedding_timeout if operation == "embedding" else transport.generation_timeout}
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from src.utils.metrics import LLM_ROUTER_CALLS, LLM_ROUTER_COST, LLM_ROUTER_LATENCY
+
+SMALL = "small"
+LARGE = "large"
+
+
+@dataclass
+class RoutingFeatures:
+    """Cheap per-call features, all known before the LLM call."""
+    body_tokens: int = 0
+    intent_count: int = 0          # classifier / rule hints; 0 = unknown
+    requires_auth: bool = False
+    sender: Optional[str] = None   # used to remember prior small-model failures
+
+
+def parse_cost(cost: Any) -> float:
+    """Providers return cost as a string like '0.00012000$'."""
+    try:
+        return float(str(cost or "0").rstrip("$"))
+    except ValueError:
+        return 0.0
+
+
+class ModelRouter:
+    """
+    Picks a model tier per call:
+    - small model for short, single-topic mails
+    - large model for long bodies, several intents, auth-sensitive requests (optional),
+      senders whose mails already broke the small model, or when the small model's recent
+      JSON failure rate is too high
+    Callers escalate to the large tier themselves when validation of a small-tier answer fails
+    (record the failure with record()).
+    """
+
+    def __init__(
+        self,
+        small_model_id: str,
+        large_model_id: str,
+        max_small_body_tokens: int = 600,
+        max_small_intents: int = 1,
+        auth_to_large: bool = False,
+        max_small_failure_rate: float = 0.2,
+        failure_window: int = 100,
+        max_tracked_senders: int = 10000,
+    ):
+        self.model_ids = {SMALL: small_model_id, LARGE: large_model_id}
+        self.max_small_body_tokens = max_small_body_tokens
+        self.max_small_intents = max_small_intents
+        self.auth_to_large = auth_to_large
+        self.max_small_failure_rate = max_small_failure_rate
+
+        self._small_outcomes: deque = deque(maxlen=failure_window)  # True = failed
+        self._failed_senders: "OrderedDict[str, int]" = OrderedDict()
+        self._max_tracked_senders = max_tracked_senders
+
+        self._stats: Dict[str, Dict[str, float]] = {
+            tier: {"calls": 0, "failures": 0, "latency_s": 0.0, "cost": 0.0, "tokens": 0}
+            for tier in (SMALL, LARGE)
+        }
+
+        self.logger = logging.getLogger(__name__)
+
+    def model_id(self, tier: str) -> str:
+        return self.model_ids[tier]
+
+    def small_failure_rate(self) -> float:
+        if not self._small_outcomes:
+            return 0.0
+        return sum(self._small_outcomes) / len(self._small_outcomes)
+
+    def choose(self, features: RoutingFeatures) -> str:
+        reason = None
+        if features.body_tokens > self.max_small_body_tokens:
+            reason = "long body"
+        elif features.intent_count > self.max_small_intents:
+            reason = "multi-intent"
+        elif self.auth_to_large and features.requires_auth:
+            reason = "auth required"
+        elif features.sender and features.sender in self._failed_senders:
+            reason = "sender failed on small model before"
+        elif self.small_failure_rate() > self.max_small_failure_rate:
+            reason = f"small model failure rate {self.small_failure_rate():.0%}"
+
+        tier = LARGE if reason else SMALL
+        self.logger.debug("Router -> %s (%s)", tier, reason or "cheap features")
+        return tier
+
+    def record(
+        self,
+        tier: str,
+        ok: bool,
+        latency_s: float,
+        total_tokens: int = 0,
+        cost: Any = 0.0,
+        sender: Optional[str] = None,
+    ) -> None:
+        cost_value = parse_cost(cost)
+
+        stats = self._stats[tier]
+        stats["calls"] += 1
+        stats["failures"] += 0 if ok else 1
+        stats["latency_s"] += latency_s
+        stats["cost"] += cost_value
+        stats["tokens"] += total_tokens
+
+        model = self.model_ids[tier]
+        LLM_ROUTER_CALLS.labels(tier=tier, model=model, outcome="ok" if ok else "invalid").inc()
+        LLM_ROUTER_LATENCY.labels(tier=tier, model=model).observe(latency_s)
+        LLM_ROUTER_COST.labels(tier=tier, model=model).inc(cost_value)
+
+        if tier == SMALL:
+            self._small_outcomes.append(not ok)
+            if not ok and sender:
+                self._failed_senders[sender] = self._failed_senders.get(sender, 0) + 1
+                self._failed_senders.move_to_end(sender)
+                while len(self._failed_senders) > self._max_tracked_senders:
+                    self._failed_senders.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-tier totals and averages for tuning the thresholds."""
+        report: Dict[str, Any] = {}
+        for tier, s in self._stats.items():
+            calls = s["calls"] or 1
+            report[tier] = {
+                "model": self.model_ids[tier],
+                "calls": int(s["calls"]),
+                "failure_rate": s["failures"] / calls,
+                "avg_latency_s": s["latency_s"] / calls,
+                "avg_cost": s["cost"] / calls,
+                "total_cost": s["cost"],
+                "avg_tokens": s["tokens"] / calls,
+            }
+        report["small_recent_failure_rate"] = self.small_failure_rate()
+        return report
@@ -1,12 +1,15 @@
 from ..Interface_LLM import Interface_LLM
 from ..Enums_LLM import OpenAIEnums
+from ..usage import cached_prompt_tokens, record_prompt_usage
+from ..structured_output import openai_response_format
+from ..http_transport import LLMHttpTransport, request_timeout, wrap_tracing
 
 import logging
+import time
 import httpx
 from typing import List, Union, Optional, Dict, Any, Tuple
 
-from openai import AzureOpenAI
-from langsmith.wrappers import wrap_openai
+from openai import AzureOpenAI, AsyncAzureOpenAI
 
 
 class AzureOpenAIProvider(Interface_LLM):
@@ -20,6 +23,9 @@ class AzureOpenAIProvider(Interface_LLM):
         default_generation_max_output_tokens: int = 1000,
         default_generation_temperature: float = 0.1,
         timeout_seconds: float = 30.0,
+        http_transport: Optional[LLMHttpTransport] = None,
+        tracing_mode: str = "on",
+        tracing_sample_rate: float = 1.0,
     ):
         self.api_key = api_key
         self.azure_endpoint = azure_endpoint
@@ -37,29 +43,61 @@ class AzureOpenAIProvider(Interface_LLM):
         self.enums = OpenAIEnums
         self.logger = logging.getLogger(__name__)
 
-        self.http_client = httpx.Client(timeout=timeout_seconds)
+        # shared pooled transport (owned by the container) or, standalone, our own clients
+        self.http_transport = http_transport
+        self._owns_http_clients = http_transport is None
+        if http_transport is not None:
+            self.http_client = http_transport.client
+            self.async_http_client = http_transport.async_client
+        else:
+            self.http_client = httpx.Client(timeout=timeout_seconds)
+            self.async_http_client = httpx.AsyncClient(timeout=timeout_seconds)
 
 
         print(f"AzureOpenAI api {api_key}")
         print(f"AzureOpenAI endpoint {azure_endpoint}")
         print(f"AzureOpenAI model {generation_model_id}")
 
-        self.client = wrap_openai(
-            AzureOpenAI(
+        # LangSmith tracing (wrap_openai): on / off / sampled
+        self.client = wrap_tracing(
+            lambda: AzureOpenAI(
                 api_key=self.api_key,
                 azure_endpoint=self.azure_endpoint.rstrip("/"),
                 api_version=self.api_version,
                 http_client=self.http_client,
-            )
+            ),
+            mode=tracing_mode, sample_rate=tracing_sample_rate,
+        )
+
+        self.async_client = wrap_tracing(
+            lambda: AsyncAzureOpenAI(
+                api_key=self.api_key,
+                azure_endpoint=self.azure_endpoint.rstrip("/"),
+                api_version=self.api_version,
+                http_client=self.async_http_client,
+            ),
+            mode=tracing_mode, sample_rate=tracing_sample_rate,
         )
 
     def close(self) -> None:
+        if not self._owns_http_clients:
+            return
         try:
             if getattr(self, "http_client", None):
                 self.http_client.close()
         except Exception:
             pass
 
+    async def aclose(self) -> None:
+        self.close()
+        if not self._owns_http_clients:
+            return
+        try:
+            if getattr(self, "async_http_client", None):
+                await self.async_http_client.aclose()
+        except Exception:
+            pass
+
     def set_generation_model(self, model_id: str):
         # IMPORTANT: Azure expects the deployment name here
         self.generation_model_id = model_id
@@ -75,6 +113,54 @@ class AzureOpenAIProvider(Interface_LLM):
     def construct_prompt(self, prompt: str, role: str):
         return {"role": role, "content": prompt}
 
+    def _build_chat_kwargs(
+            self,
+            deployment: str,
+            prompt: str,
+            chat_history: Optional[List[Dict[str, Any]]],
+            max_output_tokens: Optional[int],
+            temperature: Optional[float],
+            json_schema: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
+        temperature = temperature if temperature is not None else self.default_generation_temperature
+
+        base_history: List[Dict[str, Any]] = list(chat_history) if chat_history else []
+        new_history = base_history + [self.construct_prompt(prompt=prompt, role=self.enums.USER.value)]
+
+        kwargs: Dict[str, Any] = {
+            "model": deployment,  # Azure: deployment name
+            "messages": new_history,
+            "max_tokens": int(max_output_tokens),
+            "temperature": float(temperature),
+        }
+
+        # Structured output (needs api_version >= 2024-08-01-preview and a model that supports it)
+        if json_schema:
+            kwargs["response_format"] = openai_response_format(json_schema)
+
+        kwargs.update(request_timeout(self.http_transport, "generation"))
+        return kwargs
+
+    def _parse_chat_response(self, response, deployment: str = None, latency_s: Optional[float] = None) -> Optional[Tuple[str, int, str]]:
+        if not response or not getattr(response, "choices", None) or not response.choices[0].message:
+            self.logger.error("Error while generating text with Azure OpenAI")
+            return None
+
+        message = response.choices[0].message.content or ""
+
+        usage = getattr(response, "usage", None)
+        prompt_tokens = int(getattr(usage, "prompt_tokens", 0) or 0)
+        output_tokens = int(getattr(usage, "completion_tokens", 0) or 0)
+        total_tokens = int(getattr(usage, "total_tokens", prompt_tokens + output_tokens) or 0)
+
+        # Pricing on Azure depends on region + your offer; keep 0 or your own mapping
+        total_cost = 0.0
+
+        record_prompt_usage("AZUREOPENAI", deployment, prompt_tokens, cached_prompt_tokens(usage), latency_s,
+                            completion_tokens=output_tokens, cost=total_cost, total_tokens=total_tokens)
+        return message, total_tokens, f"{total_cost:.8f}$"
+
     def generate_text(
             self,
             prompt: str,
@@ -82,6 +168,7 @@ class AzureOpenAIProvider(Interface_LLM):
             max_output_tokens: Optional[int] = None,
             temperature: Optional[float] = None,
             model_id: Optional[str] = None,  # override (deployment name)
+            json_schema: Optional[Dict[str, Any]] = None,  # structured output (json_schema_spec)
     ) -> Optional[Tuple[str, int, str]]:
         if not self.client:
             self.logger.error("AzureOpenAI client was not set")
@@ -92,19 +179,9 @@ class AzureOpenAIProvider(Interface_LLM):
             self.logger.error("Generation deployment name for Azure OpenAI was not set")
             return None
 
-        max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
-        temperature = temperature if temperature is not None else self.default_generation_temperature
-
-        base_history: List[Dict[str, Any]] = list(chat_history) if chat_history else []
-        new_history = base_history + [self.construct_prompt(prompt=prompt, role=self.enums.USER.value)]
-
-        kwargs: Dict[str, Any] = {
-            "model": deployment,  # Azure: deployment name
-            "messages": new_history,
-            "max_tokens": int(max_output_tokens),
-            "temperature": float(temperature),
-        }
+        kwargs = self._build_chat_kwargs(deployment, prompt, chat_history, max_output_tokens, temperature, json_schema)
 
+        start = time.perf_counter()
         try:
             response = self.client.chat.completions.create(**kwargs)
         except Exception as e:
@@ -117,26 +194,44 @@ class AzureOpenAIProvider(Interface_LLM):
                 self.logger.exception("Chat completion failed after retry.")
                 return None
 
-        if not response or not getattr(response, "choices", None) or not response.choices[0].message:
-            self.logger.error("Error while generating text with Azure OpenAI")
+        return self._parse_chat_response(response, deployment, latency_s=time.perf_counter() - start)
+
+    async def agenerate_text(
+            self,
+            prompt: str,
+            chat_history: Optional[List[Dict[str, Any]]] = None,
+            max_output_tokens: Optional[int] = None,
+            temperature: Optional[float] = None,
+            model_id: Optional[str] = None,
+            json_schema: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Tuple[str, int, str]]:
+        """Async version of generate_text (same return contract)."""
+        if not self.async_client:
+            self.logger.error("AzureOpenAI async client was not set")
             return None
 
-        message = response.choices[0].message.content or ""
+        deployment = model_id or self.generation_model_id
+        if not deployment:
+            self.logger.error("Generation deployment name for Azure OpenAI was not set")
+            return None
 
-        usage = getattr(response, "usage", None)
-        prompt_tokens = int(getattr(usage, "prompt_tokens", 0) or 0)
-        output_tokens = int(getattr(usage, "completion_tokens", 0) or 0)
-        total_tokens = int(getattr(usage, "total_tokens", prompt_tokens + output_tokens) or 0)
+        kwargs = self._build_chat_kwargs(deployment, prompt, chat_history, max_output_tokens, temperature, json_schema)
 
-        # Pricing on Azure depends on region + your offer; keep 0 or your own mapping
-        total_cost = 0.0
-        return message, total_tokens, f"{total_cost:.8f}$"
+        start = time.perf_counter()
+        try:
+            response = await self.async_client.chat.completions.create(**kwargs)
+        except Exception as e:
+            self.logger.warning("Chat completion failed; retrying without temperature. Error: %s", e)
+            kwargs.pop("temperature", None)
+            try:
+                response = await self.async_client.chat.completions.create(**kwargs)
+            except Exception:
+                self.logger.exception("Chat completion failed after retry.")
+                return None
 
-    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
-        if not self.client or not self.embedding_model_id:
-            self.logger.error("AzureOpenAI client/deployment not set for embeddings")
-            return None
+        return self._parse_chat_response(response, deployment, latency_s=time.perf_counter() - start)
 
+    def _build_embed_kwargs(self, text: Union[str, List[str]]) -> Dict[str, Any]:
         inputs = [text] if isinstance(text, str) else list(text)
 
         kwargs: Dict[str, Any] = {
@@ -148,12 +243,10 @@ class AzureOpenAIProvider(Interface_LLM):
         if self.embedding_dimensions_size is not None:
             kwargs["dimensions"] = int(self.embedding_dimensions_size)
 
-        try:
-            response = self.client.embeddings.create(**kwargs)
-        except Exception:
-            self.logger.exception("Embedding call failed.")
-            return None
+        kwargs.update(request_timeout(self.http_transport, "embedding"))
+        return kwargs
 
+    def _parse_embed_response(self, response):
         if not response or not response.data or not response.data[0].embedding:
             self.logger.error("Error while embedding text with Azure OpenAI")
             return None
@@ -168,4 +261,35 @@ class AzureOpenAIProvider(Interface_LLM):
             "total_tokens": total_tokens,
             "total_cost": f"{0.0:.8f}$",
         }
-        return embeddings, usage_data
\ No newline at end of file
+        return embeddings, usage_data
+
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+        if not self.client or not self.embedding_model_id:
+            self.logger.error("AzureOpenAI client/deployment not set for embeddings")
+            return None
+
+        kwargs = self._build_embed_kwargs(text)
+
+        try:
+            response = self.client.embeddings.create(**kwargs)
+        except Exception:
+            self.logger.exception("Embedding call failed.")
+            return None
+
+        return self._parse_embed_response(response)
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+        """Async version of embed_text (same return contract)."""
+        if not self.async_client or not self.embedding_model_id:
+            self.logger.error("AzureOpenAI async client/deployment not set for embeddings")
+            return None
+
+        kwargs = self._build_embed_kwargs(text)
+
+        try:
+            response = await self.async_client.embeddings.create(**kwargs)
+        except Exception:
+            self.logger.exception("Embedding call failed.")
+            return None
+
+        return self._parse_embed_response(response)
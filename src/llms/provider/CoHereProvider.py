@@ -1,8 +1,11 @@
 from ..Interface_LLM import Interface_LLM
 from ..Enums_LLM import CoHereEnums, DocumentTypeEnum
+from ..usage import record_prompt_usage
+from ..http_transport import LLMHttpTransport
 import cohere
 import logging
-from typing import List, Union
+import time
+from typing import List, Union, Optional, Tuple
 
 
 class CoHereProvider(Interface_LLM):
@@ -10,7 +13,8 @@ class CoHereProvider(Interface_LLM):
     def __init__(self, api_key: str,
                  default_input_max_characters: int = 1000,
                  default_generation_max_output_tokens: int = 1000,
-                 default_generation_temperature: float = 0.1):
+                 default_generation_temperature: float = 0.1,
+                 http_transport: Optional[LLMHttpTransport] = None):
         self.api_key = api_key
 
         self.default_input_max_characters = default_input_max_characters
@@ -22,7 +26,14 @@ class CoHereProvider(Interface_LLM):
         self.embedding_model_id = None
         self.embedding_size = None
 
-        self.client = cohere.Client(api_key=self.api_key)
+        # shared pooled transport (owned by the container); per-request read timeouts via request_options
+        self.http_transport = http_transport
+        if http_transport is not None:
+            self.client = cohere.Client(api_key=self.api_key, httpx_client=http_transport.client)
+            self.async_client = cohere.AsyncClient(api_key=self.api_key, httpx_client=http_transport.async_client)
+        else:
+            self.client = cohere.Client(api_key=self.api_key)
+            self.async_client = cohere.AsyncClient(api_key=self.api_key)
 
         self.enums = CoHereEnums
 
@@ -38,63 +49,105 @@ class CoHereProvider(Interface_LLM):
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
 
-    def generate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
-                      temperature: float = None):
-
-        if not self.client:
-            self.logger.error("CoHere client was not set")
-            return None
-
-        if not self.generation_model_id:
-            self.logger.error("Generation model for CoHere was not set")
-            return None
+    def _request_options(self, operation: str) -> dict:
+        if self.http_transport is None:
+            return {}
+        timeout = self.http_transport.embedding_timeout if operation == "embedding" \
+            else self.http_transport.generation_timeout
+        return {"request_options": {"timeout_in_seconds": int(timeout.read)}}
 
+    def _build_chat_kwargs(self, prompt: str, chat_history: list, max_output_tokens: int, temperature: float,
+                           model_id: str = None, json_schema: dict = None) -> dict:
         max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
         temperature = temperature if temperature else self.default_generation_temperature
 
-        response = self.client.chat(
-            model=self.generation_model_id,
-            chat_history=chat_history,
-            message=self.process_text(prompt),
-            temperature=temperature,
-            max_tokens=max_output_tokens
-        )
+        kwargs = {
+            "model": model_id or self.generation_model_id,
+            "chat_history": chat_history or [],
+            "message": self.process_text(prompt),
+            "temperature": temperature,
+            "max_tokens": max_output_tokens,
+        }
+
+        # JSON mode constrained to the schema
+        if json_schema:
+            kwargs["response_format"] = {"type": "json_object", "schema": json_schema["schema"]}
 
+        kwargs.update(self._request_options("generation"))
+        return kwargs
+
+    def _parse_chat_response(self, response, model: str = None, latency_s: float = None) -> Optional[Tuple[str, int, str]]:
         if not response or not response.text:
             self.logger.error("Error while generating text with CoHere")
             return None
 
-        return response.text
+        billed = getattr(getattr(response, "meta", None), "billed_units", None)
+        input_tokens = int(getattr(billed, "input_tokens", 0) or 0)
+        output_tokens = int(getattr(billed, "output_tokens", 0) or 0)
 
+        record_prompt_usage("COHERE", model or self.generation_model_id, input_tokens, 0, latency_s,
+                            completion_tokens=output_tokens)
 
-    def embed_text(self, text: Union[str,List[str]], document_type: str = None):
+        # same contract as the OpenAI providers: (message, total_tokens, cost_string)
+        return response.text, input_tokens + output_tokens, f"{0.0:.8f}$"
+
+    def generate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                      temperature: float = None, model_id: str = None, json_schema: dict = None):
 
         if not self.client:
             self.logger.error("CoHere client was not set")
             return None
 
-        if isinstance(text, str):
-            text = [text]
+        if not (model_id or self.generation_model_id):
+            self.logger.error("Generation model for CoHere was not set")
+            return None
 
-        if not self.embedding_model_id:
-            self.logger.error("Embedding model for CoHere was not set")
+        start = time.perf_counter()
+        response = self.client.chat(
+            **self._build_chat_kwargs(prompt, chat_history, max_output_tokens, temperature, model_id, json_schema)
+        )
+
+        return self._parse_chat_response(response, model_id, latency_s=time.perf_counter() - start)
+
+    async def agenerate_text(self, prompt: str, chat_history: list = None, max_output_tokens: int = None,
+                             temperature: float = None, model_id: str = None, json_schema: dict = None):
+
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
             return None
 
-        input_type=CoHereEnums.DOCUMENT.value
-        if document_type in {DocumentTypeEnum.QUERY, DocumentTypeEnum.QUERY.value}:
-            input_type = CoHereEnums.QUERY
+        if not (model_id or self.generation_model_id):
+            self.logger.error("Generation model for CoHere was not set")
+            return None
 
+        start = time.perf_counter()
         try:
-            resp = self.client.embed(
-                model=self.embedding_model_id,
-                texts=[ self.process_text(t) for t in text ],
-                input_type=input_type,
-                embedding_types=["float"],  # fine to keep
+            response = await self.async_client.chat(
+                **self._build_chat_kwargs(prompt, chat_history, max_output_tokens, temperature, model_id, json_schema)
             )
         except Exception as exc:
-            self.logger.exception("Cohere embed failed: %s", exc)
+            self.logger.exception("Cohere chat failed: %s", exc)
             return None
 
+        return self._parse_chat_response(response, model_id, latency_s=time.perf_counter() - start)
+
+    def _build_embed_kwargs(self, text: Union[str, List[str]], document_type: str = None) -> dict:
+        if isinstance(text, str):
+            text = [text]
+
+        input_type=CoHereEnums.DOCUMENT.value
+        if document_type in {DocumentTypeEnum.QUERY, DocumentTypeEnum.QUERY.value}:
+            input_type = CoHereEnums.QUERY.value
+
+        return {
+            "model": self.embedding_model_id,
+            "texts": [ self.process_text(t) for t in text ],
+            "input_type": input_type,
+            "embedding_types": ["float"],  # fine to keep
+            **self._request_options("embedding"),
+        }
+
+    def _parse_embed_response(self, resp):
         vectors = getattr(resp.embeddings, "float", None)  # list of vectors
 
         # (optional) fallback for old Bedrock / ≤4.0 list‑only schema
@@ -107,9 +160,45 @@ class CoHereProvider(Interface_LLM):
 
         return vectors
 
+    def embed_text(self, text: Union[str,List[str]], document_type: str = None):
+
+        if not self.client:
+            self.logger.error("CoHere client was not set")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for CoHere was not set")
+            return None
+
+        try:
+            resp = self.client.embed(**self._build_embed_kwargs(text, document_type))
+        except Exception as exc:
+            self.logger.exception("Cohere embed failed: %s", exc)
+            return None
+
+        return self._parse_embed_response(resp)
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for CoHere was not set")
+            return None
+
+        try:
+            resp = await self.async_client.embed(**self._build_embed_kwargs(text, document_type))
+        except Exception as exc:
+            self.logger.exception("Cohere embed failed: %s", exc)
+            return None
+
+        return self._parse_embed_response(resp)
+
 
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
             "text": prompt
-        }
\ No newline at end of file
+        }
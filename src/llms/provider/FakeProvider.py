@@ -0,0 +1,388 @@
+from ..Interface_LLM import Interface_LLM
+from ..Enums_LLM import OpenAIEnums
+from ..rate_limiter import estimate_tokens
+from ..usage import record_prompt_usage
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "lognormal")
+
+# keyword -> intent for synthesized extractions (first match wins the order, all matches are returned)
+_INTENT_PATTERNS = [
+    ("MeterReadingCorrection", re.compile(r"\b(wrong|incorrect|correct(ion)?|falsch|korrigier\w*)\b.{0,40}\b(meter|zähler)", re.I | re.S)),
+    ("MeterReadingSubmission", re.compile(r"\b(meter reading|zählerstand|kwh|zähler)\b", re.I)),
+    ("PersonalDataChange", re.compile(r"\b(new address|moved|umzug|umgezogen|name change|bank details|iban|adresse)\b", re.I)),
+    ("ContractIssue", re.compile(r"\b(cancel\w*|kündig\w*|contract|vertrag|abschlag|installment)\b", re.I)),
+    ("ProductInfoRequest", re.compile(r"\b(tariff|tarif|price|preis|dynamic|dynamisch|offer|angebot)\b", re.I)),
+    ("GeneralFeedback", re.compile(r"\b(thank|danke|complaint|beschwerde|feedback)\b", re.I)),
+]
+_SENSITIVE_INTENTS = {"MeterReadingSubmission", "MeterReadingCorrection", "PersonalDataChange", "ContractIssue"}
+
+_CONTRACT_RE = re.compile(r"\b(?:contract|vertrag)\w*\s*(?:no\.?|nr\.?|number|nummer)?\s*[:#]?\s*([A-Z0-9][A-Z0-9-]{4,})", re.I)
+_METER_RE = re.compile(r"\b(?:meter|zähler)\w*\s*(?:no\.?|nr\.?|number|nummer)\s*[:#]?\s*([A-Z0-9][A-Z0-9-]{4,})", re.I)
+_READING_RE = re.compile(r"(\d[\d.,]*)\s*kwh", re.I)
+_POSTAL_RE = re.compile(r"\b(\d{5})\b")
+_CASE_ID_RE = re.compile(r"case_id:\s*([0-9a-fA-F-]{36})")
+_GERMAN_RE = re.compile(r"\b(und|ich|mein|meine|der|die|das|bitte|hallo|zählerstand|vertrag)\b", re.I)
+
+
+def prompt_key(prompt: str, chat_history: Optional[list] = None) -> str:
+    """Replay key of a call: the rendered messages (system + user) as sent to the provider."""
+    payload = json.dumps([chat_history or [], prompt or ""], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FakeProvider(Interface_LLM):
+    """
+    Offline stand-in for a generation / embedding provider (load tests, local benchmarks).
+
+    - answers are replayed from a JSONL recording (see RecordingProvider) by exact prompt key,
+      else by structured-output schema name, else synthesized from templates that satisfy the
+      extraction / email-reply schemas
+    - latency = time to first token (constant | uniform | lognormal around latency_ms)
+      + ms_per_output_token * completion tokens
+    - error_rate: share of calls that fail like a provider error (None is returned)
+    - everything is deterministic for a given seed: the n-th call with the same prompt always
+      draws the same latency / error / replayed answer, whatever the concurrency
+    """
+
+    def __init__(self,
+                 responses_path: Optional[str] = None,
+                 latency_distribution: str = "lognormal",
+                 latency_ms: float = 300.0,
+                 latency_jitter: float = 0.5,
+                 ms_per_output_token: float = 10.0,
+                 error_rate: float = 0.0,
+                 completion_tokens: Optional[int] = None,
+                 price_per_million_input: float = 0.0,
+                 price_per_million_output: float = 0.0,
+                 seed: int = 0,
+                 default_input_max_characters: int = 1000,
+                 default_generation_max_output_tokens: int = 1000,
+                 default_generation_temperature: float = 0.1):
+
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency_distribution must be one of {LATENCY_DISTRIBUTIONS}")
+
+        self.latency_distribution = latency_distribution
+        self.latency_ms = max(0.0, float(latency_ms))
+        self.latency_jitter = max(0.0, float(latency_jitter))
+        self.ms_per_output_token = max(0.0, float(ms_per_output_token))
+        self.error_rate = min(1.0, max(0.0, float(error_rate)))
+        self.completion_tokens = completion_tokens
+        self.price_per_million_input = price_per_million_input
+        self.price_per_million_output = price_per_million_output
+        self.seed = seed
+
+        self.default_input_max_characters = default_input_max_characters
+        self.default_generation_max_output_tokens = default_generation_max_output_tokens
+        self.default_generation_temperature = default_generation_temperature
+
+        self.generation_model_id = "fake"
+        self.embedding_model_id = None
+        self.embedding_size = None
+
+        self.enums = OpenAIEnums
+
+        self.logger = logging.getLogger(__name__)
+
+        self._by_key: Dict[str, str] = {}
+        self._by_schema: Dict[str, List[str]] = defaultdict(list)
+        self._calls: Dict[str, int] = defaultdict(int)
+        if responses_path:
+            self.load_responses(responses_path)
+
+    def set_generation_model(self, model_id: str):
+        self.generation_model_id = model_id or "fake"
+
+    def set_embedding_model(self, model_id: str, embedding_dimensions_size: int):
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_dimensions_size
+
+    def process_text(self, text: str):
+        return text[:self.default_input_max_characters].strip()
+
+    # ----------------------------
+    # Recorded responses
+    # ----------------------------
+    def load_responses(self, path: str) -> int:
+        """JSONL lines: {"key": prompt_key(...), "schema": <json_schema name or null>, "text": <answer>}."""
+        loaded = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                row = json.loads(line)
+                text = row.get("text")
+                if text is None:
+                    continue
+                if row.get("key"):
+                    self._by_key[row["key"]] = text
+                if row.get("schema"):
+                    self._by_schema[row["schema"]].append(text)
+                loaded += 1
+
+        self.logger.info("FakeProvider loaded %d recorded responses from %s", loaded, path)
+        return loaded
+
+    # ----------------------------
+    # Latency / errors
+    # ----------------------------
+    def _rng(self, key: str) -> random.Random:
+        # n-th call of the same prompt -> same draw, independent of scheduling order
+        attempt = self._calls[key]
+        self._calls[key] += 1
+        return random.Random(f"{self.seed}:{key}:{attempt}")
+
+    def _first_token_ms(self, rng: random.Random) -> float:
+        if self.latency_distribution == "constant" or not self.latency_ms:
+            return self.latency_ms
+        if self.latency_distribution == "uniform":
+            spread = self.latency_ms * min(self.latency_jitter, 1.0)
+            return rng.uniform(self.latency_ms - spread, self.latency_ms + spread)
+        # lognormal: median = latency_ms, sigma = jitter (0.5 -> p99 ~ 3.2x median)
+        return rng.lognormvariate(math.log(self.latency_ms), self.latency_jitter)
+
+    # ----------------------------
+    # Answers
+    # ----------------------------
+    def _answer(self, key: str, prompt: str, json_schema: Optional[dict], rng: random.Random) -> str:
+        if key in self._by_key:
+            return self._by_key[key]
+
+        name = (json_schema or {}).get("name")
+        recorded = self._by_schema.get(name) if name else None
+        if recorded:
+            return recorded[int(key[:8], 16) % len(recorded)]
+
+        if name in ("ExtractionResult", "IntentOnlyResult", "EntitiesOnlyResult"):
+            return json.dumps(self._extraction(name, prompt, rng), ensure_ascii=False)
+        if name == "EmailReply":
+            return json.dumps(self._email_reply(prompt), ensure_ascii=False)
+        if json_schema:
+            return json.dumps(_from_schema(json_schema["schema"], json_schema["schema"].get("$defs", {})))
+        return "OK"
+
+    def _extraction(self, name: str, prompt: str, rng: random.Random) -> Dict[str, Any]:
+        language = "de" if len(_GERMAN_RE.findall(prompt)) >= 2 else "en"
+
+        intents = []
+        for intent_name, pattern in _INTENT_PATTERNS:
+            if pattern.search(prompt):
+                intents.append({
+                    "name": intent_name,
+                    "confidence": round(rng.uniform(0.75, 0.98), 2),
+                    "requires_auth": intent_name in _SENSITIVE_INTENTS,
+                    "reason": "keyword match",
+                })
+        if any(i["name"] == "MeterReadingCorrection" for i in intents):
+            intents = [i for i in intents if i["name"] != "MeterReadingSubmission"]
+        if not intents:
+            intents = [{"name": "Other", "confidence": 0.6, "requires_auth": False, "reason": "no known topic"}]
+
+        def first(regex):
+            m = regex.search(prompt)
+            return m.group(1) if m else None
+
+        entities = {
+            "contract_number": first(_CONTRACT_RE),
+            "meter_number": first(_METER_RE),
+            "meter_reading_value": first(_READING_RE),
+            "meter_reading_date": None,
+            "customer_full_name": None,
+            "postal_code": first(_POSTAL_RE),
+            "address": None,
+            "birthdate": None,
+            "installment_amount": None,
+            "tariff_name": None,
+            "topic_keywords": [i["name"] for i in intents],
+        }
+        overall = round(min(i["confidence"] for i in intents), 2)
+
+        if name == "IntentOnlyResult":
+            return {"language": language, "intents": intents, "overall_confidence": overall, "notes_for_agent": ""}
+        if name == "EntitiesOnlyResult":
+            return {"case_id": None, "language": language, "entities": entities, "notes_for_agent": ""}
+
+        missing = [k for k in ("contract_number", "postal_code") if not entities[k]] \
+            if any(i["requires_auth"] for i in intents) else []
+        return {
+            "case_id": None,
+            "message_id": None,
+            "language": language,
+            "intents": intents,
+            "entities": entities,
+            "overall_confidence": overall,
+            "needs_followup": bool(missing),
+            "missing_fields_for_next_step": missing,
+            "notes_for_agent": "",
+        }
+
+    def _email_reply(self, prompt: str) -> Dict[str, str]:
+        m = _CASE_ID_RE.search(prompt)
+        case_id = m.group(1) if m else "00000000-0000-0000-0000-000000000000"
+        return {
+            "subject": f"Re: Your request [CASE: {case_id}]",
+            "body": (
+                "Hello,\n\nThank you for your message. We are processing your request "
+                f"and will get back to you shortly.\n\nCase ID: {case_id}\n\nKind regards,\nCustomer Support"
+            ),
+        }
+
+    # ----------------------------
+    # Generation
+    # ----------------------------
+    def _prepare(self, prompt: str, chat_history: list, max_output_tokens: int, json_schema: dict):
+        prompt = self.process_text(prompt)
+        key = prompt_key(prompt, chat_history)
+        rng = self._rng(key)
+
+        failed = rng.random() < self.error_rate
+        text = None if failed else self._answer(key, prompt, json_schema, rng)
+
+        prompt_tokens = estimate_tokens(prompt, chat_history)
+        completion_tokens = self.completion_tokens if self.completion_tokens is not None \
+            else (len(text) // 4 + 1 if text else 0)
+        completion_tokens = min(completion_tokens, max_output_tokens or self.default_generation_max_output_tokens)
+
+        delay_s = (self._first_token_ms(rng) + self.ms_per_output_token * completion_tokens) / 1000.0
+        return text, prompt_tokens, completion_tokens, delay_s
+
+    def _finish(self, text: Optional[str], prompt_tokens: int, completion_tokens: int,
+                model_id: Optional[str], latency_s: float) -> Optional[Tuple[str, int, str]]:
+        if text is None:
+            self.logger.error("FakeProvider: injected generation error")
+            return None
+
+        cost = (prompt_tokens * self.price_per_million_input
+                + completion_tokens * self.price_per_million_output) / 1_000_000
+        record_prompt_usage("FAKE", model_id or self.generation_model_id, prompt_tokens, 0, latency_s,
+                            completion_tokens=completion_tokens, cost=cost)
+
+        return text, prompt_tokens + completion_tokens, f"{cost:.8f}$"
+
+    def generate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                      temperature: float = None, model_id: str = None, json_schema: dict = None):
+        start = time.perf_counter()
+        text, prompt_tokens, completion_tokens, delay_s = self._prepare(
+            prompt, chat_history, max_output_tokens, json_schema
+        )
+        time.sleep(delay_s)
+        return self._finish(text, prompt_tokens, completion_tokens, model_id, time.perf_counter() - start)
+
+    async def agenerate_text(self, prompt: str, chat_history: list = None, max_output_tokens: int = None,
+                             temperature: float = None, model_id: str = None, json_schema: dict = None):
+        start = time.perf_counter()
+        text, prompt_tokens, completion_tokens, delay_s = self._prepare(
+            prompt, chat_history, max_output_tokens, json_schema
+        )
+        await asyncio.sleep(delay_s)
+        return self._finish(text, prompt_tokens, completion_tokens, model_id, time.perf_counter() - start)
+
+    # ----------------------------
+    # Embeddings
+    # ----------------------------
+    def _embed(self, text: Union[str, List[str]], document_type: str = None) -> List[List[float]]:
+        if isinstance(text, str):
+            text = [text]
+
+        dim = int(self.embedding_size or 384)
+        vectors = []
+        for t in text:
+            # same text -> same unit vector (near-duplicates are NOT close; use real embeddings for that)
+            rng = random.Random(hashlib.sha256(f"{document_type}\x00{self.process_text(t)}".encode("utf-8")).digest())
+            vec = [rng.gauss(0.0, 1.0) for _ in range(dim)]
+            norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+            vectors.append([v / norm for v in vec])
+        return vectors
+
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+        return self._embed(text, document_type)
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+        rng = self._rng(f"embed:{len(text) if isinstance(text, list) else 1}")
+        await asyncio.sleep(self._first_token_ms(rng) / 1000.0)
+        return self._embed(text, document_type)
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {
+            "role": role,
+            "content": prompt,
+        }
+
+
+def _from_schema(node: Dict[str, Any], defs: Dict[str, Any]) -> Any:
+    """Smallest value matching a (strict) JSON schema; used for schemas without a template."""
+    if "$ref" in node:
+        return _from_schema(defs[node["$ref"].split("/")[-1]], defs)
+    if "const" in node:
+        return node["const"]
+    if "enum" in node:
+        return node["enum"][0]
+    if "anyOf" in node:
+        return _from_schema(node["anyOf"][0], defs)
+
+    kind = node.get("type")
+    if isinstance(kind, list):
+        kind = kind[0]
+    if kind == "object":
+        return {name: _from_schema(sub, defs) for name, sub in node.get("properties", {}).items()}
+    if kind == "array":
+        return []
+    if kind == "string":
+        return ""
+    if kind in ("number", "integer"):
+        return 0
+    if kind == "boolean":
+        return False
+    return None
+
+
+class RecordingProvider:
+    """
+    Wraps a real generation provider and appends every answer to a JSONL file that
+    FakeProvider(responses_path=...) can replay. Everything else is forwarded unchanged.
+    """
+
+    def __init__(self, provider: Any, path: str):
+        self._provider = provider
+        self._path = path
+        self.logger = logging.getLogger(__name__)
+
+    def __getattr__(self, name):
+        return getattr(self._provider, name)
+
+    def _write(self, prompt: str, chat_history: Optional[list], json_schema: Optional[dict], result) -> None:
+        if not result:
+            return
+        row = {
+            "key": prompt_key(self._provider.process_text(prompt), chat_history),
+            "schema": (json_schema or {}).get("name"),
+            "text": result[0],
+        }
+        try:
+            with open(self._path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        except OSError:
+            self.logger.exception("Could not record LLM response to %s", self._path)
+
+    def generate_text(self, prompt: str, chat_history: list = [], max_output_tokens: int = None,
+                      temperature: float = None, **kwargs):
+        result = self._provider.generate_text(prompt, chat_history, max_output_tokens, temperature, **kwargs)
+        self._write(prompt, chat_history, kwargs.get("json_schema"), result)
+        return result
+
+    async def agenerate_text(self, prompt: str, chat_history: list = None, max_output_tokens: int = None,
+                             temperature: float = None, **kwargs):
+        result = await self._provider.agenerate_text(prompt, chat_history, max_output_tokens, temperature, **kwargs)
+        self._write(prompt, chat_history, kwargs.get("json_schema"), result)
+        return result
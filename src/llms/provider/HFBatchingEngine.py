@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import torch
+
+
+@dataclass
+class _PendingRequest:
+    messages: List[Dict[str, str]]
+    max_new_tokens: int
+    do_sample: bool
+    temperature: float
+    future: asyncio.Future
+    # grammar constraint (JSON schema) of this request: (batch_id, input_ids) -> allowed token ids
+    prefix_allowed_tokens_fn: Optional[Callable[[int, Any], List[int]]] = None
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def batch_key(self) -> Tuple[bool, float, bool]:
+        # requests can only share one generate() call if their sampling config matches;
+        # constrained ones are grouped apart so plain rows don't pay for the per-step mask
+        return (
+            self.do_sample,
+            (self.temperature if self.do_sample else 0.0),
+            self.prefix_allowed_tokens_fn is not None,
+        )
+
+
+class HFBatchingEngine:
+    """
+    Dynamic batching in front of a local HF causal LM.
+
+    Concurrent agenerate_text() calls are queued; a single scheduler task collects
+    up to max_batch_size requests (or whatever arrived within max_wait_ms), runs ONE
+    left-padded model.generate() for the batch in a worker thread and resolves each
+    caller's future with its own slice of the output.
+
+    Schema-constrained requests batch too: generate() calls prefix_allowed_tokens_fn with the
+    row index, which is dispatched to that request's own constraint.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        tokenizer: Any,
+        device: Optional[str] = None,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+    ):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.device = device
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_s = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self.logger = logging.getLogger(__name__)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # simple counters for benchmarks / debugging
+        self.batches_run = 0
+        self.requests_served = 0
+
+    # ----------------------------
+    # Public API
+    # ----------------------------
+    async def submit(
+        self,
+        messages: List[Dict[str, str]],
+        max_new_tokens: int,
+        do_sample: bool = False,
+        temperature: float = 0.0,
+        prefix_allowed_tokens_fn: Optional[Callable[[int, Any], List[int]]] = None,
+    ) -> Tuple[str, int, int]:
+        """Queue one chat request; returns (text, prompt_tokens, new_tokens) once its batch finished."""
+        self._ensure_worker()
+
+        loop = asyncio.get_running_loop()
+        req = _PendingRequest(
+            messages=messages,
+            max_new_tokens=int(max_new_tokens),
+            do_sample=bool(do_sample),
+            temperature=float(temperature),
+            future=loop.create_future(),
+            prefix_allowed_tokens_fn=prefix_allowed_tokens_fn,
+        )
+        await self._queue.put(req)
+        return await req.future
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    # ----------------------------
+    # Scheduler
+    # ----------------------------
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _collect_batch(self) -> List[_PendingRequest]:
+        first = await self._queue.get()
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_s
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+
+            # split by sampling config; each group is one generate() call
+            groups: Dict[Tuple[bool, float, bool], List[_PendingRequest]] = {}
+            for req in batch:
+                groups.setdefault(req.batch_key, []).append(req)
+
+            for group in groups.values():
+                try:
+                    results = await asyncio.to_thread(self._generate_batch, group)
+                except Exception as e:
+                    self.logger.exception("Batched generation failed")
+                    for req in group:
+                        if not req.future.done():
+                            req.future.set_exception(e)
+                    continue
+
+                for req, result in zip(group, results):
+                    if not req.future.done():
+                        req.future.set_result(result)
+
+                self.batches_run += 1
+                self.requests_served += len(group)
+
+    # ----------------------------
+    # Model side (runs in a worker thread)
+    # ----------------------------
+    def _render(self, messages: List[Dict[str, str]]) -> str:
+        if getattr(self.tokenizer, "chat_template", None):
+            return self.tokenizer.apply_chat_template(
+                messages, tokenize=False, add_generation_prompt=True
+            )
+
+        parts = [f"[{m['role'].upper()}]\n{m['content']}\n" for m in messages]
+        parts.append("[ASSISTANT]\n")
+        return "\n".join(parts)
+
+    def _batch_constraint(self, group: List[_PendingRequest], prompt_len: int):
+        """One prefix_allowed_tokens_fn for the batch: row i is checked by request i's constraint."""
+        fns = [req.prefix_allowed_tokens_fn for req in group]
+        pad_id = self.tokenizer.pad_token_id
+        stop_ids = {self.tokenizer.eos_token_id, pad_id} - {None}
+        finished = [pad_id if pad_id is not None else self.tokenizer.eos_token_id]
+
+        def allowed(batch_id: int, input_ids) -> List[int]:
+            # a row that already stopped only gets padding; its constraint has nothing left to allow
+            if input_ids.shape[-1] > prompt_len and int(input_ids[-1]) in stop_ids:
+                return finished
+            return fns[batch_id](batch_id, input_ids)
+
+        return allowed
+
+    def _generate_batch(self, group: List[_PendingRequest]) -> List[Tuple[str, int, int]]:
+        texts = [self._render(req.messages) for req in group]
+
+        # decoder-only models must be LEFT padded so every prompt ends at the same position
+        previous_side = getattr(self.tokenizer, "padding_side", "right")
+        self.tokenizer.padding_side = "left"
+        try:
+            encoded = self.tokenizer(texts, return_tensors="pt", padding=True)
+        finally:
+            self.tokenizer.padding_side = previous_side
+
+        if self.device:
+            encoded = {k: v.to(self.device) for k, v in encoded.items()}
+
+        prompt_len = int(encoded["input_ids"].shape[-1])
+        max_new_tokens = max(req.max_new_tokens for req in group)
+
+        gen_kwargs: Dict[str, Any] = {
+            "max_new_tokens": max_new_tokens,
+            "do_sample": group[0].do_sample,
+            "pad_token_id": self.tokenizer.pad_token_id,
+        }
+        if group[0].do_sample:
+            gen_kwargs["temperature"] = group[0].temperature
+        if group[0].prefix_allowed_tokens_fn is not None:
+            gen_kwargs["prefix_allowed_tokens_fn"] = self._batch_constraint(group, prompt_len)
+
+        with torch.no_grad():
+            out = self.model.generate(**encoded, **gen_kwargs)
+
+        pad_id = self.tokenizer.pad_token_id
+        results: List[Tuple[str, int, int]] = []
+        for i, req in enumerate(group):
+            new_ids = out[i, prompt_len: prompt_len + req.max_new_tokens]
+            text = self.tokenizer.decode(new_ids, skip_special_tokens=True)
+
+            # without the left padding of the prompt / the padding after the row stopped
+            prompt_tokens = int(encoded["attention_mask"][i].sum())
+            new_tokens = int((new_ids != pad_id).sum()) if pad_id is not None else int(new_ids.shape[-1])
+            results.append((text.strip(), prompt_tokens, new_tokens))
+
+        return results
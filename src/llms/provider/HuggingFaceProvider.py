@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-import troch
+import torch
 from transformers import AutoModel, AutoModelForCausalLM, AutoTokenizer
 
 from src.llms.Enums_LLM import HFEnums
+from src.llms.usage import record_prompt_usage
+from src.llms.provider.HFBatchingEngine import HFBatchingEngine
 
 
 class HuggingFaceProvider:
@@ -21,7 +25,13 @@ class HuggingFaceProvider:
         default_input_max_characters: int = 5000,
         default_generation_max_output_tokens: int = 1000,
         default_generation_temperature: float = 0.1,
-        default_generation_do_sample: bool = False):
+        default_generation_do_sample: bool = False,
+        enable_batching: bool = True,
+        max_batch_size: int = 8,
+        max_batch_wait_ms: float = 10.0,
+        quantization: Optional[str] = None,    # "int8" -> dynamic int8 quantization of nn.Linear (CPU only)
+        num_threads: Optional[int] = None,     # torch intra-op threads (CPU)
+        warmup_on_load: bool = False):
 
 
         self.logger = logging.getLogger(__name__)
@@ -38,6 +48,7 @@ class HuggingFaceProvider:
 
         self._gen_tokenizer = None
         self._gen_model = None
+        self._enforcer_tokenizer_data = None  # lm-format-enforcer vocabulary index, per generation model
 
         self._emb_tokenizer = None
         self._emb_model = None
@@ -48,6 +59,18 @@ class HuggingFaceProvider:
         self._torch_dtype = torch_dtype
         self._trust_remote_code = trust_remote_code
 
+        # CPU tuning
+        self._quantization = (quantization or "").lower() or None
+        self._warmup_on_load = warmup_on_load
+        if num_threads:
+            torch.set_num_threads(int(num_threads))
+
+        # dynamic batching for concurrent agenerate_text() calls (built lazily inside the event loop)
+        self._enable_batching = enable_batching
+        self._max_batch_size = max_batch_size
+        self._max_batch_wait_ms = max_batch_wait_ms
+        self._batching_engine: Optional[HFBatchingEngine] = None
+
         self.set_generation_model(model_id)
 
     def close(self) -> None:
@@ -63,12 +86,55 @@ class HuggingFaceProvider:
         except Exception:
             pass
 
+    async def aclose(self) -> None:
+        if self._batching_engine is not None:
+            await self._batching_engine.close()
+            self._batching_engine = None
+        self.close()
+
+    @property
+    def tokenizer(self):
+        """Generation tokenizer (used for token-aware truncation/chunking of inputs)."""
+        return self._gen_tokenizer
+
     def set_generation_model(self, model_id: str) -> None:
         """Load (or reload) a generation model."""
         self.generation_model_id = model_id
+        self._batching_engine = None  # bound to the old model
+        self._enforcer_tokenizer_data = None
 
         # otherwise fallback to AutoModelForCausalLM.
         self._gen_tokenizer, self._gen_model = self._load_generation_model(model_id)
+        self._gen_model = self._optimize_for_cpu(self._gen_model)
+
+        if self._warmup_on_load:
+            self.warmup()
+
+    def _optimize_for_cpu(self, mdl):
+        """Dynamic int8 quantization of the Linear layers (weights int8, activations quantized on the fly)."""
+        if self._quantization != "int8":
+            return mdl
+
+        try:
+            on_cpu = next(mdl.parameters()).device.type == "cpu"
+        except StopIteration:
+            on_cpu = False
+
+        if not on_cpu:
+            self.logger.warning("int8 dynamic quantization is CPU only; model is not on CPU, skipping.")
+            return mdl
+
+        start = time.perf_counter()
+        mdl = torch.ao.quantization.quantize_dynamic(mdl, {torch.nn.Linear}, dtype=torch.qint8)
+        mdl.eval()
+        self.logger.info("Quantized %s to dynamic int8 in %.2fs", self.generation_model_id, time.perf_counter() - start)
+        return mdl
+
+    def warmup(self, max_new_tokens: int = 4) -> None:
+        """One tiny generate() so the first real email does not pay for lazy init / kernel selection."""
+        start = time.perf_counter()
+        self.generate_text(prompt="Hello", max_output_tokens=max_new_tokens, temperature=0.0)
+        self.logger.info("HF warmup done in %.2fs", time.perf_counter() - start)
 
     def _load_generation_model(self, model_id: str):
         try:
@@ -91,6 +157,7 @@ class HuggingFaceProvider:
 
         kwargs: Dict[str, Any] = {
             "trust_remote_code": self._trust_remote_code,
+            "low_cpu_mem_usage": True,  # avoid a second full-precision copy while loading
         }
 
         if self._torch_dtype != "auto":
@@ -107,6 +174,32 @@ class HuggingFaceProvider:
 
         return tok, mdl
 
+    def _json_schema_constraint(self, json_schema: Dict[str, Any]):
+        """
+        Grammar-constrained decoding: a prefix_allowed_tokens_fn that only lets generate() emit
+        JSON valid under the schema (lm-format-enforcer). None if unavailable -> unconstrained.
+        """
+        try:
+            from lmformatenforcer import JsonSchemaParser  # type: ignore
+            from lmformatenforcer.integrations.transformers import (  # type: ignore
+                build_token_enforcer_tokenizer_data,
+                build_transformers_prefix_allowed_tokens_fn,
+            )
+        except ImportError:
+            self.logger.warning("lm-format-enforcer not installed; generating without JSON schema constraint")
+            return None
+
+        try:
+            if self._enforcer_tokenizer_data is None:
+                # walks the whole vocabulary once per model
+                self._enforcer_tokenizer_data = build_token_enforcer_tokenizer_data(self._gen_tokenizer)
+            return build_transformers_prefix_allowed_tokens_fn(
+                self._enforcer_tokenizer_data, JsonSchemaParser(json_schema["schema"])
+            )
+        except Exception:
+            self.logger.exception("Could not build JSON schema constraint; generating without it")
+            return None
+
     # ----------------------------
     # Helpers
     # ----------------------------
@@ -165,6 +258,7 @@ class HuggingFaceProvider:
             temperature: Optional[float] = None,
             model_id: Optional[str] = None,  # stateless override (reloads if different)
             do_sample: Optional[bool] = None,
+            json_schema: Optional[Dict[str, Any]] = None,  # structured output (json_schema_spec)
     ) -> Optional[Tuple[str, int, str]]:
         """
         Returns: (message, total_tokens, cost_string)
@@ -228,6 +322,12 @@ class HuggingFaceProvider:
         if do_sample_final:
             gen_kwargs["temperature"] = temperature
 
+        if json_schema:
+            constraint = self._json_schema_constraint(json_schema)
+            if constraint is not None:
+                gen_kwargs["prefix_allowed_tokens_fn"] = constraint
+
+        start = time.perf_counter()
         try:
             with torch.no_grad():
                 out = self._gen_model.generate(input_ids, **gen_kwargs)
@@ -246,9 +346,89 @@ class HuggingFaceProvider:
 
         total_tokens = int(out.shape[-1])  # prompt + new
 
-        return text.strip(), total_tokens
+        record_prompt_usage("HF", self.generation_model_id, prompt_len, 0, time.perf_counter() - start,
+                            completion_tokens=total_tokens - prompt_len)
 
+        return text.strip(), total_tokens, "0$"
 
+    def _get_batching_engine(self) -> Optional[HFBatchingEngine]:
+        if not self._enable_batching:
+            return None
 
+        # batching needs a regular HF tokenizer (padding + chat template as text)
+        if not callable(getattr(self._gen_tokenizer, "pad", None)):
+            return None
+
+        if self._batching_engine is None:
+            self._batching_engine = HFBatchingEngine(
+                model=self._gen_model,
+                tokenizer=self._gen_tokenizer,
+                device=str(getattr(self._gen_model, "device", self._device)),
+                max_batch_size=self._max_batch_size,
+                max_wait_ms=self._max_batch_wait_ms,
+            )
+        return self._batching_engine
+
+    async def agenerate_text(
+            self,
+            prompt: str,
+            chat_history: Optional[List[Dict[str, Any]]] = None,
+            max_output_tokens: Optional[int] = None,
+            temperature: Optional[float] = None,
+            model_id: Optional[str] = None,
+            do_sample: Optional[bool] = None,
+            json_schema: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Tuple[str, int, str]]:
+        """
+        Async entry point (same contract as the cloud providers).
+        Concurrent calls are batched into one generate() by HFBatchingEngine, schema-constrained
+        ones included (each row keeps its own constraint); without a batchable tokenizer it falls
+        back to one call per worker thread.
+        """
+        if model_id and model_id != self.generation_model_id:
+            self.set_generation_model(model_id)
+
+        engine = self._get_batching_engine()
+        if engine is None:
+            return await asyncio.to_thread(
+                self.generate_text,
+                prompt,
+                chat_history,
+                max_output_tokens,
+                temperature,
+                None,
+                do_sample,
+                json_schema,
+            )
+
+        max_new_tokens = int(max_output_tokens or self.default_generation_max_output_tokens)
+        temperature = float(temperature if temperature is not None else self.default_generation_temperature)
+        do_sample_final = bool(do_sample if do_sample is not None else self.default_generation_do_sample)
+        if temperature <= 0:
+            do_sample_final = False
+
+        messages = self._build_messages(prompt=self.process_text(prompt), chat_history=chat_history)
+
+        constraint = None
+        if json_schema:
+            # off the event loop: the first call walks the whole vocabulary
+            constraint = await asyncio.to_thread(self._json_schema_constraint, json_schema)
+
+        start = time.perf_counter()
+        try:
+            text, prompt_tokens, new_tokens = await engine.submit(
+                messages=messages,
+                max_new_tokens=max_new_tokens,
+                do_sample=do_sample_final,
+                temperature=temperature,
+                prefix_allowed_tokens_fn=constraint,
+            )
+        except Exception:
+            self.logger.exception("Batched generation failed")
+            return None
 
+        total_tokens = prompt_tokens + new_tokens
+        record_prompt_usage("HF", self.generation_model_id, prompt_tokens, 0, time.perf_counter() - start,
+                            completion_tokens=new_tokens)
 
+        return text, total_tokens, "0$"
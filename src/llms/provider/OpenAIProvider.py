@@ -1,18 +1,23 @@
 from ..Interface_LLM import Interface_LLM
 from ..Enums_LLM import OpenAIEnums
-from openai import OpenAI
+from ..usage import cached_prompt_tokens, record_prompt_usage
+from ..structured_output import openai_response_format
+from ..http_transport import LLMHttpTransport, request_timeout, wrap_tracing
+from openai import OpenAI, AsyncOpenAI
 import logging
-import httpx
 from typing import List, Union, Optional, Dict, Any, Tuple
-from langsmith.wrappers import wrap_openai
 import httpx
+import time
 
 class OpenAIProvider(Interface_LLM):
     def __init__(self,  api_key: str, api_url: str=None,
                         default_input_max_characters: int=500,
                        default_generation_max_output_tokens: int=1000,
                        default_generation_temperature: float=0.1,
-                        timeout_seconds: float = 30.0):
+                        timeout_seconds: float = 30.0,
+                        http_transport: Optional[LLMHttpTransport] = None,
+                        tracing_mode: str = "on",
+                        tracing_sample_rate: float = 1.0):
 
         self.api_key = api_key
         self.api_url = api_url
@@ -28,25 +33,50 @@ class OpenAIProvider(Interface_LLM):
         self.enums = OpenAIEnums
         self.logger = logging.getLogger(__name__)
 
-        # CHANGED: keep http client as attribute so we can close it later
-        self.http_client = httpx.Client(timeout=timeout_seconds)
-
-        # wrap_openai lines for LangSmith for traces
-
-        self.client = wrap_openai(OpenAI(
-            api_key=self.api_key,
-            http_client=self.http_client,
-            base_url=self.api_url.rstrip("/") if self.api_url else None,
-        ))
+        # shared pooled transport (owned by the container) or, standalone, our own clients
+        self.http_transport = http_transport
+        self._owns_http_clients = http_transport is None
+        if http_transport is not None:
+            self.http_client = http_transport.client
+            self.async_http_client = http_transport.async_client
+        else:
+            self.http_client = httpx.Client(timeout=timeout_seconds)
+            self.async_http_client = httpx.AsyncClient(timeout=timeout_seconds)
+
+        base_url = self.api_url.rstrip("/") if self.api_url else None
+
+        # LangSmith tracing (wrap_openai): on / off / sampled
+        self.client = wrap_tracing(
+            lambda: OpenAI(api_key=self.api_key, http_client=self.http_client, base_url=base_url),
+            mode=tracing_mode, sample_rate=tracing_sample_rate,
+        )
+
+        # async client: used by the graph nodes so no worker thread is held per in-flight call
+        self.async_client = wrap_tracing(
+            lambda: AsyncOpenAI(api_key=self.api_key, http_client=self.async_http_client, base_url=base_url),
+            mode=tracing_mode, sample_rate=tracing_sample_rate,
+        )
 
     # allow clean shutdown
     def close(self) -> None:
+        if not self._owns_http_clients:
+            return
         try:
             if getattr(self, "http_client", None):
                 self.http_client.close()
         except Exception:
             pass
 
+    async def aclose(self) -> None:
+        self.close()
+        if not self._owns_http_clients:
+            return
+        try:
+            if getattr(self, "async_http_client", None):
+                await self.async_http_client.aclose()
+        except Exception:
+            pass
+
 
 
     def set_generation_model(self, model_id: str): # for change the model type in the runtime
@@ -59,26 +89,15 @@ class OpenAIProvider(Interface_LLM):
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
 
-    def generate_text(
+    def _build_chat_kwargs(
         self,
+        model: str,
         prompt: str,
-        chat_history: Optional[List[Dict[str, Any]]] = None,
-        max_output_tokens: Optional[int] = None,
-        temperature: Optional[float] = None,
-        model_id: Optional[str] = None,  # ADDED: stateless override
-    ) -> Optional[Tuple[str, int, str]]:
-        """
-        Returns: (message, total_tokens, cost_string)
-        """
-        if not self.client:
-            self.logger.error("OpenAI client was not set")
-            return None
-
-        model = model_id or self.generation_model_id
-        if not model:
-            self.logger.error("Generation model for OpenAI was not set")
-            return None
-
+        chat_history: Optional[List[Dict[str, Any]]],
+        max_output_tokens: Optional[int],
+        temperature: Optional[float],
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
         max_output_tokens = max_output_tokens or self.default_generation_max_output_tokens
         temperature = temperature if temperature is not None else self.default_generation_temperature
 
@@ -98,6 +117,57 @@ class OpenAIProvider(Interface_LLM):
         if not model.startswith(restricted_prefixes):
             kwargs["temperature"] = float(temperature)
 
+        # Structured output: decoding constrained to the JSON schema
+        if json_schema:
+            kwargs["response_format"] = openai_response_format(json_schema)
+
+        kwargs.update(request_timeout(self.http_transport, "generation"))
+        return kwargs
+
+    def _parse_chat_response(self, response, model: str, latency_s: Optional[float] = None) -> Optional[Tuple[str, int, str]]:
+        if not response or not getattr(response, "choices", None) or not response.choices[0].message:
+            self.logger.error("Error while generating text with OpenAI")
+            return None
+
+        message = response.choices[0].message.content or ""
+
+        usage = getattr(response, "usage", None)
+        prompt_tokens = int(getattr(usage, "prompt_tokens", 0) or 0)
+        output_tokens = int(getattr(usage, "completion_tokens", 0) or 0)
+        total_tokens = int(getattr(usage, "total_tokens", prompt_tokens + output_tokens) or 0)
+        cached_tokens = cached_prompt_tokens(usage)
+
+        total_cost = self.calc_cost(model_id=model, prompt_tokens=prompt_tokens, output_tokens=output_tokens,
+                                    cached_tokens=cached_tokens)
+
+        record_prompt_usage("OPENAI", model, prompt_tokens, cached_tokens, latency_s,
+                            completion_tokens=output_tokens, cost=total_cost, total_tokens=total_tokens)
+        return message, total_tokens, f"{total_cost:.8f}$"
+
+    def generate_text(
+        self,
+        prompt: str,
+        chat_history: Optional[List[Dict[str, Any]]] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        model_id: Optional[str] = None,  # ADDED: stateless override
+        json_schema: Optional[Dict[str, Any]] = None,  # structured output (json_schema_spec)
+    ) -> Optional[Tuple[str, int, str]]:
+        """
+        Returns: (message, total_tokens, cost_string)
+        """
+        if not self.client:
+            self.logger.error("OpenAI client was not set")
+            return None
+
+        model = model_id or self.generation_model_id
+        if not model:
+            self.logger.error("Generation model for OpenAI was not set")
+            return None
+
+        kwargs = self._build_chat_kwargs(model, prompt, chat_history, max_output_tokens, temperature, json_schema)
+
+        start = time.perf_counter()
         try:
             response = self.client.chat.completions.create(**kwargs)
         except Exception as e:
@@ -116,30 +186,52 @@ class OpenAIProvider(Interface_LLM):
                 self.logger.exception("Chat completion failed.")
                 return None
 
-        if not response or not getattr(response, "choices", None) or not response.choices[0].message:
-            self.logger.error("Error while generating text with OpenAI")
+        return self._parse_chat_response(response, model, latency_s=time.perf_counter() - start)
+
+    async def agenerate_text(
+        self,
+        prompt: str,
+        chat_history: Optional[List[Dict[str, Any]]] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        model_id: Optional[str] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Tuple[str, int, str]]:
+        """
+        Async version of generate_text (same return contract).
+        """
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
             return None
 
-        message = response.choices[0].message.content or ""
+        model = model_id or self.generation_model_id
+        if not model:
+            self.logger.error("Generation model for OpenAI was not set")
+            return None
 
-        usage = getattr(response, "usage", None)
-        prompt_tokens = int(getattr(usage, "prompt_tokens", 0) or 0)
-        output_tokens = int(getattr(usage, "completion_tokens", 0) or 0)
-        total_tokens = int(getattr(usage, "total_tokens", prompt_tokens + output_tokens) or 0)
+        kwargs = self._build_chat_kwargs(model, prompt, chat_history, max_output_tokens, temperature, json_schema)
 
-        total_cost = self.calc_cost(model_id=model, prompt_tokens=prompt_tokens, output_tokens=output_tokens)
-        return message, total_tokens, f"{total_cost:.8f}$"
+        start = time.perf_counter()
+        try:
+            response = await self.async_client.chat.completions.create(**kwargs)
+        except Exception as e:
+            if "temperature" in kwargs:
+                self.logger.warning(
+                    "Chat completion failed with temperature; retrying without it. Error: %s", e
+                )
+                kwargs.pop("temperature", None)
+                try:
+                    response = await self.async_client.chat.completions.create(**kwargs)
+                except Exception:
+                    self.logger.exception("Chat completion failed after retry (no temperature).")
+                    return None
+            else:
+                self.logger.exception("Chat completion failed.")
+                return None
 
-    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
-        """
-        Returns: (embeddings, usage_data)
-        embeddings: List[List[float]]
-        usage_data: dict with tokens + cost string
-        """
-        if not self.client or not self.embedding_model_id:
-            self.logger.error("OpenAI client/model not set")
-            return None
+        return self._parse_chat_response(response, model, latency_s=time.perf_counter() - start)
 
+    def _build_embed_kwargs(self, text: Union[str, List[str]]) -> Dict[str, Any]:
         inputs = [text] if isinstance(text, str) else list(text)
 
         kwargs: Dict[str, Any] = {"model": self.embedding_model_id, "input": inputs}
@@ -148,13 +240,10 @@ class OpenAIProvider(Interface_LLM):
         if self.embedding_dimensions_size and self.embedding_model_id.startswith("text-embedding-3"):
             kwargs["dimensions"] = int(self.embedding_dimensions_size)
 
-        # CHANGED: actually use kwargs
-        try:
-            response = self.client.embeddings.create(**kwargs)
-        except Exception:
-            self.logger.exception("Embedding call failed.")
-            return None
+        kwargs.update(request_timeout(self.http_transport, "embedding"))
+        return kwargs
 
+    def _parse_embed_response(self, response):
         if not response or not response.data or not response.data[0].embedding:
             self.logger.error("Error while embedding text with OpenAI")
             return None
@@ -176,6 +265,45 @@ class OpenAIProvider(Interface_LLM):
 
         return embeddings, usage_data
 
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+        """
+        Returns: (embeddings, usage_data)
+        embeddings: List[List[float]]
+        usage_data: dict with tokens + cost string
+        """
+        if not self.client or not self.embedding_model_id:
+            self.logger.error("OpenAI client/model not set")
+            return None
+
+        kwargs = self._build_embed_kwargs(text)
+
+        # CHANGED: actually use kwargs
+        try:
+            response = self.client.embeddings.create(**kwargs)
+        except Exception:
+            self.logger.exception("Embedding call failed.")
+            return None
+
+        return self._parse_embed_response(response)
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+        """
+        Async version of embed_text (same return contract).
+        """
+        if not self.async_client or not self.embedding_model_id:
+            self.logger.error("OpenAI async client/model not set")
+            return None
+
+        kwargs = self._build_embed_kwargs(text)
+
+        try:
+            response = await self.async_client.embeddings.create(**kwargs)
+        except Exception:
+            self.logger.exception("Embedding call failed.")
+            return None
+
+        return self._parse_embed_response(response)
+
     def construct_prompt(self, prompt: str, role: str):
 
         return {
@@ -187,11 +315,11 @@ class OpenAIProvider(Interface_LLM):
         return total_tokens * (price_per_million / 1_000_000)
 
 
-    def calc_cost(self, model_id: str, prompt_tokens: int, output_tokens: int) -> float:
+    def calc_cost(self, model_id: str, prompt_tokens: int, output_tokens: int, cached_tokens: int = 0) -> float:
         MODEL_PRICES = {
-            "gpt-4.1-mini": {"input": 0.40, "output": 1.60},
-            "gpt-4.1": {"input": 5.00, "output": 15.00},
-            "gpt-4o": {"input": 5.00, "output": 15.00},
+            "gpt-4.1-mini": {"input": 0.40, "cached_input": 0.10, "output": 1.60},
+            "gpt-4.1": {"input": 5.00, "cached_input": 1.25, "output": 15.00},
+            "gpt-4o": {"input": 5.00, "cached_input": 2.50, "output": 15.00},
         }
 
         # CHANGED: safe lookup (avoid KeyError)
@@ -200,7 +328,11 @@ class OpenAIProvider(Interface_LLM):
             self.logger.warning("No pricing configured for model '%s'. Returning 0 cost.", model_id)
             return 0.0
 
-        cost_in = float(prompt_tokens) * (float(prices["input"]) / 1_000_000.0)
+        # cached prompt tokens are part of prompt_tokens but billed at the cached rate
+        cached_tokens = min(int(cached_tokens or 0), int(prompt_tokens))
+        cached_price = float(prices.get("cached_input", prices["input"]))
+        cost_in = float(prompt_tokens - cached_tokens) * (float(prices["input"]) / 1_000_000.0)
+        cost_in += float(cached_tokens) * (cached_price / 1_000_000.0)
         cost_out = float(output_tokens) * (float(prices["output"]) / 1_000_000.0)
         return cost_in + cost_out
 
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.metrics import LLM_LIMITER_IN_FLIGHT, LLM_LIMITER_QUEUE_DEPTH, LLM_LIMITER_WAIT_SECONDS
+
+
+def estimate_tokens(prompt: str, chat_history: Optional[List[Dict[str, Any]]] = None) -> int:
+    """Cheap prompt-size estimate (~4 chars per token), good enough for TPM budgeting."""
+    chars = len(prompt or "")
+    for m in chat_history or []:
+        chars += len(str(m.get("content") or m.get("text") or ""))
+    return chars // 4 + 1
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously: `capacity` units per 60 seconds."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = float(per_minute) / 60.0
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available (0 if available now)."""
+        self._refill()
+        # a single request larger than the whole bucket is allowed once the bucket is full
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class ProviderRateLimiter:
+    """
+    Limits for one (provider, model):
+    - max in-flight requests (semaphore)
+    - requests-per-minute and tokens-per-minute buckets (0 = unlimited)
+
+    Callers queue in FIFO order behind one lock instead of failing with 429s.
+    """
+
+    def __init__(self, provider: str, model: str, max_in_flight: int = 32, rpm: int = 0, tpm: int = 0):
+        self.provider = provider
+        self.model = model
+
+        self._semaphore = asyncio.Semaphore(max(1, int(max_in_flight)))
+        self._bucket_lock = asyncio.Lock()  # FIFO: first waiter gets the next budget
+        self._rpm = TokenBucket(rpm) if rpm else None
+        self._tpm = TokenBucket(tpm) if tpm else None
+
+        self._labels = {"provider": provider, "model": model}
+
+    async def _wait_for_budget(self, tokens: int) -> None:
+        async with self._bucket_lock:
+            while True:
+                wait = 0.0
+                if self._rpm is not None:
+                    wait = max(wait, self._rpm.wait_time(1))
+                if self._tpm is not None:
+                    wait = max(wait, self._tpm.wait_time(tokens))
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            if self._rpm is not None:
+                self._rpm.consume(1)
+            if self._tpm is not None:
+                self._tpm.consume(tokens)
+
+    @asynccontextmanager
+    async def acquire(self, tokens: int):
+        queue_depth = LLM_LIMITER_QUEUE_DEPTH.labels(**self._labels)
+        start = time.perf_counter()
+
+        queue_depth.inc()
+        try:
+            await self._wait_for_budget(tokens)
+            await self._semaphore.acquire()
+        finally:
+            queue_depth.dec()
+
+        LLM_LIMITER_WAIT_SECONDS.labels(**self._labels).observe(time.perf_counter() - start)
+        in_flight = LLM_LIMITER_IN_FLIGHT.labels(**self._labels)
+        in_flight.inc()
+        try:
+            yield
+        finally:
+            in_flight.dec()
+            self._semaphore.release()
+
+
+_LIMITERS: Dict[Tuple[str, str], ProviderRateLimiter] = {}
+
+
+def get_rate_limiter(provider: str, model: str, max_in_flight: int = 32, rpm: int = 0, tpm: int = 0) -> ProviderRateLimiter:
+    """Process-wide limiter per (provider, model), shared by every client that talks to it."""
+    key = (provider, model or "")
+    limiter = _LIMITERS.get(key)
+    if limiter is None:
+        limiter = ProviderRateLimiter(provider, model or "", max_in_flight=max_in_flight, rpm=rpm, tpm=tpm)
+        _LIMITERS[key] = limiter
+    return limiter
+
+
+class RateLimitedProvider:
+    """
+    Wraps any Interface_LLM provider; agenerate_text/aembed_text go through the shared limiter.
+    Everything else (enums, construct_prompt, generation_model_id, ...) is forwarded unchanged.
+    """
+
+    def __init__(self, provider: Any, provider_name: str, max_in_flight: int = 32, rpm: int = 0, tpm: int = 0):
+        self._provider = provider
+        self._provider_name = provider_name
+        self._max_in_flight = max_in_flight
+        self._rpm = rpm
+        self._tpm = tpm
+
+    def __getattr__(self, name: str):
+        return getattr(self._provider, name)
+
+    def _limiter(self, model_id: Optional[str]) -> ProviderRateLimiter:
+        model = model_id or getattr(self._provider, "generation_model_id", None) or ""
+        return get_rate_limiter(
+            self._provider_name, model,
+            max_in_flight=self._max_in_flight, rpm=self._rpm, tpm=self._tpm,
+        )
+
+    async def agenerate_text(self, prompt: str, chat_history: list = None, max_output_tokens: int = None,
+                             temperature: float = None, **kwargs):
+        max_out = max_output_tokens or getattr(self._provider, "default_generation_max_output_tokens", 0) or 0
+        # providers count max_tokens against the TPM limit, so budget prompt + max output
+        tokens = estimate_tokens(prompt, chat_history) + int(max_out)
+
+        async with self._limiter(kwargs.get("model_id")).acquire(tokens):
+            return await self._provider.agenerate_text(
+                prompt=prompt,
+                chat_history=chat_history,
+                max_output_tokens=max_output_tokens,
+                temperature=temperature,
+                **kwargs,
+            )
+
+    async def aembed_text(self, text, document_type: str = None):
+        texts = [text] if isinstance(text, str) else list(text)
+        tokens = sum(estimate_tokens(t) for t in texts)
+
+        limiter = get_rate_limiter(
+            self._provider_name, getattr(self._provider, "embedding_model_id", None) or "",
+            max_in_flight=self._max_in_flight, rpm=self._rpm, tpm=self._tpm,
+        )
+        async with limiter.acquire(tokens):
+            return await self._provider.aembed_text(text, document_type=document_type)
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, List, Optional, Tuple
+
+from src.utils.metrics import LLM_CIRCUIT_OPEN, LLM_HEDGED_REQUESTS, LLM_PROVIDER_FAILURES
+
+
+class CircuitBreaker:
+    """
+    closed -> (failure_threshold consecutive failures) -> open
+    open   -> (reset_seconds elapsed)                  -> half-open: one trial call
+    trial success closes the circuit, trial failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_seconds = float(reset_seconds)
+
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow_request(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at < self.reset_seconds:
+            return False
+        if self._trial_in_flight:
+            return False
+        self._trial_in_flight = True  # half-open
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        LLM_CIRCUIT_OPEN.labels(provider=self.name).set(0)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        LLM_PROVIDER_FAILURES.labels(provider=self.name).inc()
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+            LLM_CIRCUIT_OPEN.labels(provider=self.name).set(1)
+
+    def release_trial(self) -> None:
+        # the half-open trial was cancelled (hedge won, caller timed out) without an outcome:
+        # let the next request try again instead of keeping the circuit half-open forever
+        self._trial_in_flight = False
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies, used to decide when to hedge."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.samples: deque = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        idx = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+        return ordered[idx]
+
+
+class ResilientGenerationClient:
+    """
+    Generation client composed of an ordered provider chain (e.g. Azure -> OpenAI -> local HF).
+
+    Per provider: jittered exponential backoff retries and a circuit breaker.
+    A provider that keeps failing is skipped and the next one in the chain is used.
+    Optional hedging: if the primary call is slower than the p-th latency percentile,
+    the same request is also sent to the next healthy provider; first good answer wins.
+
+    Providers signal failure by returning None (or raising). All chain members must accept
+    OpenAI-style {"role", "content"} messages, since prompts are built with the primary's helpers.
+    """
+
+    def __init__(
+        self,
+        providers: List[Tuple[str, Any]],
+        max_retries: int = 2,
+        base_delay_seconds: float = 0.5,
+        max_delay_seconds: float = 8.0,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_seconds: float = 30.0,
+        hedge_percentile: Optional[float] = None,
+    ):
+        if not providers:
+            raise ValueError("ResilientGenerationClient needs at least one provider")
+
+        self.providers = providers
+        self.max_retries = max(0, int(max_retries))
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.hedge_percentile = hedge_percentile
+
+        self.breakers = {
+            name: CircuitBreaker(name, breaker_failure_threshold, breaker_reset_seconds)
+            for name, _ in providers
+        }
+        self.latencies = {name: LatencyTracker() for name, _ in providers}
+
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def primary(self) -> Any:
+        return self.providers[0][1]
+
+    def __getattr__(self, name: str):
+        # enums, construct_prompt, generation_model_id, ... come from the primary provider
+        return getattr(self.providers[0][1], name)
+
+    def _backoff(self, attempt: int) -> float:
+        # "full jitter": uniform(0, min(cap, base * 2^attempt))
+        return random.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * (2 ** attempt)))
+
+    async def _call(self, name: str, provider: Any, kwargs: dict):
+        # calls only reach an open breaker as its half-open trial (hedges skip open circuits)
+        is_trial = self.breakers[name].is_open
+        start = time.perf_counter()
+        try:
+            result = await provider.agenerate_text(**kwargs)
+        except asyncio.CancelledError:
+            if is_trial:
+                self.breakers[name].release_trial()
+            raise
+        except Exception:
+            self.logger.exception("Provider %s raised during generation", name)
+            result = None
+
+        if result:
+            self.breakers[name].record_success()
+            self.latencies[name].observe(time.perf_counter() - start)
+        else:
+            self.breakers[name].record_failure()
+        return result
+
+    def _hedge_target(self, after_index: int) -> Optional[Tuple[str, Any]]:
+        for name, provider in self.providers[after_index + 1:]:
+            if not self.breakers[name].is_open:
+                return name, provider
+        return None
+
+    async def _call_hedged(self, index: int, kwargs: dict):
+        name, provider = self.providers[index]
+        hedge_after = (
+            self.latencies[name].percentile(self.hedge_percentile)
+            if self.hedge_percentile else None
+        )
+        target = self._hedge_target(index) if hedge_after is not None else None
+        if target is None:
+            return await self._call(name, provider, kwargs)
+
+        primary = asyncio.create_task(self._call(name, provider, kwargs))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+            if done:
+                return primary.result()
+
+            LLM_HEDGED_REQUESTS.labels(provider=target[0]).inc()
+            # model_id overrides are provider specific; the hedge runs on its own default model
+            hedge_kwargs = {k: v for k, v in kwargs.items() if k != "model_id"}
+            hedge = asyncio.create_task(self._call(target[0], target[1], hedge_kwargs))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result:
+                        return result
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def agenerate_text(self, prompt: str, chat_history: list = None, max_output_tokens: int = None,
+                             temperature: float = None, **kwargs):
+        call_kwargs = dict(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+            **kwargs,
+        )
+
+        for index, (name, _) in enumerate(self.providers):
+            breaker = self.breakers[name]
+
+            for attempt in range(self.max_retries + 1):
+                if not breaker.allow_request():
+                    self.logger.warning("Circuit open for provider %s, failing over", name)
+                    break
+
+                result = await self._call_hedged(index, call_kwargs)
+                if result:
+                    return result
+
+                if attempt < self.max_retries and not breaker.is_open:
+                    await asyncio.sleep(self._backoff(attempt))
+
+            # model_id overrides are provider specific; do not carry them to the next provider
+            call_kwargs.pop("model_id", None)
+
+        self.logger.error("All generation providers failed: %s", [n for n, _ in self.providers])
+        return None
+
+    def generate_text(self, *args, **kwargs):
+        # sync path (scripts) stays on the primary provider
+        return self.primary.generate_text(*args, **kwargs)
+
+    async def aclose(self) -> None:
+        for _, provider in self.providers:
+            if hasattr(provider, "aclose"):
+                await provider.aclose()
+            elif hasattr(provider, "close"):
+                provider.close()
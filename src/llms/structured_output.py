@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import copy
+from typing import Any, Dict, Type
+
+from pydantic import BaseModel
+
+# JSON-schema keywords the OpenAI strict mode (and most grammar compilers) reject;
+# the Pydantic model still enforces them when the answer is validated.
+_UNSUPPORTED_KEYWORDS = {
+    "default",
+    "minimum",
+    "maximum",
+    "exclusiveMinimum",
+    "exclusiveMaximum",
+    "minLength",
+    "maxLength",
+    "minItems",
+    "maxItems",
+    "pattern",
+    "format",
+}
+
+
+def _make_strict(node: Any) -> Any:
+    if isinstance(node, list):
+        return [_make_strict(n) for n in node]
+    if not isinstance(node, dict):
+        return node
+
+    out: Dict[str, Any] = {}
+    for key, value in node.items():
+        if key in _UNSUPPORTED_KEYWORDS:
+            continue
+        if key in ("properties", "$defs"):
+            # name -> sub-schema (property names are not keywords)
+            out[key] = {name: _make_strict(sub) for name, sub in value.items()}
+        else:
+            out[key] = _make_strict(value)
+
+    if out.get("type") == "object" and "properties" in out:
+        # strict mode: every property required (optional ones are nullable), no extra keys
+        out["required"] = list(out["properties"].keys())
+        out["additionalProperties"] = False
+    return out
+
+
+def strict_json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """JSON schema of a Pydantic model in the strict form accepted by structured-output backends."""
+    return _make_strict(copy.deepcopy(model.model_json_schema()))
+
+
+def json_schema_spec(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Provider-neutral structured-output spec passed as agenerate_text(json_schema=...):
+    {"name": ..., "schema": ...}. Each provider maps it to its own mechanism
+    (response_format, JSON mode with schema, grammar-constrained decoding).
+    """
+    return {"name": model.__name__, "schema": strict_json_schema(model)}
+
+
+def openai_response_format(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """OpenAI / Azure OpenAI chat.completions response_format for a json_schema_spec()."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": spec["name"], "strict": True, "schema": spec["schema"]},
+    }
@@ -23,15 +23,22 @@ system_prompt = Template("\n".join([
 ]))
 
 #### Document (the email content) ####
+# NOTE: the only dynamic part; it is sent LAST so system_prompt + footer_prompt form a stable,
+# provider-cacheable prefix.
 document_prompt = Template("\n".join([
     "### Message from customer",
     "from_email: $from_email",
     "subject: $subject",
     "body: $chunk_text",
-    "==\n\n"
+    "==",
+    "",
+    # the closing instruction stays in the last turn: providers without strict schema mode
+    # (Cohere json_object) rely on it
+    "NOW EXTRACT FOR THIS MESSAGE (fill the schema from the system message with real values):",
+    "Return ONLY the JSON object.",
 ]))
 
-#### Footer (schema + few-shot + task) ####
+#### Footer (schema + few-shot), static: no template variables ####
 footer_prompt = Template("\n".join([
     "You must follow this JSON SCHEMA exactly:",
     "{",
@@ -148,6 +155,78 @@ footer_prompt = Template("\n".join([
     '  "notes_for_agent": ""',
     "}",
     "",
-    "NOW EXTRACT FOR THIS MESSAGE (fill schema with real values):",
-    "Return ONLY the JSON object.",
+    "The customer message to extract from follows in the next user turn.",
+]))
+
+
+#### Intent-only (fast path: entities already extracted by rules), static ####
+intent_only_system_prompt = Template("\n".join([
+    "You are an intent classifier for customer support emails of an energy supplier.",
+    "Entities were already extracted. Classify ONLY the intents and the language.",
+    "Return ONLY a single valid JSON object. No markdown. No explanation. No extra keys.",
+    "",
+    "JSON SCHEMA:",
+    "{",
+    '  "language": "de|en|ar|other",',
+    '  "intents": [',
+    "    {",
+    '      "name": "MeterReadingSubmission|MeterReadingCorrection|PersonalDataChange|ContractIssue|ProductInfoRequest|GeneralFeedback|Other",',
+    '      "confidence": 0.0,',
+    '      "requires_auth": true,',
+    '      "reason": "short string"',
+    "    }",
+    "  ],",
+    '  "overall_confidence": 0.0,',
+    '  "notes_for_agent": ""',
+    "}",
+    "",
+    "INTENT DEFINITIONS:",
+    "- MeterReadingSubmission: customer submits a new meter reading.",
+    "- MeterReadingCorrection: customer corrects a previously submitted reading.",
+    "- PersonalDataChange: address/name/bank/email changes.",
+    "- ContractIssue: cancellation/billing dispute/contract problems.",
+    "- ProductInfoRequest: tariff/product/dynamic pricing questions.",
+    "- GeneralFeedback: praise/complaint without account action.",
+    "- Other: none of the above.",
+    "",
+    "Rules:",
+    "- requires_auth=true for meter reading actions, contract issues and personal data changes.",
+    "- reason max 15 words; notes_for_agent max 20 words or empty string.",
+    "",
+    "The customer message follows in the next user turn.",
+]))
+
+
+#### Entities-only (intents already known from the local classifier), static ####
+entities_only_system_prompt = Template("\n".join([
+    "You are an information extraction engine for customer support emails of an energy supplier.",
+    "The intents were already classified. Extract ONLY the case id (if present), the language and the entities.",
+    "Return ONLY a single valid JSON object. No markdown. No explanation. No extra keys.",
+    "",
+    "Hard rules:",
+    "- Use null for unknown fields.",
+    "- Dates must be ISO format YYYY-MM-DD when possible, else null.",
+    "- notes_for_agent must be short (max 20 words) or empty string.",
+    "",
+    "JSON SCHEMA:",
+    "{",
+    '  "case_id": "string",',
+    '  "language": "de|en|ar|other",',
+    '  "entities": {',
+    '    "contract_number": null,',
+    '    "meter_number": null,',
+    '    "meter_reading_value": null,',
+    '    "meter_reading_date": null,',
+    '    "customer_full_name": null,',
+    '    "postal_code": null,',
+    '    "address": null,',
+    '    "birthdate": null,',
+    '    "installment_amount": null,',
+    '    "tariff_name": null,',
+    '    "topic_keywords": []',
+    "  },",
+    '  "notes_for_agent": ""',
+    "}",
+    "",
+    "The customer message follows in the next user turn.",
 ]))
@@ -55,15 +55,18 @@ final_params_prompt = Template("\n".join([
     "- draft_customer_reply (may contain multiple blocks separated by '====='):",
     "${draft_customer_reply}",
     "",
+    "Now generate the JSON for the current case using ONLY the given inputs.",
+]))
+
+
+# static (no template variables): sent together with final_system_prompt as a cacheable prefix
+final_footer_prompt = Template("\n".join([
     "How to use inputs:",
     "- If reviewer_note is not empty, follow it first.",
     "- Use draft_customer_reply as content guidance, but rewrite cleanly.",
     "- If draft contains multiple blocks (split by '====='), answer each block once.",
     "- Remove repeated blocks and repeated sentences.",
-]))
-
-
-final_footer_prompt = Template("\n".join([
+    "",
     "Few-shot style examples (follow the label format exactly; do NOT copy content):",
     "",
     "EXAMPLE (English):",
@@ -102,5 +105,5 @@ final_footer_prompt = Template("\n".join([
     "- Do NOT copy the draft verbatim. Rewrite.",
     "- Do NOT include '=====' in the final email body.",
     "",
-    "Now generate the JSON for the current case using ONLY the given inputs.",
+    "The case inputs follow in the next user turn.",
 ]))
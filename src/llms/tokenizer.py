@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import Any, Callable, List, Optional
+
+from src.llms.rate_limiter import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=8)
+def _tiktoken_encoding(model_id: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model_id)
+    except KeyError:
+        # unknown / Azure deployment names: the gpt-4o family encoding is the best guess
+        return tiktoken.get_encoding("o200k_base")
+
+
+class TokenCounter:
+    """
+    Token counting / truncation that matches the generation model when possible:
+    - HF backend: the model's own tokenizer
+    - OpenAI / Azure: tiktoken for the model id
+    - anything else: ~4 chars per token estimate
+    """
+
+    def __init__(self, encode: Optional[Callable[[str], List[int]]] = None,
+                 decode: Optional[Callable[[List[int]], str]] = None):
+        self._encode = encode
+        self._decode = decode
+
+    @classmethod
+    def for_client(cls, client: Any) -> "TokenCounter":
+        tokenizer = getattr(client, "tokenizer", None)
+        if tokenizer is not None and callable(getattr(tokenizer, "encode", None)):
+            return cls(
+                encode=lambda t: tokenizer.encode(t, add_special_tokens=False),
+                decode=lambda ids: tokenizer.decode(ids, skip_special_tokens=True),
+            )
+
+        enums = getattr(client, "enums", None)
+        model_id = getattr(client, "generation_model_id", None)
+        if model_id and getattr(enums, "__name__", "") == "OpenAIEnums":
+            encoding = _tiktoken_encoding(model_id)
+            if encoding is not None:
+                return cls(encode=encoding.encode, decode=encoding.decode)
+
+        return cls()
+
+    @property
+    def is_exact(self) -> bool:
+        return self._encode is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encode is not None:
+            try:
+                return len(self._encode(text))
+            except Exception:
+                logger.debug("Tokenizer encode failed, falling back to estimate", exc_info=True)
+        return estimate_tokens(text)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to at most max_tokens tokens (on a whitespace boundary for the estimate path)."""
+        if not text or max_tokens <= 0:
+            return ""
+
+        if self._encode is not None and self._decode is not None:
+            try:
+                ids = self._encode(text)
+                if len(ids) <= max_tokens:
+                    return text
+                return self._decode(ids[:max_tokens])
+            except Exception:
+                logger.debug("Tokenizer truncate failed, falling back to estimate", exc_info=True)
+
+        max_chars = max_tokens * 4 - 1  # keeps estimate_tokens() <= max_tokens
+        if len(text) <= max_chars:
+            return text
+        cut = text[:max_chars]
+        space = cut.rfind(" ")
+        return cut[:space] if space > max_chars // 2 else cut
+
+    def split(self, text: str, max_tokens: int) -> List[str]:
+        """
+        Consecutive pieces of at most max_tokens tokens covering the whole text. Exact path: cut on
+        token ids and decode each slice (a decoded prefix is not always a character prefix of the text).
+        """
+        if not text or max_tokens <= 0:
+            return []
+
+        if self._encode is not None and self._decode is not None:
+            try:
+                ids = self._encode(text)
+                pieces, start = [], 0
+                while start < len(ids):
+                    end = min(start + max_tokens, len(ids))
+                    # don't cut inside a multi-byte character (byte-level BPE decodes it as U+FFFD)
+                    for _ in range(3):
+                        if end == len(ids) or end - start <= 1 or not self._decode(ids[start:end]).endswith("\ufffd"):
+                            break
+                        end -= 1
+                    pieces.append(self._decode(ids[start:end]))
+                    start = end
+                return pieces
+            except Exception:
+                logger.debug("Tokenizer split failed, falling back to estimate", exc_info=True)
+
+        # estimate path: truncate() returns a character prefix here
+        pieces, rest = [], text
+        while rest:
+            head = self.truncate(rest, max_tokens) or rest[: max(1, max_tokens * 4 - 1)]
+            pieces.append(head)
+            rest = rest[len(head):]
+        return pieces
@@ -0,0 +1,46 @@
+import logging
+from typing import Any, Optional
+
+from src.llms.usage_ledger import record_usage
+from src.utils.metrics import LLM_CACHED_PROMPT_TOKENS, LLM_GENERATION_LATENCY, LLM_PROMPT_TOKENS
+
+logger = logging.getLogger(__name__)
+
+
+def cached_prompt_tokens(usage: Any) -> int:
+    """
+    Prompt tokens served from the provider's prefix cache.
+    OpenAI/Azure: usage.prompt_tokens_details.cached_tokens (absent on older API versions -> 0).
+    """
+    details = getattr(usage, "prompt_tokens_details", None)
+    if details is None:
+        return 0
+    if isinstance(details, dict):
+        return int(details.get("cached_tokens") or 0)
+    return int(getattr(details, "cached_tokens", 0) or 0)
+
+
+def record_prompt_usage(provider: str, model: str, prompt_tokens: int, cached_tokens: int,
+                        latency_s: Optional[float] = None, completion_tokens: int = 0, cost: float = 0.0,
+                        total_tokens: Optional[int] = None) -> None:
+    """
+    Export prompt/cached token counters and the call latency split by prefix-cache hit/miss,
+    and write the call to the usage ledger (per case / node / model).
+    """
+    record_usage(provider, model, prompt_tokens, completion_tokens, cached_tokens, latency_s, cost, total_tokens)
+
+    labels = {"provider": provider, "model": model or ""}
+    LLM_PROMPT_TOKENS.labels(**labels).inc(prompt_tokens)
+    LLM_CACHED_PROMPT_TOKENS.labels(**labels).inc(cached_tokens)
+
+    if latency_s is not None:
+        LLM_GENERATION_LATENCY.labels(
+            prefix_cache="hit" if cached_tokens else "miss", **labels
+        ).observe(latency_s)
+
+    hit_rate = cached_tokens / prompt_tokens if prompt_tokens else 0.0
+    logger.debug(
+        "%s %s prompt_tokens=%d cached_tokens=%d (%.0f%%) latency=%s",
+        provider, model, prompt_tokens, cached_tokens, hit_rate * 100,
+        f"{latency_s:.3f}s" if latency_s is not None else "n/a",
+    )
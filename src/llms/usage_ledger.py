@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from src.utils.metrics import LLM_USAGE_COST, LLM_USAGE_LEDGER_DROPPED, LLM_USAGE_TOKENS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class UsageScope:
+    """Who is calling the LLM: graph run, case and node (set per node by the graph builder)."""
+    node: Optional[str] = None
+    run_id: Optional[str] = None
+    case_id: Optional[str] = None
+
+
+_current_scope: contextvars.ContextVar[UsageScope] = contextvars.ContextVar("llm_usage_scope", default=UsageScope())
+
+# providers have no container reference; the container registers the ledger here
+_active_ledger: Optional["UsageLedger"] = None
+
+
+@contextmanager
+def llm_usage_scope(node: Optional[str] = None, run_id: Optional[str] = None, case_id: Optional[str] = None):
+    token = _current_scope.set(UsageScope(node=node, run_id=run_id, case_id=case_id))
+    try:
+        yield
+    finally:
+        _current_scope.reset(token)
+
+
+def current_scope() -> UsageScope:
+    return _current_scope.get()
+
+
+def set_active_ledger(ledger: Optional["UsageLedger"]) -> None:
+    global _active_ledger
+    _active_ledger = ledger
+
+
+def get_active_ledger() -> Optional["UsageLedger"]:
+    return _active_ledger
+
+
+def _to_uuid(value: Any) -> Optional[UUID]:
+    if value is None:
+        return None
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+def record_usage(
+    provider: str,
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    cached_tokens: int,
+    latency_s: Optional[float],
+    cost: float,
+    total_tokens: Optional[int] = None,
+) -> None:
+    """Per-node Prometheus counters + one ledger row (if a ledger is active). Never blocks the caller."""
+    scope = current_scope()
+    node = scope.node or "none"
+
+    LLM_USAGE_TOKENS.labels(node=node, model=model or "", kind="prompt").inc(prompt_tokens)
+    LLM_USAGE_TOKENS.labels(node=node, model=model or "", kind="completion").inc(completion_tokens)
+    LLM_USAGE_TOKENS.labels(node=node, model=model or "", kind="cached").inc(cached_tokens)
+    LLM_USAGE_COST.labels(node=node, model=model or "").inc(cost)
+
+    ledger = _active_ledger
+    if ledger is None:
+        return
+
+    ledger.record({
+        "run_id": scope.run_id,
+        "case_id": _to_uuid(scope.case_id),
+        "node": scope.node,
+        "provider": provider,
+        "model": model or "",
+        "prompt_tokens": int(prompt_tokens),
+        "completion_tokens": int(completion_tokens),
+        "cached_tokens": int(cached_tokens),
+        "total_tokens": int(total_tokens if total_tokens is not None else prompt_tokens + completion_tokens),
+        "latency_ms": latency_s * 1000 if latency_s is not None else None,
+        "cost": float(cost),
+    })
+
+
+class UsageLedger:
+    """
+    Batched async writer for the llm_usage table.
+    record() only appends to a bounded queue; a background task flushes every `flush_interval_s`
+    or when `batch_size` rows are waiting. Rows are dropped (and counted) if the queue is full,
+    so a slow database never slows down LLM calls.
+    record() may be called from worker threads (local HF generation runs in asyncio.to_thread):
+    the row is then handed to the ledger's event loop.
+    """
+
+    def __init__(self, db_model, batch_size: int = 200, flush_interval_s: float = 2.0, max_queue: int = 10000):
+        self.db_model = db_model
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._run_cases: Dict[str, UUID] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+
+    def start(self) -> None:
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._task = asyncio.create_task(self._run(), name="llm-usage-ledger")
+
+    def record(self, row: Dict[str, Any]) -> None:
+        if self._closed:
+            return
+        loop = self._loop
+        if loop is not None:
+            try:
+                on_loop = asyncio.get_running_loop() is loop
+            except RuntimeError:
+                on_loop = False
+            if not on_loop:
+                # asyncio.Queue / Event are not thread-safe
+                try:
+                    loop.call_soon_threadsafe(self._enqueue, row)
+                except RuntimeError:
+                    pass  # loop closed: shutting down
+                return
+        self._enqueue(row)
+
+    def _enqueue(self, row: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            LLM_USAGE_LEDGER_DROPPED.inc()
+            return
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+
+    def attach_case(self, run_id: Optional[str], case_id: Any) -> None:
+        """Calls made before the case existed (e.g. extraction) get the case id on the next flush."""
+        case_uuid = _to_uuid(case_id)
+        if run_id and case_uuid is not None:
+            self._run_cases[run_id] = case_uuid
+
+    async def _run(self) -> None:
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        rows: List[Dict[str, Any]] = []
+        while not self._queue.empty() and len(rows) < self.batch_size * 10:
+            rows.append(self._queue.get_nowait())
+
+        run_cases, self._run_cases = self._run_cases, {}
+        for row in rows:
+            if row["case_id"] is None and row["run_id"] in run_cases:
+                row["case_id"] = run_cases[row["run_id"]]
+
+        try:
+            for i in range(0, len(rows), self.batch_size):
+                await self.db_model.insert_many(rows[i:i + self.batch_size])
+            if run_cases:
+                await self.db_model.attach_case(run_cases)
+        except Exception:
+            logger.exception("LLM usage ledger flush failed (%d rows lost)", len(rows))
+
+    async def aclose(self) -> None:
+        self._closed = True
+        self._wakeup.set()
+        if self._task is not None:
+            try:
+                await self._task
+            except Exception:
+                logger.exception("LLM usage ledger task failed")
+            self._task = None
+        await self.flush()
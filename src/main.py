@@ -1,10 +1,12 @@
 from __future__ import annotations
+import time
 from typing import Optional
 from pathlib import Path
 from fastapi import FastAPI, Request
 from src.routes import base
-from .utils.metrics import setup_metrics
+from .utils.metrics import GRAPH_STARTUP_SECONDS, setup_metrics
 from .utils.client_deps_container import DependencyContainer
+from .agents.CaseOrchestratorAgent.utils.build_container import set_container
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
@@ -35,7 +37,20 @@ app.state.container: Optional[DependencyContainer] = None
 
 @app.on_event("startup")
 async def startup_span():
-    app.state.container = await DependencyContainer.create()
+    start = time.perf_counter()
+    container = await DependencyContainer.create()
+    container.graph_stats = {"container_s": round(time.perf_counter() - start, 4)}
+    GRAPH_STARTUP_SECONDS.labels(phase="container").set(container.graph_stats["container_s"])
+
+    # graph nodes resolve their dependencies through get_container(): share this one
+    set_container(container)
+    app.state.container = container
+
+    # one compiled graph per process; warmup so the first email doesn't pay the one-off costs
+    if container.settings.GRAPH_COMPILE_ON_STARTUP:
+        container.compile_graph()
+        if container.settings.GRAPH_WARMUP:
+            await container.warmup()
 
 
 @app.on_event("shutdown")
@@ -1,7 +1,8 @@
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import func, literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB
 from .BaseDataModel import BaseDataModel
 from .db_schemes import Cases
 
@@ -96,3 +97,17 @@ class CasesModel(BaseDataModel):
             await session.commit()
             await session.refresh(case)
             return case
+
+    async def merge_case_status_meta(self, case_uuid: UUID, patch: Dict[str, Any]) -> bool:
+        # Merges keys into case_status_meta (JSONB ||) without touching the status or other keys.
+        # Returns False if the case UUID does not exist.
+        async with self.db_client() as session:
+            stmt = (
+                update(Cases)
+                .where(Cases.case_uuid == case_uuid)
+                .values(case_status_meta=func.coalesce(Cases.case_status_meta, literal({}, JSONB))
+                        .op("||", return_type=JSONB)(literal(patch, JSONB)))
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+            return bool(result.rowcount)
@@ -0,0 +1,39 @@
+from typing import Any, Dict, List
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from .BaseDataModel import BaseDataModel
+from .db_schemes import EmbeddingCacheEntries
+
+
+class EmbeddingCacheModel(BaseDataModel):
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        return cls(db_client=db_client)
+
+    async def get_many(self, content_hashes: List[str]) -> Dict[str, Any]:
+        # content_hash -> embedding for the hashes already cached.
+        if not content_hashes:
+            return {}
+        async with self.db_client() as session:
+            result = await session.execute(
+                select(EmbeddingCacheEntries.content_hash, EmbeddingCacheEntries.embedding)
+                .where(EmbeddingCacheEntries.content_hash.in_(content_hashes))
+            )
+            return {row.content_hash: row.embedding for row in result}
+
+    async def put_many(self, model_id: str, embeddings: Dict[str, Any]) -> None:
+        # Bulk insert; hashes that are already cached are ignored.
+        if not embeddings:
+            return
+        async with self.db_client() as session:
+            stmt = insert(EmbeddingCacheEntries).values([
+                {"content_hash": key, "model_id": model_id, "embedding": vec}
+                for key, vec in embeddings.items()
+            ]).on_conflict_do_nothing(index_elements=[EmbeddingCacheEntries.content_hash])
+            await session.execute(stmt)
+            await session.commit()
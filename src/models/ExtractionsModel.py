@@ -1,9 +1,10 @@
-from typing import Optional, List, Dict, Any
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from .BaseDataModel import BaseDataModel
-from .db_schemes import Extractions
+from .db_schemes import Extractions, Messages
 
 
 class ExtractionsModel(BaseDataModel):
@@ -92,3 +93,61 @@ class ExtractionsModel(BaseDataModel):
             await session.commit()
             await session.refresh(extraction)
             return extraction
+
+    async def list_training_rows(
+        self,
+        limit: int = 50000,
+        min_confidence: Optional[float] = None,
+        created_after: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        # (subject, body, intent names) of every extraction, for training the local intent classifier.
+        async with self.db_client() as session:
+            stmt = (
+                select(Messages.subject, Messages.body, Extractions.intents, Extractions.confidence)
+                .join(Messages, Messages.message_id == Extractions.message_id)
+                .where(Messages.direction == "inbound")
+            )
+            if min_confidence is not None:
+                stmt = stmt.where(Extractions.confidence >= min_confidence)
+            if created_after is not None:
+                stmt = stmt.where(Extractions.created_at > created_after)
+            stmt = stmt.order_by(Extractions.created_at.desc()).limit(limit)
+
+            result = await session.execute(stmt)
+            rows = result.all()
+
+        training_rows: List[Dict[str, Any]] = []
+        for subject, body, intents, confidence in rows:
+            names = [i.get("name") for i in (intents or []) if isinstance(i, dict) and i.get("name")]
+            if not names:
+                continue
+            training_rows.append({"subject": subject, "body": body, "intents": names, "confidence": confidence})
+        return training_rows
+
+    async def list_inbound_page(
+        self,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        page_size: int = 2000,
+    ) -> List[Dict[str, Any]]:
+        # One keyset page (oldest first) of inbound bodies with their extraction, for embedding backfills.
+        # after = (created_at, extraction_id) of the previous page's last row: rows sharing a
+        # timestamp are neither skipped nor repeated
+        async with self.db_client() as session:
+            stmt = (
+                select(
+                    Messages.body,
+                    Extractions.intents,
+                    Extractions.entities,
+                    Extractions.confidence,
+                    Extractions.created_at,
+                    Extractions.extraction_id,
+                )
+                .join(Messages, Messages.message_id == Extractions.message_id)
+                .where(Messages.direction == "inbound")
+            )
+            if after is not None:
+                stmt = stmt.where(tuple_(Extractions.created_at, Extractions.extraction_id) > tuple_(*after))
+            stmt = stmt.order_by(Extractions.created_at.asc(), Extractions.extraction_id.asc()).limit(page_size)
+
+            result = await session.execute(stmt)
+            return [dict(row) for row in result.mappings()]
@@ -0,0 +1,76 @@
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert
+from .BaseDataModel import BaseDataModel
+from .db_schemes import LLMCacheEntries
+
+
+class LLMCacheModel(BaseDataModel):
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        return cls(db_client=db_client)
+
+    async def get_entry(self, cache_key: str) -> Optional[LLMCacheEntries]:
+        # Fetch a non-expired cache row and bump its hit counter. Returns None on miss.
+        now = datetime.now(timezone.utc)
+        async with self.db_client() as session:
+            stmt = select(LLMCacheEntries).where(
+                LLMCacheEntries.cache_key == cache_key,
+                LLMCacheEntries.expires_at > now,
+            )
+            result = await session.execute(stmt)
+            row = result.scalar_one_or_none()
+
+            if row is not None:
+                await session.execute(
+                    update(LLMCacheEntries)
+                    .where(LLMCacheEntries.cache_key == cache_key)
+                    .values(hit_count=LLMCacheEntries.hit_count + 1)
+                )
+                await session.commit()
+            return row
+
+    async def upsert_entry(
+        self,
+        cache_key: str,
+        model_id: str,
+        response_text: str,
+        total_tokens: int,
+        ttl_seconds: int,
+    ) -> None:
+        # Insert or refresh one cache row (same key -> overwrite response + push expiry forward).
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+        async with self.db_client() as session:
+            stmt = insert(LLMCacheEntries).values(
+                cache_key=cache_key,
+                model_id=model_id,
+                response_text=response_text,
+                total_tokens=total_tokens,
+                expires_at=expires_at,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[LLMCacheEntries.cache_key],
+                set_={
+                    "response_text": stmt.excluded.response_text,
+                    "total_tokens": stmt.excluded.total_tokens,
+                    "expires_at": stmt.excluded.expires_at,
+                },
+            )
+            await session.execute(stmt)
+            await session.commit()
+
+    async def delete_expired(self) -> int:
+        # TTL sweep. Returns number of deleted rows.
+        now = datetime.now(timezone.utc)
+        async with self.db_client() as session:
+            result = await session.execute(
+                delete(LLMCacheEntries).where(LLMCacheEntries.expires_at <= now)
+            )
+            await session.commit()
+            return int(result.rowcount or 0)
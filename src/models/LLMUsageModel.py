@@ -0,0 +1,97 @@
+from typing import Any, Dict, List, Optional, Sequence
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import func, insert, select, update
+from .BaseDataModel import BaseDataModel
+from .db_schemes import LLMUsage
+
+# columns the summary can be grouped by
+USAGE_GROUP_COLUMNS = {
+    "case_id": LLMUsage.case_id,
+    "node": LLMUsage.node,
+    "provider": LLMUsage.provider,
+    "model": LLMUsage.model,
+}
+
+
+class LLMUsageModel(BaseDataModel):
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        return cls(db_client=db_client)
+
+    async def insert_many(self, rows: List[Dict[str, Any]]) -> int:
+        # One multi-row INSERT per batch.
+        if not rows:
+            return 0
+        async with self.db_client() as session:
+            await session.execute(insert(LLMUsage), rows)
+            await session.commit()
+        return len(rows)
+
+    async def attach_case(self, run_cases: Dict[str, UUID]) -> int:
+        # Back-fill case_id on rows of runs whose case was only known after the call.
+        updated = 0
+        async with self.db_client() as session:
+            for run_id, case_id in run_cases.items():
+                result = await session.execute(
+                    update(LLMUsage)
+                    .where(LLMUsage.run_id == run_id, LLMUsage.case_id.is_(None))
+                    .values(case_id=case_id)
+                )
+                updated += int(result.rowcount or 0)
+            await session.commit()
+        return updated
+
+    async def summary(
+        self,
+        group_by: Sequence[str] = ("node", "model"),
+        case_id: Optional[UUID] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        # Calls, tokens, latency and cost aggregated by the given columns.
+        unknown = [g for g in group_by if g not in USAGE_GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown group_by columns: {unknown}")
+
+        group_cols = [USAGE_GROUP_COLUMNS[g].label(g) for g in group_by]
+        stmt = select(
+            *group_cols,
+            func.count(LLMUsage.id).label("calls"),
+            func.sum(LLMUsage.prompt_tokens).label("prompt_tokens"),
+            func.sum(LLMUsage.completion_tokens).label("completion_tokens"),
+            func.sum(LLMUsage.cached_tokens).label("cached_tokens"),
+            func.sum(LLMUsage.total_tokens).label("total_tokens"),
+            func.avg(LLMUsage.latency_ms).label("avg_latency_ms"),
+            func.sum(LLMUsage.cost).label("cost"),
+        )
+
+        if case_id is not None:
+            stmt = stmt.where(LLMUsage.case_id == case_id)
+        if since is not None:
+            stmt = stmt.where(LLMUsage.created_at >= since)
+        if until is not None:
+            stmt = stmt.where(LLMUsage.created_at < until)
+        if group_cols:
+            stmt = stmt.group_by(*[USAGE_GROUP_COLUMNS[g] for g in group_by])
+
+        stmt = stmt.order_by(func.sum(LLMUsage.cost).desc())
+
+        async with self.db_client() as session:
+            result = await session.execute(stmt)
+            rows = []
+            for r in result.mappings():
+                row = dict(r)
+                if row.get("case_id") is not None:
+                    row["case_id"] = str(row["case_id"])
+                for key in ("prompt_tokens", "completion_tokens", "cached_tokens", "total_tokens"):
+                    row[key] = int(row[key] or 0)
+                row["cost"] = float(row["cost"] or 0.0)
+                row["avg_latency_ms"] = float(row["avg_latency_ms"]) if row["avg_latency_ms"] is not None else None
+                rows.append(row)
+            return rows
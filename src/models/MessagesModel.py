@@ -1,9 +1,9 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, exists
 from .BaseDataModel import BaseDataModel
-from .db_schemes import Messages
+from .db_schemes import Messages, Extractions
 
 
 class MessagesModel(BaseDataModel):
@@ -31,6 +31,15 @@ class MessagesModel(BaseDataModel):
             result = await session.execute(stmt)
             return result.scalar_one_or_none()
 
+    async def get_ingest_state_by_external_id(self, external_message_id: str) -> Optional[Tuple[Messages, bool]]:
+        # (message row, processed) for an RFC Message-ID; processed = an extraction row exists for it.
+        # A stored but unprocessed message (run failed after the message write) must be retried, not skipped.
+        processed = exists().where(Extractions.message_id == Messages.message_id).label("processed")
+        async with self.db_client() as session:
+            stmt = select(Messages, processed).where(Messages.external_message_id == external_message_id)
+            row = (await session.execute(stmt)).first()
+            return (row[0], bool(row[1])) if row else None
+
     async def get_latest_inbound_message(self, case_id):
         async with self.db_client() as session:  # session is AsyncSession
             stmt = (
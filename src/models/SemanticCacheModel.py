@@ -0,0 +1,65 @@
+from typing import Optional, List, Dict, Any, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from .BaseDataModel import BaseDataModel
+from .db_schemes import SemanticCacheEntries
+
+
+class SemanticCacheModel(BaseDataModel):
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        return cls(db_client=db_client)
+
+    async def find_nearest(self, embedding: List[float]) -> Optional[Tuple[SemanticCacheEntries, float]]:
+        # Nearest cached extraction by cosine distance (HNSW index). Returns (row, similarity) or None.
+        async with self.db_client() as session:
+            distance = SemanticCacheEntries.embedding.cosine_distance(embedding)
+            stmt = (
+                select(SemanticCacheEntries, distance.label("distance"))
+                .order_by(distance)
+                .limit(1)
+            )
+            result = await session.execute(stmt)
+            first = result.first()
+            if first is None:
+                return None
+            row, dist = first
+            return row, 1.0 - float(dist)
+
+    async def add_entries(self, entries: List[Dict[str, Any]]) -> None:
+        # Bulk insert (backfills); identical bodies (same hash) are ignored.
+        if not entries:
+            return
+        async with self.db_client() as session:
+            stmt = insert(SemanticCacheEntries).values(entries).on_conflict_do_nothing(
+                index_elements=[SemanticCacheEntries.body_hash]
+            )
+            await session.execute(stmt)
+            await session.commit()
+
+    async def add_entry(
+        self,
+        body_hash: str,
+        embedding: List[float],
+        intents: List[Dict[str, Any]],
+        language: Optional[str] = None,
+        topic_keywords: Optional[List[str]] = None,
+        confidence: Optional[float] = None,
+    ) -> None:
+        # Insert one cache entry; identical bodies (same hash) are ignored.
+        async with self.db_client() as session:
+            stmt = insert(SemanticCacheEntries).values(
+                body_hash=body_hash,
+                embedding=embedding,
+                intents=intents,
+                language=language,
+                topic_keywords=topic_keywords or [],
+                confidence=confidence,
+            ).on_conflict_do_nothing(index_elements=[SemanticCacheEntries.body_hash])
+            await session.execute(stmt)
+            await session.commit()
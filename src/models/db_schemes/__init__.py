@@ -1 +1 @@
-from src.models.db_schemes.lichtblick.schemes import Cases, Messages, Actions, AuthSessions, Drafts, Reviews, Extractions, Contracts
\ No newline at end of file
+from src.models.db_schemes.lichtblick.schemes import Cases, Messages, Actions, AuthSessions, Drafts, Reviews, Extractions, Contracts, LLMCacheEntries, SemanticCacheEntries, LLMUsage, EmbeddingCacheEntries
\ No newline at end of file
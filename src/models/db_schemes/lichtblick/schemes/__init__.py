@@ -6,4 +6,8 @@ from .auth_sessions_tabel import AuthSessions
 from .drafts_tabel import Drafts
 from .extractions_tabel import Extractions
 from .reviews_tabel import Reviews
-from .contracts_tabel import Contracts
\ No newline at end of file
+from .contracts_tabel import Contracts
+from .llm_cache_tabel import LLMCacheEntries
+from .semantic_cache_tabel import SemanticCacheEntries
+from .llm_usage_tabel import LLMUsage
+from .embedding_cache_tabel import EmbeddingCacheEntries
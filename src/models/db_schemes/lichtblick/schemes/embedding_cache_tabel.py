@@ -0,0 +1,17 @@
+from .lichblick_base import SQLAlchemyBase
+from sqlalchemy import Column, DateTime, String, func
+from pgvector.sqlalchemy import Vector
+
+from .semantic_cache_tabel import EMBEDDING_DIM
+
+
+class EmbeddingCacheEntries(SQLAlchemyBase):
+    __tablename__ = "embedding_cache"
+
+    # sha256 of (model_id, document_type, text); no raw text is stored here
+    content_hash = Column(String(64), primary_key=True)
+
+    model_id = Column(String, nullable=False)
+    embedding = Column(Vector(EMBEDDING_DIM), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,23 @@
+from .lichblick_base import SQLAlchemyBase
+from sqlalchemy import Column, DateTime, String, Integer, Index, func
+
+
+class LLMCacheEntries(SQLAlchemyBase):
+    __tablename__ = "llm_response_cache"
+
+    # sha256 of (model_id, temperature, rendered messages)
+    cache_key = Column(String(64), primary_key=True)
+
+    model_id = Column(String, nullable=False)
+    response_text = Column(String, nullable=False)
+    total_tokens = Column(Integer, nullable=False, server_default="0")
+
+    hit_count = Column(Integer, nullable=False, server_default="0")
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        # TTL sweep: DELETE ... WHERE expires_at < now()
+        Index("llm_cache_expires_at_idx", "expires_at"),
+    )
@@ -0,0 +1,35 @@
+from .lichblick_base import SQLAlchemyBase
+from sqlalchemy import BigInteger, Column, DateTime, Float, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class LLMUsage(SQLAlchemyBase):
+    """One row per LLM call (append-only ledger)."""
+    __tablename__ = "llm_usage"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    # graph run the call belonged to; case_id is back-filled per run once the case exists
+    run_id = Column(String(36), nullable=True)
+    case_id = Column(UUID(as_uuid=True), nullable=True)
+    node = Column(String, nullable=True)
+
+    provider = Column(String, nullable=False)
+    model = Column(String, nullable=False)
+
+    prompt_tokens = Column(Integer, nullable=False, server_default="0")
+    completion_tokens = Column(Integer, nullable=False, server_default="0")
+    cached_tokens = Column(Integer, nullable=False, server_default="0")
+    total_tokens = Column(Integer, nullable=False, server_default="0")
+
+    latency_ms = Column(Float, nullable=True)
+    cost = Column(Float, nullable=False, server_default="0")
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("llm_usage_case_id_idx", "case_id"),
+        Index("llm_usage_run_id_idx", "run_id"),
+        Index("llm_usage_node_created_at_idx", "node", "created_at"),
+        Index("llm_usage_model_created_at_idx", "model", "created_at"),
+    )
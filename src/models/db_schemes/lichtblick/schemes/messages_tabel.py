@@ -16,6 +16,8 @@ class Messages(SQLAlchemyBase):
     body = Column(String, nullable=False)
     from_email = Column(String, nullable=False)
     to_email = Column(String, nullable=False)
+    # RFC 5322 Message-ID header (normalized, without <>); NULL for outbound / mails without one
+    external_message_id = Column(String, nullable=True)
     received_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     case = relationship("Cases", back_populates="messages")
@@ -32,4 +34,7 @@ class Messages(SQLAlchemyBase):
 
         # 3) WHERE case_id=... AND direction='inbound' ORDER BY received_at DESC
         Index("msg_case_id_direction_received_at_desc_idx", "case_id", "direction", received_at.desc()),
+
+        # 4) WHERE external_message_id = ... (ingestion dedup; one row per Message-ID, NULLs allowed)
+        Index("msg_external_message_id_uq", "external_message_id", unique=True),
     )
@@ -0,0 +1,40 @@
+from .lichblick_base import SQLAlchemyBase
+from sqlalchemy import Column, DateTime, String, Float, Index, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from pgvector.sqlalchemy import Vector
+import os
+import uuid
+
+# must match EMBEDDING_MODEL_SIZE of the embedding backend (pgvector needs a fixed dim for the HNSW index)
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_MODEL_SIZE", "384"))
+
+
+class SemanticCacheEntries(SQLAlchemyBase):
+    __tablename__ = "semantic_cache_entries"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+
+    # sha256 of the normalized body (no raw email text is stored here)
+    body_hash = Column(String(64), nullable=False)
+    embedding = Column(Vector(EMBEDDING_DIM), nullable=False)
+
+    # reusable parts of the extraction (entities are always re-extracted per email)
+    intents = Column(JSONB, nullable=False)
+    language = Column(String, nullable=True)
+    topic_keywords = Column(JSONB, nullable=True)
+    confidence = Column(Float, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("semantic_cache_body_hash_uq", "body_hash", unique=True),
+
+        # ANN search: ORDER BY embedding <=> :query LIMIT 1
+        Index(
+            "semantic_cache_embedding_hnsw_idx",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
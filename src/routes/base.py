@@ -1,5 +1,18 @@
-from fastapi import APIRouter, Depends
+import json
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from src.helpers.config import get_settings, Settings
+from src.models.CasesModel import CasesModel
+from src.models.LLMUsageModel import LLMUsageModel
+from src.agents.CaseOrchestratorAgent.utils.graph_runtime import pending_review, resume_case_graph, run_case_graph
+from src.agents.CaseOrchestratorAgent.utils.batch_runner import run_case_batch
+from src.agents.CaseOrchestratorAgent.utils.node_metrics import timing_breakdown
 
 
 base_router = APIRouter(
@@ -18,3 +31,161 @@ async def welcome(app_settings: Settings = Depends(get_settings)):
         "app_version": app_version,
 
     }
+
+
+@base_router.get("/llm/router/stats")
+async def model_router_stats(request: Request):
+    container = getattr(request.app.state, "container", None)
+    router = getattr(container, "model_router", None)
+    if router is None:
+        return {"enabled": False}
+    return {"enabled": True, **router.stats()}
+
+
+@base_router.get("/llm/usage/cases/{case_id}")
+async def llm_usage_for_case(request: Request, case_id: UUID, group_by: str = "node,model"):
+    container = request.app.state.container
+    usage_model = await LLMUsageModel.create_instance(db_client=container.db_client)
+    try:
+        rows = await usage_model.summary(group_by=_group_by(group_by), case_id=case_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "case_id": str(case_id),
+        "total_cost": sum(r["cost"] for r in rows),
+        "total_tokens": sum(r["total_tokens"] for r in rows),
+        "breakdown": rows,
+    }
+
+
+@base_router.get("/llm/usage/summary")
+async def llm_usage_summary(
+    request: Request,
+    group_by: str = "node,model",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    container = request.app.state.container
+    usage_model = await LLMUsageModel.create_instance(db_client=container.db_client)
+    try:
+        rows = await usage_model.summary(group_by=_group_by(group_by), since=since, until=until)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"group_by": _group_by(group_by), "rows": rows}
+
+
+class InboundMessage(BaseModel):
+    from_email: str
+    to_email: str
+    subject: Optional[str] = ""
+    body: str
+    external_message_id: Optional[str] = None  # Message-ID header: re-deliveries are skipped
+
+
+@base_router.get("/graph")
+async def case_graph_info(request: Request, mermaid: bool = False):
+    container = request.app.state.container
+    info = {"compiled": container.graph is not None, **(container.graph_stats or {})}
+    if mermaid and container.graph is not None:
+        info["mermaid"] = container.graph.get_graph().draw_mermaid()
+    return info
+
+
+@base_router.post("/graph/invoke")
+async def invoke_case_graph(request: Request, message: InboundMessage):
+    # runs on the process-wide compiled graph (no per-request build/compile)
+    container = request.app.state.container
+    final_state = await run_case_graph(container, {**message.model_dump(), "direction": "inbound"})
+    return jsonable_encoder({
+        "case_id": final_state.get("case_id"),
+        "graph_thread_id": final_state["graph_thread_id"],
+        "case_status": (final_state.get("Case") or {}).get("case_status"),
+        "intents": (final_state.get("extractions") or {}).get("intents"),
+        "plans": {
+            "non_auth": final_state.get("non_auth_plan_result"),
+            "auth": final_state.get("auth_plan_result"),
+        },
+        "pending_review": pending_review(final_state),
+        "duplicate_of": final_state.get("duplicate_of"),
+        "errors": final_state.get("errors") or [],
+        "node_ms": timing_breakdown(final_state) or None,
+    })
+
+
+class BatchRequest(BaseModel):
+    messages: List[InboundMessage]
+    concurrency: Optional[int] = None
+    item_timeout_s: Optional[float] = None
+
+
+@base_router.post("/graph/batch")
+async def invoke_case_graph_batch(request: Request, batch: BatchRequest):
+    # NDJSON stream, one line per message as soon as its case finishes (completion order, see "index")
+    container = request.app.state.container
+    settings = container.settings
+
+    async def stream():
+        async for result in run_case_batch(
+            container,
+            (m.model_dump() for m in batch.messages),
+            concurrency=batch.concurrency or settings.GRAPH_BATCH_CONCURRENCY,
+            item_timeout_s=batch.item_timeout_s or settings.GRAPH_BATCH_ITEM_TIMEOUT_SECONDS,
+        ):
+            yield json.dumps(jsonable_encoder(result.to_dict())) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+class ReviewDecision(BaseModel):
+    decision: str = "approved"  # approved | rejected | needs_changes
+    reviewer_email: str
+    reviewer_name: Optional[str] = None
+    support_from_email: Optional[str] = None
+    subject: Optional[str] = None
+    edited_customer_reply: Optional[str] = None
+    review_notes: Optional[str] = None
+
+
+@base_router.get("/cases/pending-review")
+async def cases_pending_review(request: Request, limit: int = 50, offset: int = 0):
+    container = request.app.state.container
+    cases_model = await CasesModel.create_instance(db_client=container.db_client)
+    cases = await cases_model.get_cases_by_status("pending_review", limit=limit, offset=offset)
+    return [
+        {
+            "case_id": str(c.case_uuid),
+            "updated_at": c.case_updated_at,
+            "waiting_for_review": bool((c.case_status_meta or {}).get("review_thread_id")),
+            "meta": c.case_status_meta,
+        }
+        for c in cases
+    ]
+
+
+@base_router.post("/cases/{case_id}/review")
+async def review_case(request: Request, case_id: UUID, review: ReviewDecision):
+    # resumes the checkpointed run at human_review_node, then review_finalize_node
+    container = request.app.state.container
+    cases_model = await CasesModel.create_instance(db_client=container.db_client)
+    case = await cases_model.get_case_by_uuid(case_id)
+    if case is None:
+        raise HTTPException(status_code=404, detail="Case not found")
+
+    thread_id = (case.case_status_meta or {}).get("review_thread_id")
+    if not thread_id:
+        raise HTTPException(status_code=409, detail="Case is not waiting for review")
+
+    try:
+        final_state = await resume_case_graph(container, thread_id, review.model_dump(exclude_none=True))
+    except LookupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return jsonable_encoder({
+        "case_id": str(case_id),
+        "human_review": final_state.get("human_review"),
+        "errors": final_state.get("errors") or [],
+    })
+
+
+def _group_by(value: str) -> List[str]:
+    return [g.strip() for g in (value or "").split(",") if g.strip()]
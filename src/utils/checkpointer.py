@@ -0,0 +1,39 @@
+from typing import Any, Optional, Tuple
+
+
+async def create_checkpointer(settings: Any) -> Tuple[Any, Optional[Any]]:
+    """
+    Checkpointer for the case graph (needed for the human-review interrupt).
+
+    GRAPH_CHECKPOINTER_ENABLED -> AsyncPostgresSaver on its own psycopg pool: graph state is
+    persisted at every step, so a case waiting for review costs no memory / thread and can be
+    resumed by any worker. Tables are created on first start (saver.setup()).
+    Otherwise -> InMemorySaver (single process, lost on restart; local runs only).
+
+    Returns (checkpointer, pool or None); the pool is closed on container shutdown.
+    """
+    if not settings.GRAPH_CHECKPOINTER_ENABLED:
+        from langgraph.checkpoint.memory import InMemorySaver
+
+        return InMemorySaver(), None
+
+    from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+
+    conninfo = (
+        f"postgresql://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}"
+        f"@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
+    )
+    pool = AsyncConnectionPool(
+        conninfo=conninfo,
+        max_size=settings.GRAPH_CHECKPOINT_POOL_SIZE,
+        # settings required by AsyncPostgresSaver
+        kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+        open=False,
+    )
+    await pool.open()
+
+    checkpointer = AsyncPostgresSaver(pool)
+    await checkpointer.setup()
+    return checkpointer, pool
@@ -1,8 +1,26 @@
+import os
 from dataclasses import dataclass
+from typing import Any, Dict, Optional
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from src.helpers.config import get_settings
+from src.helpers.config import configure_langsmith, get_settings
 from src.llms.ProviderFactory_LLM import LLMProviderFactory
+from src.llms.cache import LLMResponseCache, SemanticExtractionCache
+from src.llms.embeddings import EmbeddingService, PROVIDER_MAX_BATCH_SIZE
+from src.llms.classifier import IntentClassifier, latest_artifact
+from src.llms.http_transport import LLMHttpTransport
+from src.llms.model_router import ModelRouter
+from src.llms.provider.FakeProvider import RecordingProvider
+from src.llms.rate_limiter import RateLimitedProvider
+from src.llms.resilient_client import ResilientGenerationClient
+from src.llms.usage_ledger import UsageLedger, set_active_ledger
+from src.models.EmbeddingCacheModel import EmbeddingCacheModel
+from src.utils.checkpointer import create_checkpointer
+from src.utils.inbound_dedup import InboundDeduplicator
+from src.models.LLMCacheModel import LLMCacheModel
+from src.models.LLMUsageModel import LLMUsageModel
+from src.models.MessagesModel import MessagesModel
+from src.models.SemanticCacheModel import SemanticCacheModel
 
 from src.llms.templates.template_parser import TemplateParser
 
@@ -15,6 +33,18 @@ class DependencyContainer:
     generation_client: any
     embedding_client: any
     template_parser: TemplateParser
+    embedding_service: Optional[EmbeddingService] = None
+    llm_cache: Optional[LLMResponseCache] = None
+    semantic_cache: Optional[SemanticExtractionCache] = None
+    intent_classifier: Optional[IntentClassifier] = None
+    model_router: Optional[ModelRouter] = None
+    usage_ledger: Optional[UsageLedger] = None
+    http_transport: Optional[LLMHttpTransport] = None
+    inbound_deduper: Optional[InboundDeduplicator] = None
+    graph: Any = None
+    checkpointer: Any = None
+    checkpoint_pool: Any = None
+    graph_stats: Optional[Dict[str, Any]] = None
 
     @classmethod
     async def create(cls) -> "DependencyContainer":
@@ -23,6 +53,7 @@ class DependencyContainer:
         Use this in FastAPI startup and in eval scripts.
         """
         settings = get_settings()
+        configure_langsmith(settings)
 
         # DB
         postgres_conn = (
@@ -38,8 +69,11 @@ class DependencyContainer:
             expire_on_commit=False,
         )
 
+        # one pooled HTTP/2 transport for every API provider (keep-alive, split timeouts)
+        http_transport = LLMHttpTransport.from_settings(settings)
+
         # LLM factories
-        llm_provider_factory = LLMProviderFactory(settings)
+        llm_provider_factory = LLMProviderFactory(settings, http_transport=http_transport)
 
 
         # generation client
@@ -47,6 +81,9 @@ class DependencyContainer:
             provider=settings.GENERATION_BACKEND
         )
         generation_client.set_generation_model(model_id=settings.GENERATION_MODEL_ID)
+        if settings.LLM_RECORD_RESPONSES_PATH:
+            # capture real answers so GENERATION_BACKEND=FAKE can replay them in load tests
+            generation_client = RecordingProvider(generation_client, settings.LLM_RECORD_RESPONSES_PATH)
 
         # embedding client
         embedding_client = llm_provider_factory.create(
@@ -57,7 +94,130 @@ class DependencyContainer:
             embedding_dimensions_size=settings.EMBEDDING_MODEL_SIZE,
         )
 
+        # shared in-flight + RPM/TPM limits per provider/model (callers queue instead of hitting 429s)
+        generation_chain = [(settings.GENERATION_BACKEND, generation_client)]
+        for backend in settings.GENERATION_FALLBACK_BACKENDS:
+            fallback_client = llm_provider_factory.create(provider=backend)
+            if fallback_client is None:
+                print(f"Unknown fallback generation backend: {backend}, skipping")
+                continue
+            # Azure (deployment) and HF (HF_GENERATION_MODEL_ID) already know their model
+            if not getattr(fallback_client, "generation_model_id", None):
+                fallback_client.set_generation_model(model_id=settings.GENERATION_MODEL_ID)
+            generation_chain.append((backend, fallback_client))
+
+        generation_chain = [
+            (backend, RateLimitedProvider(
+                client,
+                provider_name=backend,
+                max_in_flight=settings.LLM_MAX_IN_FLIGHT,
+                rpm=settings.LLM_RPM_LIMIT,
+                tpm=settings.LLM_TPM_LIMIT,
+            ))
+            for backend, client in generation_chain
+        ]
+
+        # retries with jittered backoff, circuit breaker per provider, failover down the chain
+        generation_client = ResilientGenerationClient(
+            generation_chain,
+            max_retries=settings.LLM_MAX_RETRIES,
+            base_delay_seconds=settings.LLM_RETRY_BASE_DELAY,
+            max_delay_seconds=settings.LLM_RETRY_MAX_DELAY,
+            breaker_failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+            breaker_reset_seconds=settings.LLM_BREAKER_RESET_SECONDS,
+            hedge_percentile=settings.LLM_HEDGE_PERCENTILE,
+        )
+        embedding_client = RateLimitedProvider(
+            embedding_client,
+            provider_name=settings.EMBEDDING_BACKEND,
+            max_in_flight=settings.LLM_MAX_IN_FLIGHT,
+            rpm=settings.LLM_RPM_LIMIT,
+            tpm=settings.LLM_TPM_LIMIT,
+        )
+
+
+
+        # batched + deduplicated embeddings (memory LRU + optional pgvector cache), NumPy float32 out
+        embedding_service = EmbeddingService(
+            client=embedding_client,
+            model_id=settings.EMBEDDING_MODEL_ID,
+            max_batch_size=settings.EMBEDDING_BATCH_SIZE or PROVIDER_MAX_BATCH_SIZE.get(settings.EMBEDDING_BACKEND, 96),
+            max_wait_ms=settings.EMBEDDING_BATCH_WAIT_MS,
+            max_concurrent_batches=settings.EMBEDDING_MAX_CONCURRENT_BATCHES,
+            cache_max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            db_model=(
+                await EmbeddingCacheModel.create_instance(db_client=db_client)
+                if settings.EMBEDDING_CACHE_PG_ENABLED else None
+            ),
+        )
+
+        # exact-match LLM response cache (in-process LRU + optional Postgres tier)
+        llm_cache = None
+        if settings.LLM_CACHE_ENABLED:
+            llm_cache = LLMResponseCache(
+                max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+                db_model=(
+                    await LLMCacheModel.create_instance(db_client=db_client)
+                    if settings.LLM_CACHE_PG_ENABLED else None
+                ),
+            )
+            llm_cache.start_sweeper(settings.LLM_CACHE_PG_SWEEP_SECONDS)
 
+        # near-duplicate extraction cache (embedding_service + pgvector)
+        semantic_cache = None
+        if settings.SEMANTIC_CACHE_ENABLED:
+            semantic_cache = SemanticExtractionCache(
+                embedding_service=embedding_service,
+                db_model=await SemanticCacheModel.create_instance(db_client=db_client),
+                min_similarity=settings.SEMANTIC_CACHE_MIN_SIMILARITY,
+            )
+
+        # local intent classifier (optional, trained offline from the extractions table)
+        intent_classifier = None
+        if settings.INTENT_CLASSIFIER_PATH:
+            path = settings.INTENT_CLASSIFIER_PATH
+            if os.path.isdir(path):
+                path = latest_artifact(path)
+            try:
+                intent_classifier = IntentClassifier.load(path) if path else None
+            except Exception as e:
+                print(f"Intent classifier not loaded ({settings.INTENT_CLASSIFIER_PATH}): {e}")
+
+        # small/large model tier per call (needs a backend that accepts a per-call model_id)
+        model_router = None
+        if settings.ROUTER_ENABLED and settings.ROUTER_SMALL_MODEL_ID and settings.ROUTER_LARGE_MODEL_ID:
+            model_router = ModelRouter(
+                small_model_id=settings.ROUTER_SMALL_MODEL_ID,
+                large_model_id=settings.ROUTER_LARGE_MODEL_ID,
+                max_small_body_tokens=settings.ROUTER_MAX_SMALL_BODY_TOKENS,
+                max_small_intents=settings.ROUTER_MAX_SMALL_INTENTS,
+                auth_to_large=settings.ROUTER_AUTH_TO_LARGE,
+                max_small_failure_rate=settings.ROUTER_MAX_SMALL_FAILURE_RATE,
+            )
+
+        # per-call token/cost ledger (batched background writes to llm_usage)
+        usage_ledger = None
+        if settings.LLM_USAGE_LEDGER_ENABLED:
+            usage_ledger = UsageLedger(
+                db_model=await LLMUsageModel.create_instance(db_client=db_client),
+                batch_size=settings.LLM_USAGE_LEDGER_BATCH_SIZE,
+                flush_interval_s=settings.LLM_USAGE_LEDGER_FLUSH_SECONDS,
+            )
+            usage_ledger.start()
+        set_active_ledger(usage_ledger)
+
+        # re-delivered emails (same Message-ID) are dropped at the graph entry
+        inbound_deduper = None
+        if settings.INBOUND_DEDUP_ENABLED:
+            inbound_deduper = InboundDeduplicator(
+                db_model=await MessagesModel.create_instance(db_client=db_client),
+                max_entries=settings.INBOUND_DEDUP_MAX_ENTRIES,
+                claim_ttl_seconds=settings.INBOUND_DEDUP_CLAIM_TTL_SECONDS,
+            )
+
+        # graph checkpoints (Postgres): human review is an interrupt, resumed through the API
+        checkpointer, checkpoint_pool = await create_checkpointer(settings)
 
         # templates
         template_parser = TemplateParser(
@@ -72,9 +232,60 @@ class DependencyContainer:
             generation_client=generation_client,
             embedding_client=embedding_client,
             template_parser=template_parser,
+            embedding_service=embedding_service,
+            llm_cache=llm_cache,
+            semantic_cache=semantic_cache,
+            intent_classifier=intent_classifier,
+            model_router=model_router,
+            usage_ledger=usage_ledger,
+            http_transport=http_transport,
+            inbound_deduper=inbound_deduper,
+            checkpointer=checkpointer,
+            checkpoint_pool=checkpoint_pool,
         )
 
+    def compile_graph(self):
+        """Compile the case graph once for the whole process (import + compile timed in graph_stats)."""
+        # local import: the graph's nodes import this module (get_container)
+        from src.agents.CaseOrchestratorAgent.utils.graph_runtime import compile_case_graph
+
+        self.graph, stats = compile_case_graph(
+            checkpointer=self.checkpointer,
+            record_timings=self.settings.GRAPH_NODE_TIMINGS_IN_STATE,
+        )
+        self.graph_stats = {**(self.graph_stats or {}), **stats}
+        return self.graph
+
+    def get_graph(self):
+        """Process-wide compiled case graph (compiled on first use if startup did not)."""
+        if self.graph is None:
+            self.compile_graph()
+        return self.graph
+
+    async def warmup(self):
+        from src.agents.CaseOrchestratorAgent.utils.graph_runtime import warmup_case_graph
+
+        self.get_graph()
+        steps = await warmup_case_graph(self)
+        self.graph_stats = {**(self.graph_stats or {}), "warmup": steps}
+        return steps
+
     async def shutdown(self):
         """Clean shutdown for FastAPI and scripts."""
-        await self.vectordb_client.disconnect()
+        if self.embedding_service is not None:
+            await self.embedding_service.close()
+        if self.llm_cache is not None:
+            await self.llm_cache.aclose()
+        if self.usage_ledger is not None:
+            await self.usage_ledger.aclose()
+            set_active_ledger(None)
+        for client in (self.generation_client, self.embedding_client):
+            if hasattr(client, "aclose"):
+                await client.aclose()
+            elif hasattr(client, "close"):
+                client.close()
+        if self.http_transport is not None:
+            await self.http_transport.aclose()
+        if self.checkpoint_pool is not None:
+            await self.checkpoint_pool.close()
         await self.db_engine.dispose()
@@ -0,0 +1,111 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from src.utils.metrics import INBOUND_DUPLICATES
+
+
+def normalize_message_id(value: Optional[str]) -> Optional[str]:
+    """RFC 5322 Message-ID header -> key ('<abc@host>' and ' abc@host ' are the same message)."""
+    if not value:
+        return None
+    s = str(value).strip().strip("<>").strip()
+    return s or None
+
+
+class InboundDeduplicator:
+    """
+    Drops re-delivered / re-polled emails before they reach the LLM, keyed on the Message-ID header.
+    A mail counts as a duplicate only once it was processed (extraction saved): a run that failed
+    after the message write (provider outage, timeout) is retried on the next delivery.
+
+    Tier 1: in-process LRU of Message-IDs already processed (exact, no false positives).
+    Tier 2: claims of Message-IDs currently running in this process (same mail polled twice
+            concurrently); released when a run fails, expire after claim_ttl_seconds otherwise.
+    Tier 3: unique index on messages.external_message_id + extraction row check (MessagesModel),
+            shared between workers; the unique constraint also catches the cross-worker race on insert.
+    """
+
+    def __init__(self, db_model: Any, max_entries: int = 100_000, claim_ttl_seconds: float = 900.0):
+        self.db_model = db_model  # MessagesModel
+        self.max_entries = max_entries
+        self.claim_ttl_seconds = claim_ttl_seconds
+
+        # Message-ID -> {"message_id", "case_id"} of the processed row
+        self._seen: "OrderedDict[str, Dict[str, Optional[str]]]" = OrderedDict()
+        # Message-ID -> claim expiry (monotonic)
+        self._claims: Dict[str, float] = {}
+
+    def _remember(self, key: str, ref: Dict[str, Optional[str]]) -> None:
+        self._seen[key] = ref
+        self._seen.move_to_end(key)
+        while len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+
+    async def claim(self, external_message_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        None -> new message, now claimed by the caller.
+        {"duplicate": True, "external_message_id", "message_id", "case_id", "source"} -> skip it.
+        {"duplicate": False, "message_id", "case_id", "source": "retry"} -> stored earlier but never
+            processed: claimed, the caller continues on that case / message row.
+        Messages without a Message-ID are never treated as duplicates.
+        """
+        key = normalize_message_id(external_message_id)
+        if key is None:
+            return None
+
+        ref = self._seen.get(key)
+        if ref is not None:
+            self._seen.move_to_end(key)
+            return self._duplicate(key, ref, "memory")
+
+        now = time.monotonic()
+        if len(self._claims) > self.max_entries:
+            # runs that died without release(): drop their expired claims
+            self._claims = {k: v for k, v in self._claims.items() if v > now}
+
+        expires_at = self._claims.get(key)
+        if expires_at is not None and expires_at > now:
+            return self._duplicate(key, {"message_id": None, "case_id": None}, "in_flight")
+
+        # claim before the DB round trip: a concurrent poll of the same mail sees the claim
+        self._claims[key] = now + self.claim_ttl_seconds
+        try:
+            found = await self.db_model.get_ingest_state_by_external_id(key)
+        except Exception:
+            self._claims.pop(key, None)
+            raise
+
+        if found is None:
+            return None
+
+        row, processed = found
+        ref = {"message_id": str(row.message_id), "case_id": str(row.case_id)}
+        if not processed:
+            return {"duplicate": False, "external_message_id": key, **ref, "source": "retry"}
+
+        self._claims.pop(key, None)
+        self._remember(key, ref)
+        return self._duplicate(key, ref, "db")
+
+    def mark_processed(self, external_message_id: Optional[str], message_id: Any, case_id: Any) -> None:
+        """The extraction is saved: release the claim, later deliveries are answered from memory."""
+        key = normalize_message_id(external_message_id)
+        if key is None:
+            return
+        self._claims.pop(key, None)
+        self._remember(key, {"message_id": str(message_id), "case_id": str(case_id)})
+
+    def release(self, external_message_id: Optional[str]) -> None:
+        """The run failed before the mail was processed: let the next delivery through."""
+        key = normalize_message_id(external_message_id)
+        if key is not None:
+            self._claims.pop(key, None)
+
+    @staticmethod
+    def _duplicate(key: str, ref: Dict[str, Optional[str]], source: str) -> Dict[str, Any]:
+        INBOUND_DUPLICATES.labels(source=source).inc()
+        return {"duplicate": True, "external_message_id": key, **ref, "source": source}
+
+    def stats(self) -> Dict[str, int]:
+        return {"remembered": len(self._seen), "in_flight": len(self._claims)}
@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from fastapi import FastAPI, Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 import time
@@ -7,6 +7,67 @@ import time
 REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP Requests', ['method', 'endpoint', 'status'])
 REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'HTTP Request Latency', ['method', 'endpoint'])
 
+# LLM response cache (tier = memory | postgres | semantic | embedding*, result = hit | miss)
+LLM_CACHE_LOOKUPS = Counter('llm_cache_lookups_total', 'LLM response cache lookups', ['tier', 'result'])
+
+# embedding service (texts per provider request)
+EMBEDDING_BATCH_SIZE = Histogram(
+    'embedding_batch_size', 'Texts per embedding provider request',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 96, 128, 256, 512),
+)
+
+# LLM provider limiter (per provider/model)
+LLM_LIMITER_QUEUE_DEPTH = Gauge('llm_limiter_queue_depth', 'LLM calls waiting for a rate-limit slot', ['provider', 'model'])
+LLM_LIMITER_IN_FLIGHT = Gauge('llm_limiter_in_flight', 'LLM calls currently in flight', ['provider', 'model'])
+LLM_LIMITER_WAIT_SECONDS = Histogram('llm_limiter_wait_seconds', 'Time spent waiting for a rate-limit slot', ['provider', 'model'])
+
+# LLM provider chain (retries / circuit breaker / hedging)
+LLM_PROVIDER_FAILURES = Counter('llm_provider_failures_total', 'Failed LLM generation attempts', ['provider'])
+LLM_CIRCUIT_OPEN = Gauge('llm_circuit_open', 'Circuit breaker state per provider (1 = open)', ['provider'])
+LLM_HEDGED_REQUESTS = Counter('llm_hedged_requests_total', 'Hedged LLM requests sent to a backup provider', ['provider'])
+
+# provider-side prompt prefix caching (cached / prompt = hit rate)
+LLM_PROMPT_TOKENS = Counter('llm_prompt_tokens_total', 'Prompt tokens sent to the LLM', ['provider', 'model'])
+LLM_CACHED_PROMPT_TOKENS = Counter('llm_cached_prompt_tokens_total', 'Prompt tokens served from the provider prefix cache', ['provider', 'model'])
+LLM_GENERATION_LATENCY = Histogram('llm_generation_latency_seconds', 'LLM chat completion latency', ['provider', 'model', 'prefix_cache'])
+
+# LLM usage ledger (per graph node; node = none outside the graph)
+LLM_USAGE_TOKENS = Counter('llm_usage_tokens_total', 'LLM tokens per node and model', ['node', 'model', 'kind'])
+LLM_USAGE_COST = Counter('llm_usage_cost_total', 'LLM cost per node and model (provider currency)', ['node', 'model'])
+LLM_USAGE_LEDGER_DROPPED = Counter('llm_usage_ledger_dropped_total', 'Usage rows dropped because the ledger queue was full')
+
+# model router (tier = small | large)
+LLM_ROUTER_CALLS = Counter('llm_router_calls_total', 'Routed LLM calls', ['tier', 'model', 'outcome'])
+LLM_ROUTER_LATENCY = Histogram('llm_router_latency_seconds', 'Routed LLM call latency', ['tier', 'model'])
+LLM_ROUTER_COST = Counter('llm_router_cost_total', 'Routed LLM call cost (provider currency)', ['tier', 'model'])
+
+# extraction path per email: rules | intent_only | classifier | llm | chunked
+EXTRACTION_PATH = Counter('extraction_path_total', 'Emails per extraction path', ['path'])
+
+# email body pre-processing (quoted history / signature / disclaimer removal)
+EMAIL_PREPROCESS_TOKENS_SAVED = Histogram(
+    'email_preprocess_tokens_saved', 'Prompt tokens removed per email by the body pre-processor',
+    buckets=(0, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+)
+
+# compiled case graph startup cost (phase = import | compile | warmup | container)
+GRAPH_STARTUP_SECONDS = Gauge('graph_startup_seconds', 'One-off startup cost of the case graph per phase', ['phase'])
+
+# case graph nodes (kind = exception | state: error appended to state["errors"])
+GRAPH_NODE_LATENCY = Histogram(
+    'graph_node_latency_seconds', 'Case graph node latency', ['node'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+GRAPH_NODE_ERRORS = Counter('graph_node_errors_total', 'Case graph node failures', ['node', 'kind'])
+GRAPH_NODE_IN_FLIGHT = Gauge('graph_node_in_flight', 'Case graph nodes currently running', ['node'])
+
+# inbound emails dropped as re-deliveries (source = memory | in_flight | db | constraint)
+INBOUND_DUPLICATES = Counter('inbound_duplicates_total', 'Inbound emails skipped because their Message-ID was already ingested', ['source'])
+
+# batch runs of the case graph (status = done | pending_review | failed | timeout)
+GRAPH_BATCH_ITEMS = Counter('graph_batch_items_total', 'Messages processed by the batch runner', ['status'])
+GRAPH_BATCH_IN_FLIGHT = Gauge('graph_batch_in_flight', 'Batch messages currently running through the case graph')
+
 class PrometheusMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         start_time = time.time()
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from src.agents.CaseOrchestratorAgent.utils import batch_runner
+
+
+async def _fake_run_case_graph(container, message, thread_id=None):
+    await asyncio.sleep(0)
+    return {"case_id": f"case-{message['n']}", "graph_thread_id": thread_id}
+
+
+def _collect(messages, **kwargs):
+    async def run():
+        return [r async for r in batch_runner.run_case_batch(None, messages, **kwargs)]
+
+    return asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+
+def test_batch_runs_every_message(monkeypatch):
+    monkeypatch.setattr(batch_runner, "run_case_graph", _fake_run_case_graph)
+
+    results = _collect([{"n": i} for i in range(20)], concurrency=4)
+
+    assert sorted(r.index for r in results) == list(range(20))
+    assert all(r.status == "done" for r in results)
+
+
+def test_failing_input_raises_instead_of_hanging(monkeypatch):
+    monkeypatch.setattr(batch_runner, "run_case_graph", _fake_run_case_graph)
+
+    def messages():
+        yield {"n": 0}
+        raise ValueError("bad input line")
+
+    with pytest.raises(ValueError, match="bad input line"):
+        _collect(messages(), concurrency=2)
+
+
+def test_failing_async_stream_raises_instead_of_hanging(monkeypatch):
+    monkeypatch.setattr(batch_runner, "run_case_graph", _fake_run_case_graph)
+
+    async def messages():
+        yield {"n": 0}
+        raise ConnectionError("stream lost")
+
+    with pytest.raises(ConnectionError):
+        _collect(messages(), concurrency=2)
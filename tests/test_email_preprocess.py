@@ -0,0 +1,77 @@
+from src.agents.CaseOrchestratorAgent.utils.extraction.email_preprocess import preprocess_email_body
+
+
+def test_signature_keeps_verification_data():
+    body = (
+        "Hello,\n"
+        "please verify me.\n"
+        "\n"
+        "Kind regards,\n"
+        "Max Mustermann\n"
+        "Contract number: C-001\n"
+        "Postal code 22201\n"
+        "Birthdate 01.01.1980"
+    )
+
+    text = preprocess_email_body(body).text
+
+    assert "C-001" in text
+    assert "Postal code 22201" in text
+    assert "Birthdate 01.01.1980" in text
+
+
+def test_sign_off_in_the_middle_is_not_a_signature():
+    body = (
+        "Hi,\n"
+        "Thanks,\n"
+        "I moved last month.\n"
+        "my meter reading is 2438 kWh on 25.09.2025.\n"
+        "My new address is Hauptstr. 5, 10115 Berlin.\n"
+        "Best\n"
+        "Max"
+    )
+
+    text = preprocess_email_body(body).text
+
+    assert "I moved last month." in text
+    assert "My new address is Hauptstr. 5, 10115 Berlin." in text
+    assert text.endswith("Best\nMax")
+
+
+def test_closing_signature_block_is_dropped():
+    body = (
+        "my meter reading is 2438 kWh.\n"
+        "\n"
+        "Best regards\n"
+        "Max Mustermann\n"
+        "Senior Buyer\n"
+        "ACME GmbH\n"
+        "www.acme.example"
+    )
+
+    result = preprocess_email_body(body)
+
+    assert "Max Mustermann" in result.text
+    assert "www.acme.example" not in result.text
+    assert result.removed_lines.get("signature")
+
+
+def test_quoted_history_is_dropped_forward_is_kept():
+    body = (
+        "Please handle this.\n"
+        "\n"
+        "---------- Forwarded message ---------\n"
+        "From: Anna <anna@example.com>\n"
+        "Subject: Meter reading\n"
+        "\n"
+        "My meter reading is 2438 kWh.\n"
+        "\n"
+        "Am 01.03.2025 um 09:00 schrieb Support <support@example.com>:\n"
+        "> please send your reading"
+    )
+
+    text = preprocess_email_body(body).text
+
+    assert "From: Anna <anna@example.com>" in text
+    assert "My meter reading is 2438 kWh." in text
+    assert "please send your reading" not in text